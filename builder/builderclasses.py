@@ -14,7 +14,7 @@ from typing import List
 
 from builder.parsers.betacodefontshifts import dollarssubstitutes
 from builder.parsers.latinsubstitutions import latindiacriticals
-from builder.parsers.regexsubstitutions import tidyupterm
+from builder.parsers.wordtokenizer import indexablewords
 
 
 class Author(object):
@@ -525,19 +525,8 @@ class dbWorkLine(object):
 
 	def indexablewordlist(self) -> List[str]:
 		# don't use set() - that will yield undercounts
-		polytonicwords = self.wordlist('polytonic')
-		polytonicgreekwords = [tidyupterm(w, dbWorkLine.greekpunct).lower() for w in polytonicwords if re.search(dbWorkLine.minimumgreek, w)]
-		polytoniclatinwords = [tidyupterm(w, dbWorkLine.latinpunct).lower() for w in polytonicwords if not re.search(dbWorkLine.minimumgreek, w)]
-		polytonicwords = polytonicgreekwords + polytoniclatinwords
-		# need to figure out how to grab τ’ and δ’ and the rest
-		# but you can't say that 'me' is elided in a line like 'inquam, ‘teque laudo. sed quando?’ ‘nihil ad me’ inquit ‘de'
-		unformattedwords = set(self.wordlist('marked_up_line'))
-		listofwords = [w for w in polytonicwords if w+'’' not in unformattedwords or not re.search(dbWorkLine.minimumgreek, w)]
-		elisions = [w+"'" for w in polytonicwords if w+'’' in unformattedwords and re.search(dbWorkLine.minimumgreek, w)]
-		listofwords.extend(elisions)
-		listofwords = [w.translate(dbWorkLine.gravetoacute) for w in listofwords]
-		listofwords = [re.sub('v', 'u', w) for w in listofwords]
-		return listofwords
+		# the regex version of this is wordtokenizer.regexindexablewords(): 'makecorpora.py --checktokenizer' compares them
+		return indexablewords(self.polytonic)
 
 	def wordlistasstring(self):
 		s = self.indexablewordlist()
@@ -32,6 +32,15 @@ def getcommandlineargs():
 	commandlineparser.add_argument('--gram', action='store_true', help='build the grammatical parsing databases')
 	commandlineparser.add_argument('--wordcounts', action='store_true', help='install the wordcounts')
 	commandlineparser.add_argument('--sqlloadwordcounts', action='store_true', help='load the wordcounts from HipparchiaLexicalData')
+	commandlineparser.add_argument('--incremental', action='store_true', help='only rebuild the authors whose data, build options, or parser changed since the last build [Latin and Greek authors only]')
+	commandlineparser.add_argument('--nocache', action='store_true', help='ignore the parse cache: parse every author from scratch [and do not store the results]')
+	commandlineparser.add_argument('--checkwordcounts', action='store_true', help='count a sample of the author tables with both wordcounters and with several worker counts; then report any difference and exit')
+	commandlineparser.add_argument('--checktokenizer', action='store_true', help='split a sample of the lines of the author tables into words with both tokenizers; then report any difference + the time each took and exit')
+	commandlineparser.add_argument('--checkdbprepper', action='store_true', help='prepare a set of sample lines with both versions of dbprepper() with lunate on/off and with transliteration; then report any difference and exit')
+	commandlineparser.add_argument('--checkfileload', action='store_true', help='load every data file with both versions of highunicodefileload(); then report any difference + the time each took and exit')
+	commandlineparser.add_argument('--checkchunking', action='store_true', help="parse every author above 'splitauthorsabove' both in one piece and in chunks; then report any difference and exit")
+	commandlineparser.add_argument('--checkcopystreams', action='store_true', help='send rows full of tabs, backslashes, newlines and NULLs through both COPY streams and compare the column types of the loaders with the CREATE TABLE statements; then report any difference and exit')
+	commandlineparser.add_argument('--profile', action='store_true', help='record the time spent in each stage of the parse of each author and write a report for each corpus')
 	commandlineparser.add_argument('--pgversion', type=int, default=PSQLVERSION, help='[windows only] set the major version # for psql [default={v}'.format(v=PSQLVERSION))
 	commandlineargs = commandlineparser.parse_args()
 
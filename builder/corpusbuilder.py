@@ -9,33 +9,39 @@
 
 import configparser
 import re
+import sys
 import time
-from multiprocessing import Manager
+from multiprocessing import Manager, Pool, Process
 from os import path
-from typing import List
+from typing import Iterable
 
 import builder.dbinteraction.dbhelperfunctions
 import builder.dbinteraction.dbprepsubstitutions
 import builder.parsers.betacodefontshifts
 from builder.builderclasses import dbAuthor
 from builder.dbinteraction import dbloading
-from builder.dbinteraction.connection import setconnection
-from builder.dbinteraction.dbhelperfunctions import resetauthorsandworksdbs
+from builder.dbinteraction.connection import forgetinheritedpools, setconnection
+from builder.dbinteraction.dbhelperfunctions import resetauthorsandworksdbs, resetselectedauthors
 from builder.dbinteraction.genericworkerobject import GenericInserterObject
-from builder.dbinteraction.versioning import timestampthebuild
+from builder.dbinteraction.loadqueue import LoadQueue
+from builder.dbinteraction.versioning import fetchauthorbuildrecords, recordauthorbuild, timestampthebuild
 from builder.file_io import filereaders
+from builder.file_io.parsecache import cachefilename, evictfromparsecache, loadfromparsecache, parsecacheactive, \
+	parsecachekey, savetoparsecache, sourcechecksum
+from builder.file_io.parseprofiler import authortotalstage, profiledcall
 from builder.parsers import idtfiles, parse_binfiles
 from builder.parsers.betacodeandunicodeinterconversion import purgehybridgreekandlatinwords, replacegreekbetacode, \
 	restoreromanwithingreek
 from builder.parsers.betacodeescapedcharacters import replaceaddnlchars
 from builder.parsers.betacodefontshifts import greekhmufontshiftsintospans, latinauthorlinemarkupprober, \
 	latinfontlinemarkupprober, latinhmufontshiftsintospans, replacegreekmarkup
+from builder.parsers.cdblocks import ChunkedAuthors, cdblockchunks, unclosedattail
 from builder.parsers.copticsubstitutions import replacecoptic
 from builder.parsers.latinsubstitutions import latindiacriticals
 from builder.parsers.regexsubstitutions import addcdlabels, cleanuplingeringmesses, colonshift, \
-	debughostilesubstitutions, earlybirdsubstitutions, fixhmuoragnizationlinebyline, hexrunner, insertnewlines, \
-	lastsecondsubsitutions, replacequotationmarks, totallemmatization, capitalvforcapitalu
-from builder.postbuild.postbuildmetadata import buildtrigramindices, findwordcounts, insertfirstsandlasts
+	debughostilesubstitutions, decodecontrolruns, earlybirdsubstitutions, fixhmuoragnizationlinebyline, hexrunner, \
+	insertnewlines, lastsecondsubsitutions, replacequotationmarks, totallemmatization, capitalvforcapitalu
+from builder.postbuild.postbuildmetadata import buildtrigramindices, findwordcounts, finishbulkload, insertfirstsandlasts
 from builder.postbuild.secondpassdbrewrite import assignlanguagetonewworks, builddbremappers, compilenewauthors, \
 	compilenewworks, insertnewworkdata
 from builder.wordcounting.wordcountdbfunctions import deletetemporarydbs
@@ -54,13 +60,51 @@ try:
 except KeyError:
 	su = 'n'
 
+try:
+	bf = config['buildoptions']['binaryfrontend']
+except KeyError:
+	# your config file is old...
+	bf = 'n'
+
 fixingcapu = True
 strictcap = False
+binaryfrontend = False
 
 if cu == 'n':
 	fixingcapu = False
 if su == 'y':
 	strictcap = True
+if bf == 'y':
+	binaryfrontend = True
+
+try:
+	# in MB
+	splitauthorsabove = float(config['buildoptions']['splitauthorsabove'])
+except (KeyError, ValueError):
+	splitauthorsabove = 0
+
+try:
+	bulkloadactive = config['buildoptions']['bulkload'] == 'y'
+except KeyError:
+	bulkloadactive = False
+
+try:
+	backgroundindexing = config['buildoptions']['backgroundindexing'] == 'y'
+except KeyError:
+	backgroundindexing = False
+
+try:
+	loaderworkers = int(config['io']['loaderworkers'])
+except (KeyError, ValueError):
+	loaderworkers = 0
+
+try:
+	loadqueuedepth = int(config['io']['loadqueuedepth'])
+except (KeyError, ValueError):
+	loadqueuedepth = 0
+
+# the index builds that are still running: see scheduleindexing()
+indexingjobs = list()
 
 authorneedscapufix = ['LAT0914', 'LAT2806']
 # see tail of file for how to generate this list via "/testroute"
@@ -72,7 +116,7 @@ if strictcap:
 authorneedscapufix = set(authorneedscapufix)
 
 
-def buildcorpusdbs(corpusname, corpusvars):
+def buildcorpusdbs(corpusname, corpusvars, usecache=True):
 	"""
 
 	generic, unified corpus database builder
@@ -84,11 +128,17 @@ def buildcorpusdbs(corpusname, corpusvars):
 	[c] parcel out the work to managedworker as a list of work items apportioned out to N mp jobs
 	[d] managedworker() just pops a work item and sends it to addoneauthor()
 	[e] addoneauthor() builds an authorobject and then calls thecollectedworksof()
-	[f] thecollectedworksof() calls initialworkparsing(), secondaryworkparsing(), and then databaseloading()
-	[g] databaseloading() calls dbprepper(), dbauthoradder(), authortablemaker(), and then insertworksintoauthortable()
+	[f] thecollectedworksof() calls initialworkparsing(), secondaryworkparsing(), dbprepper(), and then databaseloading()
+		unless the parse cache already has what dbprepper() would return
+	[g] databaseloading() calls dbauthoradder(), authortablemaker(), and then insertworksintoauthortable()
+
+	if 'loaderworkers' is set, [f] stops after dbprepper() and [g] happens in a separate pool: see pipelinedload()
+
+	if 'bulkload' is set, [g] makes UNLOGGED tables without their UNIQUE index; buildcorpusmetadata() cleans up after that
 
 	:param corpusname:
 	:param corpusvars:
+	:param usecache:
 	:return:
 	"""
 
@@ -99,6 +149,9 @@ def buildcorpusdbs(corpusname, corpusvars):
 
 	workercount = setworkercount()
 
+	if usecache and parsecacheactive:
+		evictfromparsecache()
+
 	print('\ndropping any existing', corpusname, 'tables')
 	if corpusvars[corpusname]['tmpprefix'] is not None:
 		resetauthorsandworksdbs(corpusvars[corpusname]['tmpprefix'], corpusvars[corpusname]['corpusabbrev'])
@@ -110,9 +163,51 @@ def buildcorpusdbs(corpusname, corpusvars):
 
 	print()
 	print(workercount, 'workers dispatched to build the', corpusname, 'dbs')
+	if loaderworkers:
+		print(loaderworkers, 'workers dispatched to load them')
 	if config['buildoptions']['buildlongestfirst'] == 'y':
 		print('building the longest items first')
 
+	listoftexts = findcorpustexts(corpusname, corpusvars, abbrev)
+
+	loadstart = time.time()
+	dispatchcorpustexts(listoftexts, workercount, usecache, bulkload=bulkloadactive)
+	reportloadtime(corpusname, loadstart)
+
+	return
+
+
+def reportloadtime(corpusname, loadstart):
+	"""
+
+	the time it took to parse + load a corpus: compare a build with 'bulkload' to one without it
+
+	:param corpusname:
+	:param loadstart:
+	:return:
+	"""
+
+	if bulkloadactive:
+		mode = 'bulkload'
+	else:
+		mode = 'logged tables + immediate indexing'
+
+	print('	{c} parsed and loaded in {t} minutes [{m}]'.format(c=corpusname, t=round((time.time() - loadstart) / 60, 2), m=mode))
+
+	return
+
+
+def findcorpustexts(corpusname, corpusvars, abbrev) -> list:
+	"""
+
+	the work items for a corpus: one per author file
+
+	:param corpusname:
+	:param corpusvars:
+	:param abbrev:
+	:return:
+	"""
+
 	dataprefix = corpusvars[corpusname]['dataprefix']
 	datapath = corpusvars[corpusname]['datapath']
 	lang = corpusvars[corpusname]['languagevalue']
@@ -158,12 +253,196 @@ def buildcorpusdbs(corpusname, corpusvars):
 		# don't reverse the keys because popping from the stack later is itself a reversal
 		listoftexts = [sorter[sz] for sz in sorted(sorter.keys())]
 
+	return listoftexts
+
+
+def dispatchcorpustexts(listoftexts, workercount, usecache, bulkload=False):
+	"""
+
+	hand the work items to the workers
+
+	:param listoftexts:
+	:param workercount:
+	:param usecache:
+	:param bulkload:
+	:return:
+	"""
+
 	manager = Manager()
-	managedwork = manager.list(listoftexts)
+	chunkedauthors = None
+	chunkitems = list()
+
+	if binaryfrontend and splitauthorsabove:
+		# the chunks of the giants go into the same pile as everybody else: the workers that are not busy with a chunk
+		# keep working on the other authors instead of waiting for the giants
+		giants = [t for t in listoftexts if path.getsize('{p}{id}.TXT'.format(p=t[3], id=list(t[0].keys())[0])) > splitauthorsabove * 1024 * 1024]
+		if giants:
+			print('parsing {n} large items in chunks'.format(n=len(giants)))
+			listoftexts = list(listoftexts)
+			chunkedauthors = ChunkedAuthors(manager)
+			for t in giants:
+				items = chunkworkitems(t, workercount, usecache)
+				if items:
+					listoftexts.remove(t)
+					chunkedauthors.expect(items[0][2], len(items))
+					chunkitems.extend(items)
+
+	# the workers pop() from the end: the chunks go first
+	managedwork = manager.list(listoftexts + chunkitems)
+
+	if loaderworkers:
+		pipelinedload(manager, managedwork, workercount, usecache, bulkload, chunkedauthors)
+		return
+
+	workerobject = GenericInserterObject(managedworker, argumentlist=[managedwork, usecache, bulkload, None, chunkedauthors])
+	workerobject.dothework()
+
+	return
+
+
+def pipelinedload(manager, managedwork, workercount, usecache, bulkload, chunkedauthors=None):
+	"""
+
+	parse with one pool and load with another
+
+	when every worker parses and then loads, the CPU sits idle while the worker waits on the database and the
+	database sits idle while the worker parses; past 10 or so workers the build is bound by the drive and more
+	workers do not help
+
+	instead the parsers (managedworker()) put their dbprepper() output onto a bounded queue and the loaders
+	(managedloader()) take it off and run databaseloading() with connections of their own
+
+	the queue holds 'loadqueuedepth' authors (2 per loader by default): if it fills up, the parsers wait; that keeps
+	a fast parser pool from piling the whole corpus up in RAM
 
-	workerobject = GenericInserterObject(managedworker, argumentlist=[managedwork])
+	the two pools are sized independently: 'workers' and 'loaderworkers'; see the queue report at the end to
+	learn which one to change
+
+	if any author failed to load, the build stops once the loaders are done: see managedloader()
+
+	:param manager:
+	:param managedwork:
+	:param workercount:
+	:param usecache:
+	:param bulkload:
+	:param chunkedauthors:
+	:return:
+	"""
+
+	depth = loadqueuedepth
+	if depth < 1:
+		depth = 2 * loaderworkers
+
+	loadqueue = LoadQueue(depth, manager)
+	failures = manager.list()
+
+	loaders = [Process(target=managedloader, args=(loadqueue, bulkload, failures, None)) for _ in range(loaderworkers)]
+	for l in loaders:
+		l.start()
+
+	workerobject = GenericInserterObject(managedworker, argumentlist=[managedwork, usecache, bulkload, loadqueue, chunkedauthors], workercount=workercount)
 	workerobject.dothework()
 
+	loadqueue.close(loaderworkers)
+	for l in loaders:
+		l.join()
+
+	print('load queue report:')
+	loadqueue.report()
+
+	if failures:
+		print('\nthe following authors FAILED to load:')
+		for f in failures:
+			print('\t{f}'.format(f=f))
+		sys.exit('{n} authors failed to load'.format(n=len(failures)))
+
+	return
+
+
+def updatecorpusdbs(corpusname, corpusvars, usecache=True):
+	"""
+
+	the incremental version of buildcorpusdbs(): only the authors whose sourcechecksum() does not match the one
+	recorded in builderauthorrecords get dropped and built again; authors that are gone from the data get dropped
+
+	INS, DDP, and CHR cannot be done this way: remaptables() turns the whole corpus into a new set of authors
+
+	:param corpusname:
+	:param corpusvars:
+	:param usecache:
+	:return: the universalids of the authors that were built again; None if the whole corpus needs to be built
+	"""
+
+	if corpusvars[corpusname]['tmpprefix'] is not None:
+		print('\n', corpusname, 'cannot be built incrementally')
+		return None
+
+	abbrev = corpusvars[corpusname]['corpusabbrev']
+	records = fetchauthorbuildrecords(abbrev)
+
+	if not records:
+		print('\nno record of a previous build of', corpusname)
+		return None
+
+	workercount = setworkercount()
+
+	if usecache and parsecacheactive:
+		evictfromparsecache()
+
+	listoftexts = findcorpustexts(corpusname, corpusvars, abbrev)
+
+	current = {workitemuniversalid(t): t for t in listoftexts}
+	changed = [t for t in listoftexts if records.get(workitemuniversalid(t)) != workitemchecksum(t)]
+	changeduids = [workitemuniversalid(t) for t in changed]
+	vanished = [uid for uid in records if uid not in current]
+
+	print('\n{c}: {n} authors to build again; {v} authors to drop'.format(c=corpusname, n=len(changed), v=len(vanished)))
+
+	if not changed and not vanished:
+		return list()
+
+	resetselectedauthors(changeduids + vanished)
+
+	print(workercount, 'workers dispatched to update the', corpusname, 'dbs')
+
+	loadstart = time.time()
+	dispatchcorpustexts(changed, workercount, usecache, bulkload=bulkloadactive)
+	reportloadtime(corpusname, loadstart)
+
+	return changeduids
+
+
+def workitemuniversalid(thework) -> str:
+	"""
+
+	({'LAT9254': '&1Titius&, gram.'}, 'L', 'lt', '../HipparchiaData/latin/', 'LAT') --> 'lt9254'
+
+	:param thework:
+	:return:
+	"""
+
+	(authorid, name), = thework[0].items()
+
+	return thework[2] + authorid[len(thework[4]):]
+
+
+def workitemchecksum(thework) -> str:
+	(authorid, name), = thework[0].items()
+	return sourcechecksum(authorid, thework[1], thework[3])
+
+
+def recordworkitem(thework, dbconnection):
+	"""
+
+	note what went into the build of this item: see updatecorpusdbs()
+
+	:param thework:
+	:param dbconnection:
+	:return:
+	"""
+
+	recordauthorbuild(workitemuniversalid(thework), workitemchecksum(thework), dbconnection)
+
 	return
 
 
@@ -199,13 +478,18 @@ def remaptables(corpusname, corpusvars):
 	return
 
 
-def buildcorpusmetadata(corpusname, corpusvars):
+def buildcorpusmetadata(corpusname, corpusvars, authoruids=None):
 	"""
 
 	now that you have the core data for a corpus, record its metadata
 
+	if authoruids is set, the first/last lines and the indices are only built for those authors
+
+	the indices might still be building when this returns: see scheduleindexing()
+
 	:param corpusname:
 	:param corpusvars:
+	:param authoruids:
 	:return:
 	"""
 
@@ -226,9 +510,9 @@ def buildcorpusmetadata(corpusname, corpusvars):
 		dbconnection.commit()
 
 	# generate the metadata from the data we built
-	insertfirstsandlasts(workcategoryprefix)
+	insertfirstsandlasts(workcategoryprefix, authoruids)
 	dbconnection.commit()
-	buildtrigramindices(workcategoryprefix)
+	scheduleindexing(workcategoryprefix, authoruids)
 	findwordcounts(dbconnection)
 	timestampthebuild(workcategoryprefix)
 
@@ -237,7 +521,78 @@ def buildcorpusmetadata(corpusname, corpusvars):
 	return
 
 
-def managedworker(managedwork, dbconnection):
+def scheduleindexing(workcategoryprefix, authoruids=None):
+	"""
+
+	build the trigram indices of a corpus
+
+	parsing is CPU-bound and index building is mostly IO: if 'backgroundindexing' is set, the indices get built
+	in a process of their own (with half of the workers) while the next corpus is parsed; call waitforindexing()
+	before anything that needs the indices
+
+	:param workcategoryprefix:
+	:param authoruids:
+	:return:
+	"""
+
+	if not backgroundindexing:
+		indexcorpus(workcategoryprefix, authoruids, setworkercount())
+		return
+
+	workercount = max(1, setworkercount() // 2)
+	print('\tbuilding the {p} indices in the background with {w} workers'.format(p=workcategoryprefix, w=workercount))
+
+	job = Process(target=indexcorpus, args=(workcategoryprefix, authoruids, workercount, True))
+	job.start()
+	indexingjobs.append(job)
+
+	return
+
+
+def indexcorpus(workcategoryprefix, authoruids, workercount, forked=False):
+	"""
+
+	the trigram indices + finishbulkload()
+
+	:param workcategoryprefix:
+	:param authoruids:
+	:param workercount:
+	:param forked:
+	:return:
+	"""
+
+	if forked:
+		forgetinheritedpools()
+
+	start = time.time()
+
+	buildtrigramindices(workcategoryprefix, authoruids, workercount)
+	# the indices went into UNLOGGED tables (if any): now the WAL gets everything in one go
+	finishbulkload(workcategoryprefix, workercount)
+
+	print('\t{p} indices built in {t} minutes'.format(p=workcategoryprefix, t=round((time.time() - start) / 60, 2)))
+
+	return
+
+
+def waitforindexing():
+	"""
+
+	block until every index build that scheduleindexing() sent into the background is done
+
+	:return:
+	"""
+
+	if indexingjobs:
+		print('waiting for {n} background index builds to finish'.format(n=len(indexingjobs)))
+
+	while indexingjobs:
+		indexingjobs.pop(0).join()
+
+	return
+
+
+def managedworker(managedwork, usecache, bulkload, loadqueue, chunkedauthors, dbconnection):
 	"""
 
 	build individual authors in parallel via multiprocessing manager
@@ -252,7 +607,15 @@ def managedworker(managedwork, dbconnection):
 	accordingly this version is signifcantly faster if you have, say, 12 threads
 	available to you
 
+	if there is a loadqueue, the authors are only parsed here: managedloader() does the rest
+
+	some of the work items are chunks of a large author: see chunkworkitems() and parseonechunk()
+
 	:param managedwork:
+	:param usecache:
+	:param bulkload:
+	:param loadqueue:
+	:param chunkedauthors:
 	:return:
 	"""
 
@@ -265,8 +628,25 @@ def managedworker(managedwork, dbconnection):
 		except IndexError:
 			thework = None
 
+		if thework and thework[0] == 'chunk':
+			parsedchunks = parseonechunk(thework, chunkedauthors)
+			if parsedchunks is None:
+				# not the last chunk of its author
+				thework = None
+			elif not all(selfcontained for (chunk, selfcontained) in parsedchunks):
+				print('\t{a} could not be safely cut into chunks; parsing it in one piece'.format(a=thework[2]))
+				# back onto the pile: some worker will parse it the slow way while the others keep going
+				managedwork.append(thework[1])
+				thework = None
+			else:
+				thework = thework[1]
+				result = addoneauthor(thework[0], thework[1], thework[2], thework[3], thework[4], dbconnection, usecache=usecache, bulkload=bulkload, loadqueue=loadqueue, parsedchunks=[chunk for (chunk, selfcontained) in parsedchunks])
+		elif thework:
+			result = addoneauthor(thework[0], thework[1], thework[2], thework[3], thework[4], dbconnection, usecache=usecache, bulkload=bulkload, loadqueue=loadqueue)
+
 		if thework:
-			result = addoneauthor(thework[0], thework[1], thework[2], thework[3], thework[4], dbconnection)
+			if not loadqueue:
+				recordworkitem(thework, dbconnection)
 			msg = re.sub(r'[^\x00-\x7F]+', ' ', result)
 			print('\t{msg}'.format(msg=msg))
 
@@ -274,6 +654,60 @@ def managedworker(managedwork, dbconnection):
 		if r > 0 and not r % 50:
 			print('{r} items remain'.format(r=r))
 
+	if loadqueue:
+		loadqueue.finish('parser')
+
+	return
+
+
+def managedloader(loadqueue: LoadQueue, bulkload, failures, dbconnection):
+	"""
+
+	the other half of pipelinedload(): take parsed authors off of the queue and load them until told to stop
+
+	a failed load does not kill the loader: a loader that died would leave the parsers waiting on a full queue
+	forever; instead whatever made it into the db for that author is dropped, the author goes onto the failures
+	list, and pipelinedload() stops the build once everything else is done
+
+	every loader is a forked Process: its copy of the parent's connection pool holds the very same sockets that the
+	parent (and every other loader) will hand out; so it needs pools of its own before it asks for a connection
+
+	:param loadqueue:
+	:param bulkload:
+	:param failures:
+	:param dbconnection:
+	:return:
+	"""
+
+	forgetinheritedpools()
+
+	if not dbconnection:
+		dbconnection = setconnection()
+
+	while True:
+		parsed = loadqueue.get()
+		if parsed is None:
+			break
+
+		authorobject, language, datapath, dbreadyversion = parsed
+		authorid = authorobject.dataprefix + authorobject.number
+
+		starttime = time.time()
+		try:
+			profiledcall(authorid, 'databaseloading', databaseloading, dbreadyversion, authorobject, dbconnection, bulkload)
+		except Exception as e:
+			print('\tFAILED to load {a}: {e}'.format(a=authorobject.universalid, e=e))
+			dbconnection.rollback()
+			resetselectedauthors([authorobject.universalid])
+			failures.append('{a}: {e}'.format(a=authorobject.universalid, e=e))
+			continue
+
+		recordauthorbuild(authorobject.universalid, sourcechecksum(authorid, language, datapath), dbconnection)
+		loadtime = round(time.time() - starttime, 2)
+		print('\t{a} loaded in {t}s'.format(a=authorobject.universalid, t=loadtime))
+
+	loadqueue.finish('loader')
+
 	return
 
 
@@ -299,7 +733,7 @@ def checkextant(authorlist, datapath):
 	return pruneddict
 
 
-def addoneauthor(authordict, language, uidprefix, datapath, dataprefix, dbconnection, debugoutput=False, debugnewlines=True, skipdbload=False):
+def addoneauthor(authordict, language, uidprefix, datapath, dataprefix, dbconnection, debugoutput=False, debugnewlines=True, skipdbload=False, usecache=False, bulkload=False, loadqueue=None, parsedchunks=None):
 	"""
 
 	I need an authtab pair within a one-item dict: {'0022':'Marcus Porcius &1Cato&\x80Cato'}
@@ -320,26 +754,60 @@ def addoneauthor(authordict, language, uidprefix, datapath, dataprefix, dbconnec
 	authorobj = buildauthorobject(number, language, datapath, uidprefix, dataprefix)
 	authorobj.addauthtabname(name)
 	authorobj.language = language
-	thecollectedworksof(authorobj, language, datapath, dbconnection, debugoutput, debugnewlines, skipdbload)
+	profiledcall(dataprefix + number, authortotalstage, thecollectedworksof, authorobj, language, datapath, dbconnection, debugoutput, debugnewlines, skipdbload, usecache, bulkload, loadqueue, parsedchunks)
 	buildtime = round(time.time() - starttime, 2)
 	success = number+' '+authorobj.cleanname+' '+str(buildtime)+'s'
 	
 	return success
 
 
-def thecollectedworksof(authorobject: dbAuthor, language: str, datapath: str, dbconnection, debugoutput=False, debugnewlines=True, skipdbload=False):
+def thecollectedworksof(authorobject: dbAuthor, language: str, datapath: str, dbconnection, debugoutput=False, debugnewlines=True, skipdbload=False, usecache=False, bulkload=False, loadqueue=None, parsedchunks=None):
 	"""
 	give me a authorobject and i will build you a corpus in three stages
 	[a] initial parsing of original files
 	[b] secondary parsing of intermediate files
 	[c] loading the info into the db
 
+	if parsedchunks is set, [a] and most of [b] have already been done chunk by chunk: see parseonechunk()
+
+	if usecache is set (and 'parsecache' is on), [a] and [b] are skipped whenever the parse cache has
+	the dbprepper() output for these exact inputs
+
+	if bulkload is set, the author table is loaded the way authortablemaker() describes
+
+	if loadqueue is set, [c] is left to managedloader()
+
 	:return:
 	"""
-	txt = initialworkparsing(authorobject, language, datapath, debugoutput, debugnewlines)
-	txt = secondaryworkparsing(authorobject, txt, debugoutput, debugnewlines)
-	if not skipdbload:
-		databaseloading(txt, authorobject, dbconnection)
+
+	authorid = authorobject.dataprefix + authorobject.number
+
+	cachekey = None
+	dbreadyversion = None
+	if usecache and parsecacheactive and not debugoutput:
+		cachekey = parsecachekey(authorobject, language, datapath)
+		dbreadyversion = profiledcall(authorid, 'loadfromparsecache', loadfromparsecache, cachekey)
+
+	if dbreadyversion is None:
+		txt = None
+		if parsedchunks:
+			txt = joinparsedchunks(authorobject, parsedchunks)
+
+		if txt is None:
+			txt = initialworkparsing(authorobject, language, datapath, debugoutput, debugnewlines)
+			txt = secondaryworkparsing(authorobject, txt, debugoutput, debugnewlines)
+
+		dbreadyversion = profiledcall(authorid, 'dbprepper', builder.dbinteraction.dbprepsubstitutions.dbprepper, txt)
+		if cachekey:
+			# dbprepper() hands back a generator: the cache needs the lines themselves
+			dbreadyversion = list(dbreadyversion)
+			savetoparsecache(cachekey, dbreadyversion)
+
+	if not skipdbload and loadqueue:
+		# the lines have to exist before they can travel to another process
+		loadqueue.put((authorobject, language, datapath, list(dbreadyversion)))
+	elif not skipdbload:
+		profiledcall(authorid, 'databaseloading', databaseloading, dbreadyversion, authorobject, dbconnection, bulkload)
 	else:
 		print(authorobject.cleanname, 'built but not loaded')
 
@@ -408,26 +876,20 @@ def initialworkparsing(authorobject, language, datapath, debugoutput=False, debu
 	outsuffix = config['io']['debugoutfile']
 	filename = '{dir}{af}_1{count}_{fnc}{suffix}'
 
-	thetext = filereaders.highunicodefileload(datapath + authorobject.dataprefix+authorobject.number + '.TXT')
+	if binaryfrontend:
+		thetext = filereaders.compacthighunicodefileload(datapath + authorobject.dataprefix + authorobject.number + '.TXT')
+	else:
+		thetext = filereaders.highunicodefileload(datapath + authorobject.dataprefix+authorobject.number + '.TXT')
 
 	thisauthor = authorobject.dataprefix+authorobject.number
 	if fixingcapu and thisauthor in authorneedscapufix:
-		thetext = capitalvforcapitalu(thetext)
+		thetext = profiledcall(thisauthor, 'capitalvforcapitalu', capitalvforcapitalu, thetext)
 
-	initial = [earlybirdsubstitutions, replacequotationmarks, replaceaddnlchars]
-	greekmiddle = [colonshift, replacegreekmarkup, replacecoptic, latinfontlinemarkupprober,
-	               replacegreekbetacode, restoreromanwithingreek, greekhmufontshiftsintospans]
-	latinmiddle = [latinauthorlinemarkupprober, latindiacriticals, latinhmufontshiftsintospans]
-	final = [cleanuplingeringmesses, purgehybridgreekandlatinwords]
-
-	if language == 'G' and authorobject.language == 'G':
-		functionlist = initial + greekmiddle + final
-	else:
-		functionlist = initial + latinmiddle + final
+	functionlist = initialparsingfunctions(authorobject, language)
 
 	count = 0
 	for f in functionlist:
-		thetext = f(thetext)
+		thetext = profiledcall(thisauthor, f.__name__, f, thetext)
 
 		if debugoutput:
 			count += 1
@@ -440,7 +902,31 @@ def initialworkparsing(authorobject, language, datapath, debugoutput=False, debu
 	return thetext
 
 
-def secondaryworkparsing(authorobject, thetext: str, debugoutput=False, debugnewlines=True) -> List[str]:
+def initialparsingfunctions(authorobject, language) -> list:
+	"""
+
+	the one-argument functions that initialworkparsing() will run, in order
+
+	:param authorobject:
+	:param language:
+	:return:
+	"""
+
+	initial = [earlybirdsubstitutions, replacequotationmarks, replaceaddnlchars]
+	greekmiddle = [colonshift, replacegreekmarkup, replacecoptic, latinfontlinemarkupprober,
+	               replacegreekbetacode, restoreromanwithingreek, greekhmufontshiftsintospans]
+	latinmiddle = [latinauthorlinemarkupprober, latindiacriticals, latinhmufontshiftsintospans]
+	final = [cleanuplingeringmesses, purgehybridgreekandlatinwords]
+
+	if language == 'G' and authorobject.language == 'G':
+		functionlist = initial + greekmiddle + final
+	else:
+		functionlist = initial + latinmiddle + final
+
+	return functionlist
+
+
+def secondaryworkparsing(authorobject, thetext: str, debugoutput=False, debugnewlines=True) -> Iterable[list]:
 	"""
 
 	the next big step is turning the datastream into a citeable text
@@ -455,27 +941,38 @@ def secondaryworkparsing(authorobject, thetext: str, debugoutput=False, debugnew
 	outsuffix = config['io']['debugoutfile']
 	filename = '{dir}{af}_2{count}_{fnc}{suffix}'
 
+	# next, the one-argument functions
+	functionlist = [hexrunner, lastsecondsubsitutions, debughostilesubstitutions, insertnewlines, fixhmuoragnizationlinebyline, totallemmatization]
+
 	# first: the two-argument function
-	thetext = addcdlabels(thetext, authorobject.number)
+	if binaryfrontend:
+		# decodecontrolruns() does the work of addcdlabels() and hexrunner()
+		twoargumentfunction = decodecontrolruns
+		functionlist.remove(hexrunner)
+	else:
+		twoargumentfunction = addcdlabels
+
+	thisauthor = authorobject.dataprefix + authorobject.number
+	thetext = profiledcall(thisauthor, twoargumentfunction.__name__, twoargumentfunction, thetext, authorobject.number)
 
 	if debugoutput:
 		count = 1
-		fn = filename.format(dir=outputdir, af=authorobject.dataprefix + authorobject.number, count=chr(count + 96), fnc='addcdlabels', suffix=outsuffix)
+		fn = filename.format(dir=outputdir, af=authorobject.dataprefix + authorobject.number, count=chr(count + 96), fnc=getattr(twoargumentfunction, '__name__'), suffix=outsuffix)
 
 		if debugnewlines:
 			filereaders.streamout(re.sub(' █', '\n█', thetext), fn)
 		else:
 			filereaders.streamout(thetext, fn)
 
-	# next, the one-argument functions
-	functionlist = [hexrunner, lastsecondsubsitutions, debughostilesubstitutions, insertnewlines, fixhmuoragnizationlinebyline, totallemmatization]
-
 	count = 1
 	for f in functionlist:
-		# note that we are shifting types in the course of this: str -> str; str -> list; list -> list
-		thetext = f(thetext)
+		# note that we are shifting types in the course of this: str -> str; str -> lines; lines -> lines
+		thetext = profiledcall(thisauthor, f.__name__, f, thetext)
 
 		if debugoutput:
+			if not isinstance(thetext, str):
+				# the lines come out of a generator: they have to stick around to be written to disk
+				thetext = list(thetext)
 			if isinstance(thetext, list):
 				outputfunction = filereaders.linesout
 			else:
@@ -491,24 +988,256 @@ def secondaryworkparsing(authorobject, thetext: str, debugoutput=False, debugnew
 	return thetext
 
 
-def databaseloading(dbreadyversion: list, authorobject: dbAuthor, dbconnection):
+def joinparsedchunks(authorobject, parsedchunks: list):
+	"""
+
+	put the chunks back together and run the rest of secondaryworkparsing() on the whole
+
+	the str -> str functions ran on the chunks: see chunkparser(); insertnewlines(), ..., totallemmatization() run
+	on the whole: totallemmatization() has to carry the citation levels from one chunk to the next and it is cheap
+	to just let it do that
+
+	:param authorobject:
+	:param parsedchunks:
+	:return: what secondaryworkparsing() would have returned
+	"""
+
+	thetext = str().join(parsedchunks)
+
+	functionlist = [insertnewlines, fixhmuoragnizationlinebyline, totallemmatization]
+	for f in functionlist:
+		thetext = profiledcall(authorobject.dataprefix + authorobject.number, f.__name__, f, thetext)
+
+	return thetext
+
+
+def chunkworkitems(thework, workercount: int, usecache: bool) -> list:
 	"""
 
-	a little more cleaning, then insert this material into the database
+	the chunks of a large author as work items for managedworker():
+
+		('chunk', thework, authorid, chunknumber, start, stop)
+
+	no items if there is nothing to cut or if the parse cache will hand the author over anyway: then the author
+	stays an ordinary work item
+
+	the result is the same as that of the serial path, but only if no regex match would have run across one of
+	the cuts: see 'unclosedattail' in cdblocks.py; managedworker() parses the author in one piece if any chunk
+	might fail that test; 'makecorpora.py --checkchunking' compares the two paths: see checkchunking()
+
+	requires the 'binaryfrontend' since addcdlabels() has searches that can run across the cuts
+
+	:param thework:
+	:param workercount:
+	:param usecache:
+	:return:
+	"""
+
+	(authorid, name), = thework[0].items()
+
+	if usecache and parsecacheactive and path.exists(cachefilename(workitemchecksum(thework))):
+		return list()
+
+	authorobject = buildauthorobject(authorid, thework[1], thework[3], thework[2], thework[4])
+
+	with open(thework[3] + authorid + '.TXT', 'rb') as f:
+		# the serial path never sees the final byte of the file
+		rawbytes = f.read()[:-1]
+
+	# more chunks than workers so that one slow chunk does not hold everyone up
+	chunks = cdblockchunks(rawbytes, authorobject.number, workercount * 4)
+
+	if len(chunks) < 2:
+		return list()
+
+	items = list()
+	start = 0
+	for n, c in enumerate(chunks):
+		items.append(('chunk', thework, authorid, n, start, start + len(c)))
+		start += len(c)
+
+	return items
+
+
+def parseonechunk(chunkitem: tuple, chunkedauthors: ChunkedAuthors):
+	"""
+
+	chunkparser() for one of the items from chunkworkitems()
+
+	:param chunkitem:
+	:param chunkedauthors:
+	:return: [(parsedchunk, selfcontained), ...] if this was the last chunk of its author; otherwise None
+	"""
+
+	(marker, thework, authorid, chunknumber, start, stop) = chunkitem
+
+	authorobject = buildauthorobject(authorid, thework[1], thework[3], thework[2], thework[4])
+	authorobject.language = thework[1]
+
+	with open(thework[3] + authorid + '.TXT', 'rb') as f:
+		f.seek(start)
+		rawchunk = f.read(stop - start)
+
+	parsedchunk, selfcontained = chunkparser(authorobject, thework[1], rawchunk)
+
+	return chunkedauthors.store(authorid, chunknumber, parsedchunk, selfcontained)
+
+
+def checkchunking(corpusvars: dict) -> bool:
+	"""
+
+	does cutting the large authors into chunks change what they look like once parsed?
+
+	every author above 'splitauthorsabove' gets parsed twice: in one piece and chunk by chunk just as
+	dispatchcorpustexts() and managedworker() would do it; then the two dbprepper() outputs are compared
+
+	'makecorpora.py --checkchunking' runs this
+
+	:param corpusvars:
+	:return:
+	"""
+
+	if not binaryfrontend or not splitauthorsabove:
+		print("nothing to check: set 'binaryfrontend = y' and 'splitauthorsabove' to the size (in MB) you want to check")
+		return False
+
+	workercount = setworkercount()
+
+	giants = list()
+	for corpusname in corpusvars:
+		if not path.isdir(corpusvars[corpusname]['datapath']):
+			continue
+		abbrev = corpusvars[corpusname]['tmpprefix']
+		if abbrev is None:
+			abbrev = corpusvars[corpusname]['corpusabbrev']
+		listoftexts = findcorpustexts(corpusname, corpusvars, abbrev)
+		giants += [t for t in listoftexts if path.getsize('{p}{id}.TXT'.format(p=t[3], id=list(t[0].keys())[0])) > splitauthorsabove * 1024 * 1024]
+
+	print('parsing {n} authors above {mb}MB in one piece and in chunks'.format(n=len(giants), mb=splitauthorsabove))
+
+	manager = Manager()
+	allagree = True
+	for thework in giants:
+		(authorid, name), = thework[0].items()
+		authorobject = buildauthorobject(authorid, thework[1], thework[3], thework[2], thework[4])
+		authorobject.addauthtabname(name)
+		authorobject.language = thework[1]
+
+		items = chunkworkitems(thework, workercount, False)
+		if not items:
+			print('	{a}: nothing to cut'.format(a=authorid))
+			continue
+
+		chunkedauthors = ChunkedAuthors(manager)
+		chunkedauthors.expect(authorid, len(items))
+		with Pool(processes=workercount) as pool:
+			parsedchunks = [p for p in pool.starmap(parseonechunk, [(i, chunkedauthors) for i in items]) if p is not None][0]
+
+		if not all(selfcontained for (chunk, selfcontained) in parsedchunks):
+			print('	{a}: {n} chunks; not self-contained: the build would parse it in one piece'.format(a=authorid, n=len(items)))
+			continue
+
+		txt = joinparsedchunks(authorobject, [chunk for (chunk, selfcontained) in parsedchunks])
+		chunked = list(builder.dbinteraction.dbprepsubstitutions.dbprepper(txt))
+
+		txt = initialworkparsing(authorobject, thework[1], thework[3], False, True)
+		txt = secondaryworkparsing(authorobject, txt, False, True)
+		serial = list(builder.dbinteraction.dbprepsubstitutions.dbprepper(txt))
+
+		if chunked == serial:
+			print('	{a}: {n} chunks; {l} identical lines'.format(a=authorid, n=len(items), l=len(serial)))
+			continue
+
+		allagree = False
+		firstdifference = min([i for i in range(min(len(chunked), len(serial))) if chunked[i] != serial[i]] + [min(len(chunked), len(serial))])
+		print('	{a}: {n} chunks; the outputs DIFFER: {c} vs {s} lines; first difference at line {f}'.format(a=authorid, n=len(items), c=len(chunked), s=len(serial), f=firstdifference))
+		for version, lines in [('one piece', serial), ('chunks', chunked)]:
+			if firstdifference < len(lines):
+				print('		{v}: {l}'.format(v=version, l=lines[firstdifference]))
+
+	return allagree
+
+
+def chunkparser(authorobject, language, rawchunk: bytes) -> tuple:
+	"""
+
+	run a chunk of a file through every str -> str function of initialworkparsing() + secondaryworkparsing()
+
+	:param authorobject:
+	:param language:
+	:param rawchunk:
+	:return: (parsedchunk, selfcontained)
+	"""
+
+	thisauthor = authorobject.dataprefix + authorobject.number
+	thetext = filereaders.compacthighunicode(rawchunk)
+
+	functionlist = initialparsingfunctions(authorobject, language)
+	if fixingcapu and thisauthor in authorneedscapufix:
+		functionlist = [capitalvforcapitalu] + functionlist
+
+	for f in functionlist:
+		# the text goes first: profiledcall() measures the input by its first argument
+		thetext = profiledcall(thisauthor, f.__name__, chunkfunctionrunner, thetext, f)
+		if thetext is None:
+			return str(), False
+
+	thetext = profiledcall(thisauthor, decodecontrolruns.__name__, decodecontrolruns, thetext, authorobject.number)
+
+	for f in [lastsecondsubsitutions, debughostilesubstitutions]:
+		thetext = profiledcall(thisauthor, f.__name__, f, thetext)
+
+	return thetext, True
+
+
+def chunkfunctionrunner(thetext: str, function):
+	"""
+
+	run a function on a chunk unless the chunk is not self-contained as far as that function is concerned
+
+	:param thetext:
+	:param function:
+	:return: the new text or None
+	"""
+
+	try:
+		unclosed = unclosedattail[function]
+	except KeyError:
+		return function(thetext)
+
+	if unclosed(thetext):
+		return None
+
+	thetext = function(thetext)
+
+	if unclosed(thetext):
+		return None
+
+	return thetext
+
+
+def databaseloading(dbreadyversion: Iterable[list], authorobject: dbAuthor, dbconnection, bulkload=False):
+	"""
+
+	insert the dbprepper() output into the database
 	time to hand things off to HipparchiaServer
 
 	:param dbreadyversion:
 	:param authorobject:
 	:param dbconnection:
 	:param cursor:
+	:param bulkload:
 	:return:
 	"""
 
-	dbreadyversion = builder.dbinteraction.dbprepsubstitutions.dbprepper(dbreadyversion)
+	if bulkload:
+		# the CREATE and the COPY have to share a transaction: the previous author might have left us in autocommit
+		dbconnection.setdefaultisolation()
+
 	# pickle.dump(dbreadyversion, outputfile, open( "wb"))
 	builder.dbinteraction.dbhelperfunctions.dbauthoradder(authorobject, dbconnection)
-	builder.dbinteraction.dbhelperfunctions.authortablemaker(authorobject.universalid, dbconnection)
-	dbloading.insertworksintoauthortable(authorobject, dbreadyversion, dbconnection)
+	builder.dbinteraction.dbhelperfunctions.authortablemaker(authorobject.universalid, dbconnection, bulkload=bulkload)
+	dbloading.insertworksintoauthortable(authorobject, dbreadyversion, dbconnection, bulkload=bulkload)
 
 	# to debug return dbreadyversion
 	return
@@ -6,8 +6,9 @@
 		(see LICENSE in the top level directory of the distribution)
 """
 
-from os import name as osname
+from os import getpid, name as osname
 from multiprocessing import Process
+from multiprocessing.util import Finalize
 
 import psycopg2
 import psycopg2.pool as connectionpool
@@ -20,6 +21,9 @@ from builder.workers import setworkercount
 config = configparser.ConfigParser()
 config.read('config.ini', encoding='utf8')
 
+# {pid: RegisteredConnectionObject}: see registeredconnection()
+registeredconnections = dict()
+
 
 def setconnection(autocommit=False, simple=False):
 	"""
@@ -59,6 +63,42 @@ def setconnection(autocommit=False, simple=False):
 	return c
 
 
+def registeredconnection(autocommit=False):
+	"""
+
+	the connection that belongs to this process: opened the first time it is asked for and then handed out again
+	and again until the process exits
+
+	for the small helpers that get called thousands of times per worker (grabminimallineobjectsfromlist(), ...):
+	setconnection() + connectioncleanup() would cost a new TCP connection + authentication every time
+
+	every request gets the connection back in the state that setconnection() would have left a new one in; so
+	only ask for it in a function that will not call another function that asks for it before it is done
+
+	a process that was forked from one that has a registered connection does not use the parent's: it gets its own
+
+	:param autocommit:
+	:return:
+	"""
+
+	pid = getpid()
+
+	try:
+		c = registeredconnections[pid]
+	except KeyError:
+		c = None
+
+	if c is None or c.connectionisclosed():
+		c = RegisteredConnectionObject()
+		registeredconnections[pid] = c
+		# multiprocessing runs these as a Process (or the main process) exits
+		Finalize(c, c.reallyclose, exitpriority=10)
+
+	c.reset(autocommit)
+
+	return c
+
+
 def icanpickleconnections():
 	if osname == 'nt':
 		return False
@@ -83,6 +123,24 @@ def icanpickleconnections():
 	return result
 
 
+def forgetinheritedpools():
+	"""
+
+	a process that was forked from one that has a pool has the very same sockets in its copy of the pool; if the
+	parent keeps on working while the child runs (see scheduleindexing()), they cannot both hand out those connections
+
+	so give the child pools of its own; but hang on to the old ones: if they were garbage collected, closing their
+	connections would also close them for the parent
+
+	:return:
+	"""
+
+	PooledConnectionObject._inherited.append(PooledConnectionObject._pools)
+	PooledConnectionObject._pools = dict()
+
+	return
+
+
 class GenericConnectionObject(object):
 	"""
 
@@ -140,6 +198,9 @@ class GenericConnectionObject(object):
 	def commit(self):
 		getattr(self.dbconnection, 'commit')()
 
+	def rollback(self):
+		getattr(self.dbconnection, 'rollback')()
+
 	def close(self):
 		return getattr(self, 'connectioncleanup')()
 
@@ -204,6 +265,7 @@ class PooledConnectionObject(GenericConnectionObject):
 	"""
 
 	_pools = dict()
+	_inherited = list()
 
 	def __init__(self, autocommit='defaultisno', readonlyconnection=True, ctype='rw'):
 		super().__init__(autocommit, readonlyconnection)
@@ -346,3 +408,35 @@ class SimpleConnectionObject(GenericConnectionObject):
 		# print('deleted connection', self.uniquename)
 
 		return
+
+
+class RegisteredConnectionObject(SimpleConnectionObject):
+	"""
+
+	a SimpleConnectionObject that outlives the function that asked for it: see registeredconnection()
+
+	connectioncleanup() commits but does not close; reallyclose() does that when the process is done
+
+	"""
+
+	def __init__(self):
+		super().__init__(readonlyconnection=False, ctype='rw')
+
+	def reset(self, autocommit):
+		if self.dbconnection.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+			self.rollback()
+		# what SimpleConnectionObject() does to a new connection
+		self.setreadonly(False)
+		if autocommit:
+			self.setautocommit()
+
+	def connectioncleanup(self):
+		self.commit()
+
+		return
+
+	def reallyclose(self):
+		if not self.connectionisclosed():
+			SimpleConnectionObject.connectioncleanup(self)
+
+		return
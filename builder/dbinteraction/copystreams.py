@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+"""
+	HipparchiaBuilder: compile a database of Greek and Latin texts
+	Copyright: E Gunderson 2016-23
+	License: GNU GENERAL PUBLIC LICENSE 3
+		(see LICENSE in the top level directory of the distribution)
+"""
+
+import configparser
+import io
+import re
+import struct
+from typing import Iterable
+
+config = configparser.ConfigParser()
+config.read('config.ini', encoding='utf8')
+
+try:
+	bc = config['buildoptions']['binarycopy']
+except KeyError:
+	bc = 'n'
+
+if bc == 'y':
+	binarycopy = True
+else:
+	binarycopy = False
+
+"""
+	postgres inserts much faster via "COPY FROM"; and the rows do not need to be sitting in memory in order to be
+	copied: the streams below turn rows into COPY data only as the server asks for more of it
+
+	the text format needs every field escaped: a tab, newline, or backslash in a line of text would otherwise
+	shift the columns or eat a character
+
+	the binary format needs no escaping at all, but it has to know the type of every column: see copyrowsintotable()
+"""
+
+textcopyescapes = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+binarycopyheader = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+binarycopytrailer = struct.pack('>h', -1)
+
+int4 = struct.Struct('>ii')
+int8 = struct.Struct('>iq')
+fieldlength = struct.Struct('>i')
+fieldcount = struct.Struct('>h')
+binaryfieldsizes = {'i': 4, 'b': 8, '?': 1}
+
+textcopyunescapes = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v'}
+textcopyescaped = re.compile(r'\\(?:([0-7]{1,3})|x([0-9A-Fa-f]{1,2})|(.))', re.DOTALL)
+
+# the first one that a declared type starts with wins: so 'character varying' has to come before 'character'
+sqlcopytypes = [('character varying', 't'), ('character', 't'), ('varchar', 't'), ('text', 't'), ('integer', 'i'),
+                ('bigint', 'b'), ('boolean', '?')]
+
+
+def copyrowsintotable(dbcursor, table: str, columns: Iterable[str], rows: Iterable[tuple], columntypes=None, freeze=False):
+	"""
+
+	COPY the rows into the table
+
+	columntypes is a string with one character per column:
+		't'     text, varchar, char
+		'i'     integer
+		'b'     bigint
+		'?'     boolean
+
+	if 'binarycopy' is set and the columntypes are known, the data goes over as binary COPY; otherwise as text
+
+	freeze: the rows are written already frozen; only legal if the table was created (or truncated) in the
+	transaction that is doing the COPY
+
+	:param dbcursor:
+	:param table:
+	:param columns:
+	:param rows: tuples that line up with the columns; None is NULL
+	:param columntypes:
+	:param freeze:
+	:return:
+	"""
+
+	columns = list(columns)
+	columnlist = ', '.join('"{c}"'.format(c=c) for c in columns)
+
+	options = list()
+
+	if binarycopy and columntypes:
+		stream = BinaryCopyStream(rows, columntypes)
+		options.append('FORMAT binary')
+	else:
+		stream = TextCopyStream(rows)
+
+	if freeze:
+		options.append('FREEZE')
+
+	q = 'COPY "{t}" ({c}) FROM STDIN'.format(t=table, c=columnlist)
+	if options:
+		q = '{q} WITH ({o})'.format(q=q, o=', '.join(options))
+
+	dbcursor.copy_expert(q, stream)
+
+	return
+
+
+def textcopyfield(value) -> str:
+	"""
+
+	one field in the COPY text format
+
+	:param value:
+	:return:
+	"""
+
+	if value is None:
+		return '\\N'
+
+	if value is True:
+		return 't'
+
+	if value is False:
+		return 'f'
+
+	return str(value).translate(textcopyescapes)
+
+
+def textcopyrow(row: tuple) -> str:
+	return '\t'.join([textcopyfield(v) for v in row]) + '\n'
+
+
+def binarycopyrow(row: tuple, columntypes: str) -> bytes:
+	"""
+
+	one tuple in the COPY binary format: a field count and then a length + the bytes for every field
+
+	:param row:
+	:param columntypes:
+	:return:
+	"""
+
+	fields = [fieldcount.pack(len(row))]
+
+	for value, columntype in zip(row, columntypes):
+		if value is None:
+			fields.append(fieldlength.pack(-1))
+		elif columntype == 'i':
+			fields.append(int4.pack(4, int(value)))
+		elif columntype == 'b':
+			fields.append(int8.pack(8, int(value)))
+		elif columntype == '?':
+			fields.append(fieldlength.pack(1) + (b'\x01' if value else b'\x00'))
+		else:
+			encoded = str(value).encode('utf-8')
+			fields.append(fieldlength.pack(len(encoded)) + encoded)
+
+	return b''.join(fields)
+
+
+def columntypesfor(columns: Iterable[str], typesbycolumn: dict) -> str:
+	"""
+
+	the columntypes string that copyrowsintotable() wants for these columns of a table
+
+	:param columns:
+	:param typesbycolumn: {column: 't', 'i', 'b', or '?'}
+	:return:
+	"""
+
+	return str().join([typesbycolumn[c] for c in columns])
+
+
+def readtextcopyrow(line: str) -> tuple:
+	"""
+
+	what postgres will make of one line of COPY text: the inverse of textcopyrow()
+
+	every value comes back as a string (or None): the server, not the stream, turns '7' into 7
+
+	:param line:
+	:return:
+	"""
+
+	if not line.endswith('\n'):
+		raise ValueError('no newline at the end of the row')
+
+	line = line[:-1]
+	if '\n' in line or '\r' in line:
+		raise ValueError('an unescaped newline inside the row')
+
+	return tuple([readtextcopyfield(f) for f in line.split('\t')])
+
+
+def readtextcopyfield(field: str):
+	"""
+
+	'\\N' is NULL; otherwise undo the backslash escapes
+
+	:param field:
+	:return:
+	"""
+
+	if field == '\\N':
+		return None
+
+	return textcopyescaped.sub(textcopyunescape, field)
+
+
+def textcopyunescape(match) -> str:
+	octal, hexadecimal, character = match.groups()
+	if octal:
+		return chr(int(octal, 8))
+	if hexadecimal:
+		return chr(int(hexadecimal, 16))
+	return textcopyunescapes.get(character, character)
+
+
+def readbinarycopy(data: bytes, columntypes: str) -> list:
+	"""
+
+	what postgres will make of a BinaryCopyStream: the inverse of binarycopyrow() + the header and the trailer
+
+	:param data:
+	:param columntypes:
+	:return:
+	"""
+
+	if not data.startswith(binarycopyheader):
+		raise ValueError('bad binary COPY header')
+
+	rows = list()
+	position = len(binarycopyheader)
+
+	while True:
+		if position + fieldcount.size > len(data):
+			raise ValueError('no binary COPY trailer')
+		count = fieldcount.unpack_from(data, position)[0]
+		position += fieldcount.size
+		if count == -1:
+			break
+		if count != len(columntypes):
+			raise ValueError('{c} fields in a row of {n} columns'.format(c=count, n=len(columntypes)))
+		row = list()
+		for columntype in columntypes:
+			if position + fieldlength.size > len(data):
+				raise ValueError('a row that breaks off in the middle')
+			length = fieldlength.unpack_from(data, position)[0]
+			position += fieldlength.size
+			if length == -1:
+				row.append(None)
+				continue
+			value = data[position:position + length]
+			position += length
+			if len(value) != length or len(value) != binaryfieldsizes.get(columntype, length):
+				raise ValueError('a {n} byte field for a "{c}" column'.format(n=length, c=columntype))
+			if columntype == 'i':
+				row.append(struct.unpack('>i', value)[0])
+			elif columntype == 'b':
+				row.append(struct.unpack('>q', value)[0])
+			elif columntype == '?':
+				row.append(value == b'\x01')
+			else:
+				row.append(value.decode('utf-8'))
+		rows.append(tuple(row))
+
+	if position != len(data):
+		raise ValueError('{n} bytes after the trailer'.format(n=len(data) - position))
+
+	return rows
+
+
+def sqlcolumntypes(sql: str, table: str) -> dict:
+	"""
+
+	the columntypes of the columns of the table according to the CREATE TABLE statement for it in the sql
+
+	{column: 't', 'i', 'b', '?'}; None for a type that copyrowsintotable() does not know (real, jsonb, ...)
+
+	:param sql:
+	:param table:
+	:return:
+	"""
+
+	create = re.search(r'CREATE\s+(?:UNLOGGED\s+)?TABLE\s+(?:public\.)?"?{t}"?\s*\('.format(t=re.escape(table)), sql)
+	if not create:
+		raise ValueError('no CREATE TABLE statement for {t}'.format(t=table))
+
+	# the column definitions are separated by the commas that are not inside '(...)'
+	definitions = list()
+	current = list()
+	depth = 1
+	for character in sql[create.end():]:
+		if character == '(':
+			depth += 1
+		elif character == ')':
+			depth -= 1
+			if depth == 0:
+				break
+		elif character == ',' and depth == 1:
+			definitions.append(str().join(current))
+			current = list()
+			continue
+		current.append(character)
+	definitions.append(str().join(current))
+
+	columntypes = dict()
+	for definition in definitions:
+		column, declared = definition.split(None, 1)
+		declared = declared.lower()
+		columntypes[column.strip('"')] = next((c for s, c in sqlcopytypes if declared.startswith(s)), None)
+
+	return columntypes
+
+
+class TextCopyStream(io.TextIOBase):
+	"""
+
+	a read-only file-like object that turns rows into COPY text as they are read
+
+	copy_expert() and copy_from() only ever call read(size) and readline()
+
+	"""
+
+	def __init__(self, rows: Iterable[tuple]):
+		self.lines = (textcopyrow(r) for r in rows)
+		self.buffer = str()
+
+	def readable(self):
+		return True
+
+	def fill(self, size):
+		# size < 0 means: everything
+		chunks = [self.buffer]
+		buffered = len(self.buffer)
+		while size < 0 or buffered < size:
+			try:
+				chunks.append(next(self.lines))
+			except StopIteration:
+				break
+			buffered += len(chunks[-1])
+		self.buffer = str().join(chunks)
+
+	def read(self, size=-1):
+		if size is None:
+			size = -1
+		self.fill(size)
+		if size < 0:
+			chunk = self.buffer
+			self.buffer = str()
+		else:
+			chunk = self.buffer[:size]
+			self.buffer = self.buffer[size:]
+		return chunk
+
+	def readline(self, size=-1):
+		if not self.buffer:
+			try:
+				self.buffer = next(self.lines)
+			except StopIteration:
+				return str()
+		end = self.buffer.find('\n') + 1 or len(self.buffer)
+		if size is not None and 0 <= size < end:
+			end = size
+		line = self.buffer[:end]
+		self.buffer = self.buffer[end:]
+		return line
+
+
+class BinaryCopyStream(io.RawIOBase):
+	"""
+
+	a read-only file-like object that turns rows into COPY binary data as they are read
+
+	"""
+
+	def __init__(self, rows: Iterable[tuple], columntypes: str):
+		self.tuples = (binarycopyrow(r, columntypes) for r in rows)
+		self.buffer = bytearray(binarycopyheader)
+		self.finished = False
+
+	def readable(self):
+		return True
+
+	def fill(self, size):
+		while not self.finished and (size < 0 or len(self.buffer) < size):
+			try:
+				self.buffer += next(self.tuples)
+			except StopIteration:
+				self.buffer += binarycopytrailer
+				self.finished = True
+
+	def read(self, size=-1):
+		if size is None:
+			size = -1
+		self.fill(size)
+		if size < 0:
+			size = len(self.buffer)
+		chunk = bytes(self.buffer[:size])
+		del self.buffer[:size]
+		return chunk
+
+	def readinto(self, b):
+		chunk = self.read(len(b))
+		b[:len(chunk)] = chunk
+		return len(chunk)
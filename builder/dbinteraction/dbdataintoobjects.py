@@ -9,7 +9,7 @@
 import psycopg2
 
 from builder.builderclasses import dbAuthor, dbLemmaObject, dbOpus, dbWordCountObject, dbWorkLine
-from builder.dbinteraction.connection import setconnection
+from builder.dbinteraction.connection import registeredconnection, setconnection
 from builder.dbinteraction.dbhelperfunctions import resultiterator
 
 
@@ -31,51 +31,6 @@ def dbfetchauthorobject(uid, dbcursor):
 	return author
 
 
-def generatecomprehensivesetoflineobjects():
-	"""
-
-	grab every line from every table
-
-	turn ito into a hollow lineobject (since we only need the polytonic line and the universalid)
-
-	note the construction of the index: 'gr3018_LN_4773', etc.
-
-	:return:
-	"""
-
-	print('grabbing every line from every table: this is slow and memory-intensive...')
-
-	dbconnection = setconnection()
-	dbcursor = dbconnection.cursor()
-
-	q = 'SELECT universalid FROM authors'
-	dbcursor.execute(q)
-
-	authors = [a[0] for a in resultiterator(dbcursor)]
-
-	# test
-	# authors = authors[:10]
-
-	qtemplate = 'SELECT index, wkuniversalid, accented_line FROM {t}'
-
-	everyline = dict()
-	total = len(authors)
-	steps = int(total/10)
-	index = 0
-	for a in authors:
-		q = qtemplate.format(t=a)
-		dbcursor.execute(q)
-		foundlines = resultiterator(dbcursor)
-		minimallineobjects = [makeminimallineobject(*f) for f in foundlines]
-		everyline.update({'{a}_LN_{ln}'.format(a=a, ln=h.index): h for h in minimallineobjects})
-		index += 1
-		if index % steps == 0:
-			percent = int((index / steps) * 10)
-			print('\t{n}% of authors loaded'.format(n=percent))
-
-	return everyline
-
-
 def makeminimallineobject(index, wkuniversalid, accented_line):
 	"""
 
@@ -146,12 +101,14 @@ def grabminimallineobjectsfromlist(db, linelist):
 		table id: 'gr0001'
 		index values: [1, 2, 5, 10]
 
+	mpbuildindexdictionary() calls this once per table per worker: so use the connection that belongs to the worker
+
 	:param db:
 	:param range:
 	:return:
 	"""
 
-	dbconnection = setconnection(simple=True)
+	dbconnection = registeredconnection()
 	dbcursor = dbconnection.cursor()
 
 	linelist.sort()
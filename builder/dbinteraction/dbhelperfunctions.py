@@ -6,9 +6,24 @@
 		(see LICENSE in the top level directory of the distribution)
 """
 
+import configparser
 import re
 
 from builder.dbinteraction.connection import setconnection
+from builder.dbinteraction.versioning import forgetauthorbuildrecords
+
+config = configparser.ConfigParser()
+config.read('config.ini', encoding='utf8')
+
+try:
+	swl = config['buildoptions']['storewordlists']
+except KeyError:
+	swl = 'n'
+
+if swl == 'y':
+	storewordlists = True
+else:
+	storewordlists = False
 
 
 def resultiterator(cursor, chunksize=5000):
@@ -33,11 +48,16 @@ def resultiterator(cursor, chunksize=5000):
 			yield result
 
 
-def authortablemaker(authordbname, dbconnection):
+def authortablemaker(authordbname, dbconnection, bulkload=False):
 	"""
 	SQL prep only
+
+	bulkload: an UNLOGGED table without the UNIQUE index and nothing gets committed: the COPY has to happen in the
+	same transaction (see insertworksintoauthortable()) and finishbulkload() will add the index + turn on the WAL later
+
 	:param workdbname:
 	:param cursor:
+	:param bulkload:
 	:return:
 	"""
 
@@ -46,9 +66,13 @@ def authortablemaker(authordbname, dbconnection):
 	query = 'DROP TABLE IF EXISTS public.{adb}'.format(adb=authordbname)
 	dbcursor.execute(query)
 
+	# a word list that outlived its author table would no longer match it
+	query = 'DROP TABLE IF EXISTS public.{wl}'.format(wl=wordlisttablename(authordbname))
+	dbcursor.execute(query)
+
 	template = """
-		CREATE TABLE public.{adb} (
-			index integer NOT NULL UNIQUE DEFAULT nextval('{adb}'::regclass),
+		CREATE {unlogged}TABLE public.{adb} (
+			index integer NOT NULL{unique} DEFAULT nextval('{adb}'::regclass),
             wkuniversalid character varying(10) COLLATE pg_catalog."default",
             level_05_value character varying(64) COLLATE pg_catalog."default",
             level_04_value character varying(64) COLLATE pg_catalog."default",
@@ -64,16 +88,55 @@ def authortablemaker(authordbname, dbconnection):
         ) WITH ( OIDS=FALSE );
 	"""
 
-	query = template.format(adb=authordbname)
+	if bulkload:
+		query = template.format(adb=authordbname, unlogged='UNLOGGED ', unique='')
+	else:
+		query = template.format(adb=authordbname, unlogged='', unique=' UNIQUE')
 
 	dbcursor.execute(query)
 
 	query = 'GRANT SELECT ON TABLE {adb} TO hippa_rd;'.format(adb=authordbname)
 	dbcursor.execute(query)
 
+	if storewordlists:
+		wordlisttablemaker(authordbname, dbcursor)
+
 	# print('failed to create',workdbname)
 
-	dbconnection.commit()
+	if not bulkload:
+		dbconnection.commit()
+
+	return
+
+
+def wordlisttablename(authordbname: str) -> str:
+	return '{adb}_wordlist'.format(adb=authordbname)
+
+
+def wordlisttablemaker(authordbname, dbcursor):
+	"""
+	SQL prep only
+
+	the words of every line of an author as the wordcounts count them; written by insertworksintoauthortable() while
+	the author table is being loaded
+
+	'words' is the list of words joined by ' ': none of them contains a space (see countablewords())
+
+	unlike the author table this is never UNLOGGED: finishbulkload() only looks after the author tables
+
+	:param authordbname:
+	:param dbcursor:
+	:return:
+	"""
+
+	query = """
+		CREATE TABLE public.{wl} (
+			index integer NOT NULL UNIQUE,
+			wkuniversalid character varying(10) COLLATE pg_catalog."default",
+			words text COLLATE pg_catalog."default"
+		) WITH ( OIDS=FALSE );
+	"""
+	dbcursor.execute(query.format(wl=wordlisttablename(authordbname)))
 
 	return
 
@@ -218,6 +281,8 @@ def resetauthorsandworksdbs(tmpprefix, prefix):
 			q = 'DROP TABLE public.' + a
 			try:
 				dbcursor.execute(q)
+				q = 'DROP TABLE IF EXISTS public.' + wordlisttablename(a)
+				dbcursor.execute(q)
 			except:
 				# 'table "in090cw001" does not exist'
 				# because a build got interrupted? one hopes it is safe to pass
@@ -236,6 +301,46 @@ def resetauthorsandworksdbs(tmpprefix, prefix):
 		d = (zap + '%',)
 		dbcursor.execute(q, d)
 
+		forgetauthorbuildrecords(zap, dbconnection)
+
+	dbconnection.connectioncleanup()
+
+	return
+
+
+def resetselectedauthors(universalids: list):
+	"""
+
+	resetauthorsandworksdbs() for just a few authors: an incremental build needs to clear these out before
+	they are built again (or because they are gone from the data)
+
+	:param universalids:
+	:return:
+	"""
+
+	dbconnection = setconnection()
+	dbcursor = dbconnection.cursor()
+
+	for a in universalids:
+		q = 'DROP TABLE IF EXISTS public.' + a
+		dbcursor.execute(q)
+
+		q = 'DROP TABLE IF EXISTS public.' + wordlisttablename(a)
+		dbcursor.execute(q)
+
+		q = 'DELETE FROM authors WHERE universalid = %s'
+		d = (a,)
+		dbcursor.execute(q, d)
+
+		# works can vanish between builds too
+		q = 'DELETE FROM works WHERE universalid LIKE %s'
+		d = (a + 'w%',)
+		dbcursor.execute(q, d)
+
+		q = 'DELETE FROM builderauthorrecords WHERE universalid = %s'
+		d = (a,)
+		dbcursor.execute(q, d)
+
 	dbconnection.connectioncleanup()
 
 	return
@@ -6,13 +6,54 @@
         (see LICENSE in the top level directory of the distribution)
 """
 
-import io
 import json
-
-from builder.dbinteraction.dbhelperfunctions import workmaker
-
-
-def insertworksintoauthortable(authorobject, dbreadyversion, dbconnection):
+from pathlib import Path
+
+from builder.dbinteraction.copystreams import BinaryCopyStream, TextCopyStream, columntypesfor, copyrowsintotable, \
+    readbinarycopy, readtextcopyrow, sqlcolumntypes, textcopyrow
+from builder.dbinteraction.dbhelperfunctions import authortablemaker, storewordlists, wordlisttablemaker, \
+    wordlisttablename, workmaker
+from builder.postbuild.postbuildmetadata import workscolumntypes
+from builder.wordcounting.wordcountdbfunctions import createwordcounttable, wordcountcolumns, wordcountcolumntypes
+from builder.wordcounting.wordcounthelperfunctions import countablewords
+
+# the columns of an author table (see authortablemaker()) as copyrowsintotable() needs to know them
+# index is an integer; everything else is text (and the -1 of an unused level becomes '-1')
+authortablecolumntypes = {
+    'index': 'i',
+    'wkuniversalid': 't',
+    'level_05_value': 't',
+    'level_04_value': 't',
+    'level_03_value': 't',
+    'level_02_value': 't',
+    'level_01_value': 't',
+    'level_00_value': 't',
+    'marked_up_line': 't',
+    'accented_line': 't',
+    'stripped_line': 't',
+    'hyphenated_words': 't',
+    'annotations': 't'
+}
+
+# ditto for a word list table (see wordlisttablemaker())
+wordlistcolumntypes = {
+    'index': 'i',
+    'wkuniversalid': 't',
+    'words': 't'
+}
+
+# values that the COPY streams have to get across intact: see checkcopystreams()
+samplecopyvalues = {
+    't': ['tab\there', 'back\\slash', 'new\nline', 'carriage\rreturn', 'crlf\r\n', '\\N', '\\t is not a tab',
+          'a backslash at the end\\', '\\\\two', "Μή μ' ἔπεϲιν μὲν ϲτέργε", '&nbsp;<hmu_metadata_x value="1" />',
+          str(), ' ', -1, None],
+    'i': [0, 1, -1, 2147483647, -2147483648, None],
+    'b': [0, -1, 2 ** 40, 9223372036854775807, -9223372036854775808, None],
+    '?': [True, False, None]
+}
+
+
+def insertworksintoauthortable(authorobject, dbreadyversion, dbconnection, bulkload=False):
     """
 
     run throught the dbreadyversion and put it into the db
@@ -24,31 +65,35 @@ def insertworksintoauthortable(authorobject, dbreadyversion, dbconnection):
     yields a significant scheduler and filesystem problem; the costs were too high
 
     here is a marked line...
-    ['1', [('0', '87'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1')], "Μή μ' ἔπεϲιν μὲν ϲτέργε, νόον δ' ἔχε καὶ φρέναϲ ἄλληι, ", "Μη μ' επεϲιν μεν ϲτεργε, νοον δ' εχε και φρεναϲ αλληι, "]
+    ['1', ('87', '1', '1', '1', '1', '1'), "Μή μ' ἔπεϲιν μὲν ϲτέργε, νόον δ' ἔχε καὶ φρέναϲ ἄλληι, ", "Μη μ' επεϲιν μεν ϲτεργε, νοον δ' εχε και φρεναϲ αλληι, "]
 
     for hypens:
     SELECT * from gr9999w999 WHERE (stripped_line LIKE '%marinam%') OR (hyphenated_words LIKE '%marinam%')
 
+    bulkload: authortablemaker() just made an UNLOGGED table inside the current transaction; so the COPY can be
+    'FREEZE' and then everything gets committed at once
+
+    storewordlists: the words of each line get picked off as the lines stream into the COPY; they then go into the
+    word list table in a second COPY (see wordlisttablemaker())
+
     :param authorobject:
     :param dbreadyversion:
     :param cursor:
     :param dbconnection:
+    :param bulkload:
     :return:
     """
 
     dbcursor = dbconnection.cursor()
-    dbconnection.setautocommit()
+    if not bulkload:
+        dbconnection.setautocommit()
 
     for indexedat in range(len(authorobject.works)):
         # warning: '002' might be the value at work[0]
         workmaker(authorobject, indexedat, dbcursor)
 
-    separator = '\t'
-
     queryvalues = generatequeryvaluetuples(dbreadyversion, authorobject)
 
-    stream = generatecopystream(queryvalues, separator=separator)
-
     columns = ('index',
                'wkuniversalid',
                'level_00_value',
@@ -63,9 +108,57 @@ def insertworksintoauthortable(authorobject, dbreadyversion, dbconnection):
                'hyphenated_words',
                'annotations')
 
+    columntypes = columntypesfor(columns, authortablecolumntypes)
+
     table = authorobject.universalid
 
-    dbcursor.copy_from(stream, table, sep=separator, columns=columns)
+    wordlists = list()
+    if storewordlists:
+        queryvalues = collectwordlists(queryvalues, wordlists)
+
+    copyrowsintotable(dbcursor, table, columns, queryvalues, columntypes=columntypes, freeze=bulkload)
+
+    if storewordlists:
+        insertwordlists(dbcursor, table, wordlists, freeze=bulkload)
+
+    if bulkload:
+        dbconnection.commit()
+
+    return
+
+
+def collectwordlists(queryvalues, wordlists: list):
+    """
+
+    pass the rows along untouched; but append (index, wkuniversalid, words) to wordlists for each row that has words
+
+    :param queryvalues: rows that look like the ones generatequeryvaluetuples() yields
+    :param wordlists:
+    :return:
+    """
+
+    for row in queryvalues:
+        words = countablewords(row[9] or str())
+        if words:
+            wordlists.append((row[0], row[1], ' '.join(words)))
+        yield row
+
+
+def insertwordlists(dbcursor, table: str, wordlists: list, freeze=False):
+    """
+
+    COPY the output of collectwordlists() into the word list table of an author
+
+    :param dbcursor:
+    :param table:
+    :param wordlists:
+    :param freeze:
+    :return:
+    """
+
+    columns = ('index', 'wkuniversalid', 'words')
+    columntypes = columntypesfor(columns, wordlistcolumntypes)
+    copyrowsintotable(dbcursor, wordlisttablename(table), columns, wordlists, columntypes=columntypes, freeze=freeze)
 
     return
 
@@ -73,7 +166,7 @@ def insertworksintoauthortable(authorobject, dbreadyversion, dbconnection):
 def generatequeryvaluetuples(dbreadyversion, authorobject):
     """
 
-    generates a list of tuples
+    yields tuples
 
     this is something you can send to postgres that fits the query template:
 
@@ -93,12 +186,23 @@ def generatequeryvaluetuples(dbreadyversion, authorobject):
 
     i.e., vtemplate = '(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'
 
+    the citation in line[1] is the tuple of six level values that totallemmatization() built; the levels above the
+    top level of a work become -1. Most lines share their citation with their neighbors, so the padded version of
+    each citation is only built once
+
+    a generator: the COPY pulls the lines through dbprepper() one at a time
+
     :return:
     """
 
     index = 0
 
-    queryvalues = list()
+    padded = dict()
+
+    # level 5 contains useful information for the inscriptions: don't nuke it
+    # level00 = line; level01 = face; [gap in levels]; level05 = documentID
+    # all of this gets taken care of in secondpassdbrewrite.py
+    keepalllevels = authorobject.universalid[0:2] in ['zz', 'xx', 'yy', 'in', 'dp', 'ch']
 
     for line in dbreadyversion:
         if line[2] == '' or line[2] == ' ':
@@ -130,24 +234,22 @@ def generatequeryvaluetuples(dbreadyversion, authorobject):
                     print('could not find top level; workobject level list is empty: anum={a} wn={w} tit={t}'.format(
                         a=authorobject.universalid, w=wk.worknumber, t=wk.title.format))
 
-                tups = line[1]
+                citation = line[1]
 
-                if authorobject.universalid[0:2] in ['zz', 'xx', 'yy', 'in', 'dp', 'ch']:
-                    # level 5 contains useful information for the inscriptions: don't nuke it
-                    # level00 = line; level01 = face; [gap in levels]; level05 = documentID
-                    # all of this gets taken care of in secondpassdbrewrite.py
-                    pass
-                else:
-                    for lvl in range(0, len(tups)):
-                        if lvl > toplvl:
-                            # do we want '-1' instead?
-                            tups[lvl] = (lvl, -1)
-                queryvalues.append(
-                    tuple([index, wkuniversalid, tups[0][1], tups[1][1], tups[2][1], tups[3][1], tups[4][1], tups[5][1],
-                           line[2], line[3], line[4], line[5], line[6]]))
+                if not keepalllevels:
+                    try:
+                        citation = padded[(citation, toplvl)]
+                    except KeyError:
+                        # do we want '-1' instead?
+                        padded[(citation, toplvl)] = citation[:toplvl + 1] + (-1,) * (len(citation) - toplvl - 1)
+                        citation = padded[(citation, toplvl)]
+
+                queryvalue = (index, wkuniversalid) + citation + (line[2], line[3], line[4], line[5], line[6])
 
                 if index == 413 and wkuniversalid == 'gr2762w004':
-                    print('bugged line', queryvalues[-1])
+                    print('bugged line', queryvalue)
+
+                yield queryvalue
             except:
                 if index < 2:
                     # the proper work number will be set real soon now
@@ -161,33 +263,143 @@ def generatequeryvaluetuples(dbreadyversion, authorobject):
                     print(line)
                 pass
 
-    return queryvalues
 
+class SQLRecorder(object):
+    """
+
+    stands in for a connection and its cursor: the table makers write their SQL into it instead of into the db
 
-def generatecopystream(queryvaluetuples, separator='\t'):
     """
 
-    postgres inserts much faster via "COPY FROM"
+    def __init__(self):
+        self.statements = list()
 
-    prepare data to match the psychopg2.copy_from() interface
+    def cursor(self):
+        return self
 
-    copy_from(file, table, sep='\t', null='\\N', size=8192, columns=None)
-        Read data from the file-like object file appending them to the table named table.
+    def execute(self, query, *args):
+        self.statements.append(query)
 
-    see the example at http://initd.org/psycopg/docs/cursor.html:
+    def commit(self):
+        pass
 
-        f = StringIO("42\tfoo\n74\tbar\n")
-        cur.copy_from(f, 'test', columns=('num', 'data'))
+    def sql(self) -> str:
+        return '\n'.join(self.statements)
 
-    :param queryvaluetuples:
+
+def samplecopyrows(columntypes: str) -> list:
+    """
+
+    enough rows that every value in samplecopyvalues turns up in every column
+
+    :param columntypes:
     :return:
     """
 
-    copystream = io.StringIO()
+    count = max([len(samplecopyvalues[c]) for c in columntypes])
+    return [tuple(samplecopyvalues[c][(r + i) % len(samplecopyvalues[c])] for i, c in enumerate(columntypes))
+            for r in range(count)]
+
+
+def checkcopystreams() -> bool:
+    """
+
+    do the rows that copyrowsintotable() sends come out the other end the way they went in?
+
+    for the author tables, the word lists, the wordcounts, and the works table:
+        the types that the loaders use have to be the types in the CREATE TABLE statements
+        rows full of tabs, backslashes, newlines, CRs, and NULLs have to survive a trip through TextCopyStream and
+        BinaryCopyStream; the streams are read in small pieces the way copy_expert() reads them
 
-    for t in queryvaluetuples:
-        copystream.write(separator.join([str(x) for x in t]) + '\n')
+    'makecorpora.py --checkcopystreams' runs this
 
-    copystream.seek(0)
+    :return:
+    """
 
-    return copystream
+    recorder = SQLRecorder()
+    authortablemaker('gr0000', recorder)
+    authorsql = recorder.sql()
+
+    recorder = SQLRecorder()
+    wordlisttablemaker('gr0000', recorder)
+    wordlistsql = recorder.sql()
+
+    recorder = SQLRecorder()
+    createwordcounttable('wordcounts_0', dbcursor=recorder, index=False)
+    wordcountsql = recorder.sql()
+
+    templates = Path(__file__).resolve().parent.parent / 'sql'
+    workssql = (templates / 'generate_hipparchia_dbs.sql').read_text(encoding='utf8')
+
+    loads = [('author tables', authorsql, 'gr0000', authortablecolumntypes),
+             ('word lists', wordlistsql, wordlisttablename('gr0000'), wordlistcolumntypes),
+             ('wordcounts', wordcountsql, 'wordcounts_0', dict(zip(wordcountcolumns, wordcountcolumntypes))),
+             ('works', workssql, 'works', workscolumntypes)]
+
+    allagree = True
+    for label, sql, table, typesbycolumn in loads:
+        declared = sqlcolumntypes(sql, table)
+        mismatches = 0
+        for column in typesbycolumn:
+            if column not in declared:
+                mismatches += 1
+                print('\t{l}: there is no column "{c}" in {t}'.format(l=label, c=column, t=table))
+            elif declared[column] != typesbycolumn[column]:
+                mismatches += 1
+                print('\t{l}: "{c}" is sent as "{s}" but {t} says "{d}"'.format(l=label, c=column, t=table,
+                                                                          s=typesbycolumn[column], d=declared[column]))
+
+        columns = list(typesbycolumn.keys())
+        columntypes = columntypesfor(columns, typesbycolumn)
+        rows = samplecopyrows(columntypes)
+
+        text = str()
+        stream = TextCopyStream(rows)
+        chunk = stream.read(7)
+        while chunk:
+            text += chunk
+            chunk = stream.read(7)
+
+        textfailures = 0
+        if text != str().join([textcopyrow(r) for r in rows]):
+            textfailures += 1
+            print('\t{l}: TextCopyStream does not hand over what textcopyrow() wrote'.format(l=label))
+        for row in rows:
+            # the server gets text back: the '7' only becomes 7 once it is in an integer column
+            expected = tuple(None if v is None else ('t' if v else 'f') if isinstance(v, bool) else str(v) for v in row)
+            try:
+                found = readtextcopyrow(textcopyrow(row))
+            except ValueError as problem:
+                found = problem
+            if found != expected:
+                textfailures += 1
+                if textfailures == 1:
+                    print('\t{l}: text COPY did not survive the round trip:'.format(l=label))
+                    print('\t\tsent: {e}\n\t\tgot: {f}'.format(e=expected, f=found))
+
+        binaryfailures = 0
+        stream = BinaryCopyStream(rows, columntypes)
+        data = bytes()
+        chunk = stream.read(7)
+        while chunk:
+            data += chunk
+            chunk = stream.read(7)
+        try:
+            found = readbinarycopy(data, columntypes)
+        except (ValueError, UnicodeDecodeError) as problem:
+            found = [problem]
+        expected = [tuple(None if v is None else str(v) if c == 't' else v for v, c in zip(r, columntypes)) for r in rows]
+        if found != expected:
+            binaryfailures += 1
+            print('\t{l}: binary COPY did not survive the round trip:'.format(l=label))
+            for e, f in zip(expected, found):
+                if e != f:
+                    print('\t\tsent: {e}\n\t\tgot: {f}'.format(e=e, f=f))
+                    break
+
+        if mismatches or textfailures or binaryfailures:
+            allagree = False
+        print('\t{l}: {c} columns; {m} type mismatches; {r} rows; {t} text failures; {b} binary failures'.format(
+            l=label, c=len(columns), m=mismatches, r=len(rows), t=textfailures, b=binaryfailures))
+
+    return allagree
@@ -9,29 +9,109 @@
 import re
 import configparser
 from collections import deque
+from copy import deepcopy
+from typing import Iterable, Iterator
+
 from builder.parsers.betacodeandunicodeinterconversion import cleanaccentsandvj, buildhipparchiatranstable
 from builder.parsers.regexsubstitutions import swapregexbrackets, makepunctuationsmall
-from builder.parsers.transliteration import transliteratecolums
+from builder.parsers.transliteration import transliterateline, transliteratethedeque
 
 config = configparser.ConfigParser()
 config.read('config.ini', encoding='utf8')
 
 
-def dbprepper(dbunreadyversion: list) -> deque:
+"""
+	dbprepper() used to make nine passes over an author: one per function below; now every line goes through all of
+	them at once and the patterns + config values they need are set up here, just once
+
+	passbypassdbprepper() is the old version: checkdbprepper() compares the two
+"""
+
+try:
+	transliterating = config['playground']['transliterate'] == 'y'
+except KeyError:
+	# your config file is old...
+	transliterating = False
+
+lunate = config['buildoptions']['lunate'] != 'n'
+
+# see cleanblanks()
+blankline = re.compile(r'<hmu_set_level_0_to_.*?\s/><br />\s$')
+
+# see dbpdeincrement()
+# setter = re.compile(r'<hmu_set_level_\d_to_[A-Za-z0-9]{1,}\s/>')
+# wont catch '<hmu_set_level_1_to_98* />'
+setter = re.compile(r'<hmu_set_level_\d_to_.*?\s/>')
+adder = re.compile(r'<hmu_increment_level_(\d)_by_1\s/>')
+blocker = re.compile(r'<hmu_cd_assert_(.*?)>')
+eob = re.compile(r'<hmu_end_of_cd_block_re-initialize_key_variables />')
+docu = re.compile(r'<hmu_assert_document_number_(.*?)>')
+# empty = r'(?<!*)\s{0,1}(?=!*)'
+levelmarkup = [setter, adder, blocker, eob, docu]
+
+# see dbstrippedliner()
+# be careful: the next will kill even editorial insertions 'do <ut> des': you have to be sure that no 'pure' angled brackets made it this far
+# ⟨abc⟩ should be all that you see
+nukemarkup = re.compile(r'<.*?>')
+combininglowerdot = u'\u0323'
+straydigits = r'\d'
+sigmas = re.compile(r'[σς]')
+# straypunct is a big deal: it defines what a clean line will look like and so what you can search for
+#   sadly can't nuke :punct: as a class because we need hyphens
+#   if you want to find »αʹ« you need ʹ
+#   if you want to find »͵α« you need ͵
+#   if you want to search for undocumented/idiosyncratic chars you need ◦⊚
+#   misc other things that one might want to exclude but are currently included: ☩ͻ
+#   the following are supposed to be killed off by bracketsimplifier(): ❨❩⟨⟩⟪⟫⦅⦆❴❵
+#   no longer relevant?: ⸨⸩｟｠《
+#	homeric editorial marks: ※⸖⟩—Ͽ
+straypunct = r'\<\>\{\}\[\]\(\)⟨⟩₍₎\'\.\?\!⌉⎜͙✳※¶§͜﹖→𐄂𝕔;:ˈ＇,‚‛‘’“”„·‧∣⸏※⸖⟩—ϿϾ'
+nukepunct = re.compile('['+combininglowerdot+straydigits+straypunct+']')
+multiplespaces = re.compile(r'\s{2,}')
+
+# remove things like '<speaker>Cr.</speaker>' from the search column
+# many 'ltcurlybracketsubstitutes' are interesting candidates for purging
+# you can get a '\s\s' problem with these erasures
+dbtagnuker = config['buildoptions']['unsearchable'].split(' ')
+dbtagnuker = [t for t in dbtagnuker if t]
+fingerprints = [re.compile(r'<{t}>.*?</{t}>\s*'.format(t=tag)) for tag in dbtagnuker]
+
+# see dbswapoutbadcharsfromcitations()
+brackets = re.compile(r'[\]\[\(\)\{\}]')
+punct = re.compile(r'[?*/!|=+%&:\']')
+
+# see dbfindannotations()
+annotationfinder = re.compile(r'<hmu(_|_metadata_)annotations value="(.*?)" />')
+
+# see hmutonbsp()
+bqs = re.compile(r'<hmu_blank_quarter_spaces quantity="(\d+)" />')
+
+# see noleadingortrailingwhitespace()
+edgewhitespace = re.compile(r'(^\s|\s$)')
+
+
+def dbprepper(dbunreadyversion: Iterable[list]) -> Iterator[list]:
 	"""
 	pull out markups, etc
+
+	a generator: nothing happens until insertworksintoauthortable() starts pulling lines into the COPY;
+	then each line makes a single trip through all of the steps
+
+	the only step that looks beyond the line in hand is dbfindhypens(): it needs the next line; so a line is held
+	back until its successor has been prepared
+
 	:param dbunreadyversion:
 	:return:
 	"""
-	
+
 	# findhyphens() vs addcdlabels()
-	
+
 	# '-█ⓕⓔ' lines are not read as ending with '-' by the time they get to findhyphens().
 	#
 	# it's an ugly issue
-	
+
 	# the following lines of isaeus refuse to match any conditional to test for a hypen you throw at them and so will not enter into the 'if...' clause; but if you cut and paste the text '-' == 'True'
-	
+
 	#   "ἔφη τήν τε ἡλικίαν ὑφορᾶϲθαι τὴν ἑαυτοῦ καὶ τὴν ἀπαι-"
 	#   █⑧⓪ E)/FH TH/N TE H(LIKI/AN U(FORA=SQAI TH\N E(AUTOU= KAI\ TH\N A)PAI-█ⓕⓔ
 	#   "Εἶτα αὐτὸϲ μὲν εἰ ἦν ἄπαιϲ, ἐποιήϲατ’ ἄν· τὸν δὲ Με-"
@@ -42,36 +122,96 @@ def dbprepper(dbunreadyversion: list) -> deque:
 	# ...
 	# yes
 	# >>>
-	
+
 	#  the fix is to remove the trailing space in regexsubs addcdlabels(). but then that kills your ability to get the last line of a work into the db
 	#   replace = '\n<hmu_end_of_cd_block_re-initialize_key_variables />' vs replace = '\n<hmu_end_of_cd_block_re-initialize_key_variables /> '
-	
-	# so the simple solution to a complex problem is to slap a single whitespace at the end of the file
-	dbunreadyversion[-1][2] = dbunreadyversion[-1][2] + ' '
-	
-	dbunreadyversion = cleanblanks(dbunreadyversion)
-	dbunreadyversion = dbpdeincrement(dbunreadyversion)
-	dbunreadyversion = dbstrippedliner(dbunreadyversion)
 
+	# so the simple solution to a complex problem is to slap a single whitespace at the end of the file: see flaglastline()
+
+	transtable = buildhipparchiatranstable()
+
+	# totallemmatization() hands the same citation tuple to every line until the citation changes
+	swappedcitations = dict()
+
+	previous = None
+	lastline = None
+
+	for line, islast in flaglastline(dbunreadyversion):
+		if islast:
+			line[2] = line[2] + ' '
+
+		if cleanblanks(line[2]):
+			continue
+
+		line[2] = dbpdeincrement(line[2])
+		if line[2] == '':
+			continue
+
+		line += dbstrippedliner(line[2], transtable)
+
+		if transliterating:
+			line = transliterateline(line)
+
+		# you will have problems browsing to 'Left/Right (1b:2)' if you don't do something here
+		citation = line[1]
+		try:
+			line[1] = swappedcitations[citation]
+		except KeyError:
+			swappedcitations[citation] = dbswapoutbadcharsfromcitations(citation)
+			line[1] = swappedcitations[citation]
+
+		# the last line is never anyone's 'previous': it goes out as it came in
+		lastline = line
+
+		if previous is None:
+			previous = line
+			continue
+
+		previous, line = dbfindhypens(previous, line, transtable)
+		yield finishline(previous)
+		previous = line
+
+	if lastline is not None and lastline[3] != '' and lastline[3] != ' ':
+		yield finishline(lastline)
+
+
+def flaglastline(dbunreadyversion: Iterable[list]) -> Iterator[tuple]:
+	"""
+	(line, False), (line, False), ..., (line, True)
+
+	:param dbunreadyversion:
+	:return:
+	"""
+
+	lines = iter(dbunreadyversion)
 	try:
-		if config['playground']['transliterate'] == 'y':
-			dbunreadyversion = transliteratecolums(dbunreadyversion)
-	except KeyError:
-		# your config file is old...
-		pass
-
-	# you will have problems browsing to 'Left/Right (1b:2)' if you don't do something here
-	dbunreadyversion = dbswapoutbadcharsfromcitations(dbunreadyversion)
-	dbunreadyversion = dbfindhypens(dbunreadyversion)
-	dbunreadyversion = dbfindannotations(dbunreadyversion)
-	dbunreadyversion = hmutonbsp(dbunreadyversion)
-	dbunreadyversion = noleadingortrailingwhitespace(dbunreadyversion)
-	dbreadyversion = dbunreadyversion
-	
-	return dbreadyversion
+		previous = next(lines)
+	except StopIteration:
+		return
+
+	for line in lines:
+		yield previous, False
+		previous = line
 
+	yield previous, True
 
-def cleanblanks(dbunreadyversion: list) -> list:
+
+def finishline(line: list) -> list:
+	"""
+	the steps that come after dbfindhypens()
+
+	:param line:
+	:return:
+	"""
+
+	line.append(dbfindannotations(line))
+	line[2] = hmutonbsp(line[2])
+	noleadingortrailingwhitespace(line)
+
+	return line
+
+
+def cleanblanks(markedup: str) -> bool:
 	"""
 	multiple sets and level shifts in rapid succession sometimes leaves blank lines that are 'numbered': zap them
 
@@ -83,278 +223,186 @@ def cleanblanks(dbunreadyversion: list) -> list:
 
 	aristophanes:
 
-		['6', [('0', '1099'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_increment_level_0_by_1 /><hmu_blank_quarter_spaces quantity="63" /> ἠρινά τε βοϲκόμεθα παρθένια '],
-		['6', [('0', '1100-1101'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_set_level_0_to_1100-1101 /><hmu_blank_quarter_spaces quantity="63" /> λευκότροφα μύρτα Χαρίτων τε κηπεύματα. '],
-		['6', [('0', '1100-1101'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_set_level_0_to_1100-1101 /><br /> '],
-		['6', [('0', '1102'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_set_level_0_to_1102 /><hmu_blank_quarter_spaces quantity="38" /> Τοῖϲ κριταῖϲ εἰπεῖν τι βουλόμεϲθα τῆϲ νίκηϲ πέρι, '],
-		['6', [('0', '1103'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_increment_level_0_by_1 /><hmu_blank_quarter_spaces quantity="38" /> ὅϲ’ ἀγάθ’, ἢν κρίνωϲιν ἡμᾶϲ, πᾶϲιν αὐτοῖϲ δώϲομεν, '],
+		['6', ('1099', '1', '1', '1', '1', '1'), '<hmu_increment_level_0_by_1 /><hmu_blank_quarter_spaces quantity="63" /> ἠρινά τε βοϲκόμεθα παρθένια '],
+		['6', ('1100-1101', '1', '1', '1', '1', '1'), '<hmu_set_level_0_to_1100-1101 /><hmu_blank_quarter_spaces quantity="63" /> λευκότροφα μύρτα Χαρίτων τε κηπεύματα. '],
+		['6', ('1100-1101', '1', '1', '1', '1', '1'), '<hmu_set_level_0_to_1100-1101 /><br /> '],
+		['6', ('1102', '1', '1', '1', '1', '1'), '<hmu_set_level_0_to_1102 /><hmu_blank_quarter_spaces quantity="38" /> Τοῖϲ κριταῖϲ εἰπεῖν τι βουλόμεϲθα τῆϲ νίκηϲ πέρι, '],
+		['6', ('1103', '1', '1', '1', '1', '1'), '<hmu_increment_level_0_by_1 /><hmu_blank_quarter_spaces quantity="38" /> ὅϲ’ ἀγάθ’, ἢν κρίνωϲιν ἡμᾶϲ, πᾶϲιν αὐτοῖϲ δώϲομεν, '],
 
 	aeschylus:
 
-		['1', [('0', '175e'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_increment_level_0_by_1 /><hmu_blank_quarter_spaces quantity="27" /> χαλεποῦ γὰρ ἐκ ']
-		['1', [('0', '175f'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_increment_level_0_by_1 /><hmu_blank_quarter_spaces quantity="43" /> πνεύματοϲ εἶϲι χειμών.⟩ ']
-		['1', [('0', '175f'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_set_level_0_to_175f /><br /> ']
-		['1', [('0', '176'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_set_level_0_to_176 /><hmu_blank_quarter_spaces quantity="4" /> <span class="speaker"><span class="smallerthannormal">ΔΑΝΑΟϹ</span></span> ']
+		['1', ('175e', '1', '1', '1', '1', '1'), '<hmu_increment_level_0_by_1 /><hmu_blank_quarter_spaces quantity="27" /> χαλεποῦ γὰρ ἐκ ']
+		['1', ('175f', '1', '1', '1', '1', '1'), '<hmu_increment_level_0_by_1 /><hmu_blank_quarter_spaces quantity="43" /> πνεύματοϲ εἶϲι χειμών.⟩ ']
+		['1', ('175f', '1', '1', '1', '1', '1'), '<hmu_set_level_0_to_175f /><br /> ']
+		['1', ('176', '1', '1', '1', '1', '1'), '<hmu_set_level_0_to_176 /><hmu_blank_quarter_spaces quantity="4" /> <span class="speaker"><span class="smallerthannormal">ΔΑΝΑΟϹ</span></span> ']
 
-	:param dbunreadyversion:
-	:return:
+	:param markedup:
+	:return: True if the line should be dropped
 	"""
 
-	workingcolumn = 2
-
-	blankline = re.compile(r'<hmu_set_level_0_to_.*?\s/><br />\s$')
-	dbreadyversion = [d for d in dbunreadyversion if not re.search(blankline, d[workingcolumn])]
-
-	return dbreadyversion
+	return blankline.search(markedup) is not None
 
 
-def dbpdeincrement(dbunreadyversion: list) -> deque:
+def dbpdeincrement(markedup: str) -> str:
 	"""
 	a formattind stripper:
-	
+
 	sample in:
-		['1', [('0', '4'), ('1', '3'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_increment_level_0_by_1 /><hmu_standalone_tabbedtext />ταύτηϲ γὰρ κεῖνοι δάμονέϲ εἰϲι μάχηϲ ']
-		
+		'<hmu_increment_level_0_by_1 /><hmu_standalone_tabbedtext />ταύτηϲ γὰρ κεῖνοι δάμονέϲ εἰϲι μάχηϲ '
+
 	sample out:
-		['1', [('0', '4'), ('1', '3'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_standalone_tabbedtext />ταύτηϲ γὰρ κεῖνοι δάμονέϲ εἰϲι μάχηϲ ']
-	
-	:param dbunreadyversion:
+		'<hmu_standalone_tabbedtext />ταύτηϲ γὰρ κεῖνοι δάμονέϲ εἰϲι μάχηϲ '
+
+	:param markedup:
 	:return:
 	"""
 
-	workingcolumn = 2
+	for expression in levelmarkup:
+		markedup = expression.sub('', markedup)
 
-	#setter = re.compile(r'<hmu_set_level_\d_to_[A-Za-z0-9]{1,}\s/>')
-	# wont catch '<hmu_set_level_1_to_98* />'
-	setter = re.compile(r'<hmu_set_level_\d_to_.*?\s/>')
-	adder = re.compile(r'<hmu_increment_level_(\d)_by_1\s/>')
-	blocker = re.compile(r'<hmu_cd_assert_(.*?)>')
-	eob = re.compile(r'<hmu_end_of_cd_block_re-initialize_key_variables />')
-	docu = re.compile(r'<hmu_assert_document_number_(.*?)>')
-	# empty = r'(?<!*)\s{0,1}(?=!*)'
-		
-	dbreadyversion = deque()
+	return markedup
 
-	for line in dbunreadyversion:
-		for expression in [setter, adder, blocker, eob, docu]:
-			line[workingcolumn] = re.sub(expression, '', line[workingcolumn])
-
-		if line[workingcolumn] != '':
-			dbreadyversion.append(line)
 
-	return dbreadyversion
-
-
-def dbstrippedliner(dbunreadyversion: deque) -> deque:
+def dbstrippedliner(markedup: str, transtable) -> list:
 	"""
-	generate the easy to search stripped column
-	
+	generate the easy to search stripped columns
+
 	sample in:
-		['1', [('0', '2'), ('1', '5'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_standalone_tabbedtext />ἔντοϲ ἀμώμητον, κάλλιπον οὐκ ἐθέλων· ']
-	
+		'<hmu_standalone_tabbedtext />ἔντοϲ ἀμώμητον, κάλλιπον οὐκ ἐθέλων· '
+
 	sample out:
-		['1', [('0', '2'), ('1', '5'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], '<hmu_standalone_tabbedtext />ἔντοϲ ἀμώμητον, κάλλιπον οὐκ ἐθέλων· ', 'ἔντοϲ ἀμώμητον κάλλιπον οὐκ ἐθέλων ', 'εντοϲ αμωμητον καλλιπον ουκ εθελων ']
+		['ἔντοϲ ἀμώμητον κάλλιπον οὐκ ἐθέλων ', 'εντοϲ αμωμητον καλλιπον ουκ εθελων ']
 
-	:param dbunreadyversion:
-	:return:
+	:param markedup:
+	:param transtable:
+	:return: [accented, stripped]
 	"""
 
 	# generate the easy-to-search column
 	# example:
-	# ['1', [('0', '5'), ('1', '1'), ('2', '4'), ('3', 'Milt'), ('4', '1')], 'hostem esse Atheniensibus, quod eorum auxilio Iones Sardis expugnas-']
-	# be careful: the next will kill even editorial insertions 'do <ut> des': you have to be sure that no 'pure' angled brackets made it this far
-	# ⟨abc⟩ should be all that you see
-	nukemarkup = re.compile(r'<.*?>')
-	combininglowerdot = u'\u0323'
-	straydigits = r'\d'
-	sigmas = re.compile(r'[σς]')
-	# straypunct is a big deal: it defines what a clean line will look like and so what you can search for
-	#   sadly can't nuke :punct: as a class because we need hyphens
-	#   if you want to find »αʹ« you need ʹ
-	#   if you want to find »͵α« you need ͵
-	#   if you want to search for undocumented/idiosyncratic chars you need ◦⊚
-	#   misc other things that one might want to exclude but are currently included: ☩ͻ
-	#   the following are supposed to be killed off by bracketsimplifier(): ❨❩⟨⟩⟪⟫⦅⦆❴❵
-	#   no longer relevant?: ⸨⸩｟｠《
-	#	homeric editorial marks: ※⸖⟩—Ͽ
-	straypunct = r'\<\>\{\}\[\]\(\)⟨⟩₍₎\'\.\?\!⌉⎜͙✳※¶§͜﹖→𐄂𝕔;:ˈ＇,‚‛‘’“”„·‧∣⸏※⸖⟩—ϿϾ'
-
-	nukepunct = re.compile('['+combininglowerdot+straydigits+straypunct+']')
-
-	dbreadyversion = deque()
-	workingcolumn = 2
-
-	# remove things like '<speaker>Cr.</speaker>' from the search column
-	# many 'ltcurlybracketsubstitutes' are interesting candidates for purging
-	# you can get a '\s\s' problem with these erasures
-	dbtagnuker = config['buildoptions']['unsearchable'].split(' ')
-	dbtagnuker = [t for t in dbtagnuker if t]
-	fingerprints = [re.compile(r'<{t}>.*?</{t}>\s*'.format(t=tag)) for tag in dbtagnuker]
-
-	for line in dbunreadyversion:
-		# must do this before running the markup cleaner
-		clean = line[workingcolumn]
-		for f in fingerprints:
-			clean = re.sub(f, '', clean)
-		clean = re.sub(nukemarkup, '', clean)
-		clean = re.sub(nukepunct, '', clean)
-		clean = clean.lower()
-		if config['buildoptions']['lunate'] == 'n':
-			clean = re.sub(sigmas, 'ϲ', clean)
-		clean = re.sub(r'\s{2,}', ' ', clean)
-		line.append(clean)
-		# this is the clean line with accents
-		dbreadyversion.append(line)
-
-	dbunreadyversion = dbreadyversion
-	dbreadyversion = deque()
-	workingcolumn = 3
+	# ['1', ('5', '1', '4', 'Milt', '1', '1'), 'hostem esse Atheniensibus, quod eorum auxilio Iones Sardis expugnas-']
+
+	clean = markedup
+	# must do this before running the markup cleaner
+	for f in fingerprints:
+		clean = f.sub('', clean)
+	clean = nukemarkup.sub('', clean)
+	clean = nukepunct.sub('', clean)
+	clean = clean.lower()
+	if not lunate:
+		clean = sigmas.sub('ϲ', clean)
+	clean = multiplespaces.sub(' ', clean)
 
 	# capitalization can be made to still matter; does that matter?
 	# you won't get the first word of the iliad right unless you search for capital Mu
 	# it seems like you will seldom wish you had caps and that remembering to handle them as a casual user is not so hot
+	unaccented = cleanaccentsandvj(clean, transtable)
 
-	transtable = buildhipparchiatranstable()
-
-	for line in dbunreadyversion:
-		unaccented = cleanaccentsandvj(line[workingcolumn], transtable)
-		line = line + [unaccented]
-		dbreadyversion.append(line)
-		
-	return dbreadyversion
+	return [clean, unaccented]
 
 
-def dbswapoutbadcharsfromcitations(dbunreadyversion: deque) -> deque:
+def dbswapoutbadcharsfromcitations(citation: tuple) -> tuple:
 	"""
 
 	sample in:
-		['2', [('0', '6'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], 'ἀγῶϲι πρόνοιαν· ὃϲ καὶ τότε περαιούμενοϲ ναυϲὶν ἐϲ Ἰτα-', 'ἀγῶϲι πρόνοιαν ὃϲ καὶ τότε περαιούμενοϲ ναυϲὶν ἐϲ ἰτα-', 'αγωϲι προνοιαν οϲ και τοτε περαιουμενοϲ ναυϲιν εϲ ιτα-']
+		('6', '1', '1', '1', '1', '1')
 
-	but not everybody looks like in column 1:
-		[('0', '6'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')]
-
-	instead of '1' at level01, some of these can have:
+	but not everybody looks like this: instead of '1' at level01, some of these can have:
 		'Right/Left F,11(1)'
 
 	HipparchiaServer *hates* that: the '/' will call a different URL; the '(' makes the regex engine sad; usw.
 
 	So we will swap out the relevant chars...
 
-	:param dbunreadyversion:
+	:param citation:
 	:return:
 	"""
 
-	dbreadyversion = deque()
-	workingcolumn = 1
-
-	brackets = re.compile(r'[\]\[\(\)\{\}]')
-	punct = re.compile(r'[?*/!|=+%&:\']')
+	newcitation = [brackets.sub(lambda x: swapregexbrackets(x.group(0)), c) for c in citation]
+	newcitation = [punct.sub(lambda x: makepunctuationsmall(x.group(0)), c) for c in newcitation]
 
-	while dbunreadyversion:
-		line = dbunreadyversion.popleft()
-		citation = line[workingcolumn]
-		newcitation = [(c[0], re.sub(brackets, lambda x: swapregexbrackets(x.group(0)), c[1])) for c in citation]
-		newcitation = [(c[0], re.sub(punct, lambda x: makepunctuationsmall(x.group(0)), c[1])) for c in newcitation]
-		newrow = line[0:workingcolumn] + [newcitation] + line[workingcolumn+1:]
-		dbreadyversion.append(newrow)
+	return tuple(newcitation)
 
-	return dbreadyversion
 
-
-def dbfindhypens(dbunreadyversion: deque) -> deque:
+def dbfindhypens(previous: list, line: list, transtable) -> tuple:
 	"""
 
 	sample in:
-		['2', [('0', '6'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], 'ἀγῶϲι πρόνοιαν· ὃϲ καὶ τότε περαιούμενοϲ ναυϲὶν ἐϲ Ἰτα-', 'ἀγῶϲι πρόνοιαν ὃϲ καὶ τότε περαιούμενοϲ ναυϲὶν ἐϲ ἰτα-', 'αγωϲι προνοιαν οϲ και τοτε περαιουμενοϲ ναυϲιν εϲ ιτα-']
+		['2', ('6', '1', '1', '1', '1', '1'), 'ἀγῶϲι πρόνοιαν· ὃϲ καὶ τότε περαιούμενοϲ ναυϲὶν ἐϲ Ἰτα-', 'ἀγῶϲι πρόνοιαν ὃϲ καὶ τότε περαιούμενοϲ ναυϲὶν ἐϲ ἰτα-', 'αγωϲι προνοιαν οϲ και τοτε περαιουμενοϲ ναυϲιν εϲ ιτα-']
 	sample out:
-		['2', [('0', '6'), ('1', '1'), ('2', '1'), ('3', '1'), ('4', '1'), ('5', '1')], 'ἀγῶϲι πρόνοιαν· ὃϲ καὶ τότε περαιούμενοϲ ναυϲὶν ἐϲ Ἰτα-', 'ἀγῶϲι πρόνοιαν ὃϲ καὶ τότε περαιούμενοϲ ναυϲὶν ἐϲ ἰταλίαν', 'αγωϲι προνοιαν οϲ και τοτε περαιουμενοϲ ναυϲιν εϲ ἰταλίαν']
-		
-	:param dbunreadyversion:
-	:return:
+		['2', ('6', '1', '1', '1', '1', '1'), 'ἀγῶϲι πρόνοιαν· ὃϲ καὶ τότε περαιούμενοϲ ναυϲὶν ἐϲ Ἰτα-', 'ἀγῶϲι πρόνοιαν ὃϲ καὶ τότε περαιούμενοϲ ναυϲὶν ἐϲ ἰταλίαν', 'αγωϲι προνοιαν οϲ και τοτε περαιουμενοϲ ναυϲιν εϲ ἰταλίαν']
+
+	the hyphenated word (or '') is appended to previous
+
+	:param previous:
+	:param line: the line after previous
+	:param transtable:
+	:return: (previous, line)
 	"""
 
-	dbreadyversion = deque()
 	workingcolumn = 3
-	# previous = dbunreadyversion[0]
-	previous = dbunreadyversion.popleft()
-	lastline = dbunreadyversion[-1]
 
-	transtable = buildhipparchiatranstable()
-
-	while dbunreadyversion:
-		line = dbunreadyversion.popleft()
-		try:
-			# a problem if the line is empty: nothing to split
-			# a good opportunity to skip adding a line to dbreadyversion
-			prevend = previous[workingcolumn].rsplit(None, 1)[1]
-			if prevend[-1] == '-':
-				thisstart = line[workingcolumn].split(None, 1)[0]
-				hyphenated = prevend[:-1] + thisstart
-				if len(hyphenated) > 0:
-					newlines = consolidatecontiguouslines(previous, line, hyphenated, transtable)
-					previous = newlines['p']
-					line = newlines['l']
-				previous.append(hyphenated)
-			else:
-				previous.append('')
-			dbreadyversion.append(previous)
-			previous = line
-		except:
+	try:
+		# a problem if the line is empty: nothing to split
+		# a good opportunity to skip adding a line to dbreadyversion
+		prevend = previous[workingcolumn].rsplit(None, 1)[1]
+		if prevend[-1] == '-':
+			thisstart = line[workingcolumn].split(None, 1)[0]
+			hyphenated = prevend[:-1] + thisstart
+			if len(hyphenated) > 0:
+				newlines = consolidatecontiguouslines(previous, line, hyphenated, transtable)
+				previous = newlines['p']
+				line = newlines['l']
+			previous.append(hyphenated)
+		else:
 			previous.append('')
-			dbreadyversion.append(previous)
-			previous = line
-	
-	if lastline[workingcolumn] != '' and lastline[workingcolumn] != ' ':
-		dbreadyversion.append(lastline)
-	
-	return dbreadyversion
+	except:
+		previous.append('')
+
+	return previous, line
+
+
+def dbfindannotations(line: list) -> str:
+	"""
+	pull the annotations out of the marked up column
 
+	:param line:
+	:return: the annotations
+	"""
 
-def dbfindannotations(dbunreadyversion):
 	workingcolumn = 2
-	dbreadyversion = deque()
-	search = re.compile(r'<hmu(_|_metadata_)annotations value="(.*?)" />')
-	for line in dbunreadyversion:
-		notes = re.findall(search, line[workingcolumn])
-		notes = [n[1] for n in notes]
-		notes = [n for n in notes if n]
-		notes = list(set(notes))
 
-		line[workingcolumn] = re.sub(search, '', line[workingcolumn])
-			
-		if len(notes) > 0:
-			notetext = ''
-			for n in notes:
-				notetext += n+'; '
-			notetext = notetext[:-2]
-			line.append(notetext)
-		else:
-			line.append('')
-		dbreadyversion.append(line)
+	notes = annotationfinder.findall(line[workingcolumn])
+	notes = [n[1] for n in notes]
+	notes = [n for n in notes if n]
+	notes = list(set(notes))
 
-	return dbreadyversion
+	line[workingcolumn] = annotationfinder.sub('', line[workingcolumn])
+
+	notetext = ''
+	if len(notes) > 0:
+		for n in notes:
+			notetext += n+'; '
+		notetext = notetext[:-2]
+
+	return notetext
 
 
-def hmutonbsp(dbunreadyversion: list) -> deque:
+def hmutonbsp(markedup: str) -> str:
 	"""
 	pseudo-markup into html
 	this is a place where some commitments that have been deferred will get made
 	obviously you could put all of this in earlier for the sake of efficiency,
 	but handling this here and now is convenient: one stop shopping w/out tripping up the parser earlier
-	:param dbunreadyversion:
+	:param markedup:
 	:return:
 	"""
-	workingcolumn = 2
-	dbreadyversion = deque()
-	bqs = re.compile(r'<hmu_blank_quarter_spaces quantity="(\d+)" />')
-	
-	for line in dbunreadyversion:
-		line[workingcolumn] = re.sub(bqs, quarterspacer, line[workingcolumn])
-		# used to do 4, but the indentations could pile up
-		line[workingcolumn] = re.sub(r'<hmu_standalone_tabbedtext />', r'&nbsp;&nbsp;&nbsp;', line[workingcolumn])
-		dbreadyversion.append(line)
-	
-	return dbreadyversion
+
+	markedup = bqs.sub(quarterspacer, markedup)
+	# used to do 4, but the indentations could pile up
+	markedup = markedup.replace('<hmu_standalone_tabbedtext />', '&nbsp;&nbsp;&nbsp;')
+
+	return markedup
 
 
 def quarterspacer(matchgroup):
@@ -373,21 +421,18 @@ def quarterspacer(matchgroup):
 	return substitution
 
 
-def noleadingortrailingwhitespace(dbunreadyversion: list) -> deque:
+def noleadingortrailingwhitespace(line: list):
 	"""
 	get rid of whitespace at ends of columns
 	otherwise HipparchiaServer is constantly doing this
-	:param dbunreadyversion:
+	:param line:
 	:return:
 	"""
-	dbreadyversion = deque()
-	
-	for line in dbunreadyversion:
-		for column in [2, 3, 4]:
-			line[column] = re.sub(r'(^\s|\s$)', '', line[column])
-		dbreadyversion.append(line)
-	
-	return dbreadyversion
+
+	for column in [2, 3, 4]:
+		line[column] = edgewhitespace.sub('', line[column])
+
+	return
 
 
 def consolidatecontiguouslines(previousline: list, thisline: list, hypenatedword: str, transtable):
@@ -440,3 +485,212 @@ def consolidatecontiguouslines(previousline: list, thisline: list, hypenatedword
 	newlines['l'] = tl
 
 	return newlines
+
+
+def passbypassdbprepper(dbunreadyversion: list) -> deque:
+	"""
+
+	what dbprepper() used to do: nine passes over the whole author; kept so that checkdbprepper() has something
+	to check against
+
+	the only changes: the citations are now tuples of values and not lists of (level, value) tuples; and
+	'lunate' + 'transliterate' are read from the module and not from the config file so that checkdbprepper() can
+	flip them
+
+	:param dbunreadyversion:
+	:return:
+	"""
+
+	# the final whitespace: see dbprepper()
+	dbunreadyversion[-1][2] = dbunreadyversion[-1][2] + ' '
+
+	# cleanblanks()
+	workingcolumn = 2
+	dbunreadyversion = [d for d in dbunreadyversion if not re.search(blankline, d[workingcolumn])]
+
+	# dbpdeincrement()
+	dbreadyversion = deque()
+	for line in dbunreadyversion:
+		for expression in [setter, adder, blocker, eob, docu]:
+			line[workingcolumn] = re.sub(expression, '', line[workingcolumn])
+		if line[workingcolumn] != '':
+			dbreadyversion.append(line)
+	dbunreadyversion = dbreadyversion
+
+	# dbstrippedliner()
+	dbreadyversion = deque()
+	for line in dbunreadyversion:
+		clean = line[workingcolumn]
+		for f in fingerprints:
+			clean = re.sub(f, '', clean)
+		clean = re.sub(nukemarkup, '', clean)
+		clean = re.sub(nukepunct, '', clean)
+		clean = clean.lower()
+		if not lunate:
+			clean = re.sub(sigmas, 'ϲ', clean)
+		clean = re.sub(r'\s{2,}', ' ', clean)
+		line.append(clean)
+		dbreadyversion.append(line)
+
+	transtable = buildhipparchiatranstable()
+	dbunreadyversion = dbreadyversion
+	dbreadyversion = deque()
+	for line in dbunreadyversion:
+		unaccented = cleanaccentsandvj(line[3], transtable)
+		line = line + [unaccented]
+		dbreadyversion.append(line)
+	dbunreadyversion = dbreadyversion
+
+	# transliteratecolums()
+	if transliterating:
+		for c in [2, 3, 4]:
+			dbunreadyversion = deque(transliteratethedeque(dbunreadyversion, c))
+
+	# dbswapoutbadcharsfromcitations()
+	dbreadyversion = deque()
+	workingcolumn = 1
+	while dbunreadyversion:
+		line = dbunreadyversion.popleft()
+		citation = line[workingcolumn]
+		newcitation = [re.sub(brackets, lambda x: swapregexbrackets(x.group(0)), c) for c in citation]
+		newcitation = [re.sub(punct, lambda x: makepunctuationsmall(x.group(0)), c) for c in newcitation]
+		newrow = line[0:workingcolumn] + [tuple(newcitation)] + line[workingcolumn+1:]
+		dbreadyversion.append(newrow)
+	dbunreadyversion = dbreadyversion
+
+	# dbfindhypens()
+	dbreadyversion = deque()
+	workingcolumn = 3
+	previous = dbunreadyversion.popleft()
+	lastline = dbunreadyversion[-1]
+	while dbunreadyversion:
+		line = dbunreadyversion.popleft()
+		try:
+			prevend = previous[workingcolumn].rsplit(None, 1)[1]
+			if prevend[-1] == '-':
+				thisstart = line[workingcolumn].split(None, 1)[0]
+				hyphenated = prevend[:-1] + thisstart
+				if len(hyphenated) > 0:
+					newlines = consolidatecontiguouslines(previous, line, hyphenated, transtable)
+					previous = newlines['p']
+					line = newlines['l']
+				previous.append(hyphenated)
+			else:
+				previous.append('')
+			dbreadyversion.append(previous)
+			previous = line
+		except:
+			previous.append('')
+			dbreadyversion.append(previous)
+			previous = line
+	if lastline[workingcolumn] != '' and lastline[workingcolumn] != ' ':
+		dbreadyversion.append(lastline)
+	dbunreadyversion = dbreadyversion
+
+	# dbfindannotations()
+	workingcolumn = 2
+	dbreadyversion = deque()
+	for line in dbunreadyversion:
+		notes = re.findall(annotationfinder, line[workingcolumn])
+		notes = [n[1] for n in notes]
+		notes = [n for n in notes if n]
+		notes = list(set(notes))
+		line[workingcolumn] = re.sub(annotationfinder, '', line[workingcolumn])
+		if len(notes) > 0:
+			notetext = ''
+			for n in notes:
+				notetext += n+'; '
+			notetext = notetext[:-2]
+			line.append(notetext)
+		else:
+			line.append('')
+		dbreadyversion.append(line)
+	dbunreadyversion = dbreadyversion
+
+	# hmutonbsp()
+	dbreadyversion = deque()
+	for line in dbunreadyversion:
+		line[workingcolumn] = re.sub(bqs, quarterspacer, line[workingcolumn])
+		line[workingcolumn] = re.sub(r'<hmu_standalone_tabbedtext />', r'&nbsp;&nbsp;&nbsp;', line[workingcolumn])
+		dbreadyversion.append(line)
+	dbunreadyversion = dbreadyversion
+
+	# noleadingortrailingwhitespace()
+	dbreadyversion = deque()
+	for line in dbunreadyversion:
+		for column in [2, 3, 4]:
+			line[column] = re.sub(r'(^\s|\s$)', '', line[column])
+		dbreadyversion.append(line)
+
+	return dbreadyversion
+
+
+# what totallemmatization() hands to dbprepper(): a few works that touch every branch of every step
+samplepreppedworks = [
+	[
+		['1', ('1', '1', '1', '1', '1', '1'), '<hmu_set_level_0_to_1 /><hmu_standalone_tabbedtext />ἄνδρα μοι ἔννεπε, μοῦϲα, πολύτροπον, ὃϲ μάλα πολλὰ '],
+		['1', ('2', '1', '1', '1', '1', '1'), '<hmu_increment_level_0_by_1 /><hmu_blank_quarter_spaces quantity="12" /> πλάγχθη, ἐπεὶ Τροίηϲ ἱερὸν πτολίεθρον ἔπερϲε· '],
+		['1', ('2', '1', '1', '1', '1', '1'), '<hmu_set_level_0_to_2 /><br /> '],
+		['1', ('3', '1', '1', '1', '1', '1'), '<hmu_increment_level_0_by_1 />πολλῶν δ’ ἀνθρώπων ἴδεν ἄϲτεα καὶ νόον ἔγ- '],
+		['1', ('4', '1', '1', '1', '1', '1'), '<hmu_increment_level_0_by_1 />νω, πολλὰ δ’ ὅ γ’ ἐν πόντῳ πάθεν ἄλγεα ὃν κατὰ θυμόν, '],
+		['1', ('5', '1', '1', '1', '1', '1'), '<hmu_increment_level_0_by_1 /><hmu_annotations value="cf. Il. 1.1" />ἀρνύμενοϲ ἥν τε ψυχὴν καὶ νόϲτον ἑταίρων. '],
+		['1', ('6', '1', '1', '1', '1', '1'), '<hmu_increment_level_0_by_1 /><hmu_annotations value="" /><hmu_metadata_annotations value="σς test" />ἀλλ’ οὐδ’ ὣϲ ἑτάρουϲ ἐρρύϲατο, ἱέμενόϲ περ· '],
+		['1', ('6', '1', '1', '1', '1', '1'), '<hmu_increment_level_0_by_1 />'],
+		['1', ('7', '1', '1', '1', '1', '1'), '<hmu_cd_assert_work_number betacodeval="001"/><speaker>Ὀδ.</speaker> αὐτῶν γὰρ ϲφετέρῃϲιν ἀταϲθαλίῃϲιν ὄλοντο, σοφός ς'],
+	],
+	[
+		['2', ('Right/Left F,11(1)', '3', '1', '1', '1', '1'), '<hmu_set_level_0_to_Right/Left F,11(1) />Gallia est omnis divisa in partes tres, quarum unam inco-'],
+		['2', ('Right/Left F,11(1)', '3', '1', '1', '1', '1'), 'lunt Belgae, aliam Aquitani, tertiam qui ipsorum lingua Celtae, nostra '],
+		['2', ('1b:2', '[3]', '1', '1', '1', '1'), '<hmu_increment_level_1_by_1 />Galli appellantur. Hi omnes lingua, institutis, legibus inter se dif- '],
+		['2', ('1b:2', '{3}', '1', '1', '1', '1'), '- ferunt. Gallos ab Aquitanis Garumna flumen, a Belgis Matrona et '],
+		['2', ('98*', '?', '1', '1', '1', '1'), '<hmu_set_level_1_to_98* /><hmu_assert_document_number_12>Sequana dividit. 123 ⟨vel⟩ [sic] (sic) {sic} ·§¶ '],
+		['2', ('99', '1', '1', '1', '1', '1'), '<hmu_end_of_cd_block_re-initialize_key_variables />  Horum omnium fortissimi sunt Belgae   '],
+	],
+	[
+		['3', ('1', '1', '1', '1', '1', '1'), '<hmu_standalone_tabbedtext />καὶ τὸ τέλοϲ -'],
+		['3', ('1', '1', '1', '1', '1', '1'), '<hmu_set_level_0_to_1 /><br /> '],
+	],
+]
+
+
+def checkdbprepper(samplelines=None) -> bool:
+	"""
+
+	do dbprepper() and passbypassdbprepper() agree?
+
+	every sample work is prepared both ways with 'lunate' on, with it off, and with 'transliterate' on
+
+	'makecorpora.py --checkdbprepper' runs this
+
+	:param samplelines: more works to try: lists of what totallemmatization() yields
+	:return:
+	"""
+
+	global lunate, transliterating
+
+	works = samplepreppedworks + list(samplelines or list())
+	settings = [('lunate on', True, False), ('lunate off', False, False), ('transliteration on', lunate, True)]
+
+	configured = (lunate, transliterating)
+	allagree = True
+	try:
+		for label, lunate, transliterating in settings:
+			differences = 0
+			for work in works:
+				expected = list(passbypassdbprepper(deepcopy(work)))
+				found = list(dbprepper(deepcopy(work)))
+				if found != expected:
+					allagree = False
+					differences += 1
+					print('\t{l}: dbprepper() disagrees about work {w}:'.format(l=label, w=work[0][0]))
+					for e, f in zip(expected, found):
+						if e != f:
+							print('\t\tpass by pass: {e}\n\t\tfused: {f}'.format(e=e, f=f))
+							break
+					if len(expected) != len(found):
+						print('\t\t{e} vs {f} lines'.format(e=len(expected), f=len(found)))
+			print('\t{l}: {n} works; {d} disagreements'.format(l=label, n=len(works), d=differences))
+	finally:
+		lunate, transliterating = configured
+
+	return allagree
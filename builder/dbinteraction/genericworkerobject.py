@@ -15,8 +15,11 @@ from builder.workers import setworkercount
 
 class GenericInserterObject(object):
 
-	def __init__(self, targetfunction, argumentlist=None):
-		self.workercount = setworkercount()
+	def __init__(self, targetfunction, argumentlist=None, workercount=None):
+		if workercount:
+			self.workercount = workercount
+		else:
+			self.workercount = setworkercount()
 		self.targetfunction = targetfunction
 		self.argumentlist = argumentlist
 		assert self.argumentlist is not None, "Failed to pass an argumentlist to GenericInserterObject()"
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+	HipparchiaBuilder: compile a database of Greek and Latin texts
+	Copyright: E Gunderson 2016-23
+	License: GNU GENERAL PUBLIC LICENSE 3
+		(see LICENSE in the top level directory of the distribution)
+"""
+
+import configparser
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Generator, Iterable
+
+from builder.builderclasses import dbWorkLine
+from builder.dbinteraction.connection import setconnection
+from builder.dbinteraction.dbhelperfunctions import resultiterator
+
+config = configparser.ConfigParser()
+config.read('config.ini', encoding='utf8')
+
+try:
+	linestorefile = config['io']['linestorefile']
+except KeyError:
+	linestorefile = config['io']['outputdir'] + 'linestore.bin'
+
+"""
+	the wordcounts need the accented_line of every line of every table: 11.9M of them
+
+	a dict of 11.9M dbWorkLine objects keyed to 'gr3018_LN_4773' costs c. 12G; the same information as columns costs
+	a fraction of that:
+
+		tableids    int32       which table: an index into the 'tables' of the header
+		indexes     int32       the 'index' of the line in that table
+		workids     int32       an index into the 'works' of the header
+		offsets     int64       accented_line n is text[offsets[n]:offsets[n+1]]
+		text        bytes       every accented_line as UTF-8, one after another
+
+	the rows are sorted by table and then by index; the header says where each table starts
+
+	the whole thing is one file that gets mmap()ed: the pages are read only when they are needed, and forked workers
+	share them instead of each getting a copy
+
+	file layout: magic, header length, header (json), then the columns; every column starts on an 8 byte boundary
+"""
+
+linestoremagic = b'HIPLINES'
+linestoreprefix = struct.Struct('<8sQ')
+
+# the store that this run already built: see openlinestore()
+currentlinestore = None
+
+
+class LineStore(object):
+	"""
+
+	read-only access to a file written by buildlinestore()
+
+	"""
+
+	def __init__(self, filename: str):
+		self.filename = filename
+		with open(filename, 'rb') as f:
+			self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+		magic, headerlength = linestoreprefix.unpack_from(self.mm, 0)
+		assert magic == linestoremagic, '{f} is not a line store'.format(f=filename)
+
+		start = linestoreprefix.size
+		header = json.loads(self.mm[start:start + headerlength].decode('utf-8'))
+		assert header['byteorder'] == sys.byteorder, '{f} was built on a machine with a different byte order'.format(f=filename)
+
+		self.tables = header['tables']
+		self.tablestarts = header['tablestarts']
+		self.works = header['works']
+		self.linecount = header['lines']
+		self.tablenumbers = {t: n for n, t in enumerate(self.tables)}
+
+		view = memoryview(self.mm)
+		columns = dict()
+		for name, typecode, position, length in header['columns']:
+			columns[name] = view[position:position + length]
+			if typecode:
+				columns[name] = columns[name].cast(typecode)
+
+		self.tableids = columns['tableids']
+		self.indexes = columns['indexes']
+		self.workids = columns['workids']
+		self.offsets = columns['offsets']
+		self.text = columns['text']
+
+	def __len__(self):
+		return self.linecount
+
+	def accentedline(self, row: int) -> str:
+		return bytes(self.text[self.offsets[row]:self.offsets[row + 1]]).decode('utf-8')
+
+	def tablerows(self, table: str) -> range:
+		try:
+			n = self.tablenumbers[table]
+		except KeyError:
+			return range(0)
+		return range(self.tablestarts[n], self.tablestarts[n + 1])
+
+	def findrow(self, table: str, index: int) -> int:
+		"""
+
+		the row that holds line 'index' of 'table'; -1 if there is no such line
+
+		:param table:
+		:param index:
+		:return:
+		"""
+
+		rows = self.tablerows(table)
+		if not rows:
+			return -1
+
+		row = bisect_left(self.indexes, index, rows.start, rows.stop)
+		if row < rows.stop and self.indexes[row] == index:
+			return row
+
+		return -1
+
+	def line(self, table: str, index: int) -> str:
+		"""
+
+		the accented_line of line 'index' of 'table'; None if there is no such line
+
+		:param table:
+		:param index:
+		:return:
+		"""
+
+		row = self.findrow(table, index)
+		if row < 0:
+			return None
+
+		return self.accentedline(row)
+
+	def lineobject(self, row: int) -> dbWorkLine:
+		# the same hollow line that makeminimallineobject() builds
+		return dbWorkLine(self.works[self.workids[row]], self.indexes[row], None, None, None, None, None, None, None,
+		                  self.accentedline(row), None, str(), None)
+
+	def iteraterows(self, rows: Iterable[int]) -> Generator[tuple, None, None]:
+		"""
+
+		(table, index, wkuniversalid, accented_line) for each row
+
+		:param rows:
+		:return:
+		"""
+
+		for r in rows:
+			yield self.tables[self.tableids[r]], self.indexes[r], self.works[self.workids[r]], self.accentedline(r)
+
+	def rowsinranges(self, dbswithranges: dict) -> Generator[int, None, None]:
+		"""
+
+		{tableid1: [range1.1, range1.2], tableid2: [range2.1, range2.2], ...} ==> the rows that hold those lines
+
+		see generatedbdictwithranges()
+
+		every row is yielded only once even if the ranges overlap (an author and one of its works, e.g.)
+
+		:param dbswithranges:
+		:return:
+		"""
+
+		for table in sorted(dbswithranges):
+			rows = self.tablerows(table)
+			if not rows:
+				continue
+			done = rows.start
+			for r in sorted(dbswithranges[table], key=lambda r: r.start):
+				if not r:
+					continue
+				first = max(bisect_left(self.indexes, r.start, rows.start, rows.stop), done)
+				last = bisect_left(self.indexes, r.stop, first, rows.stop)
+				yield from range(first, last)
+				done = max(last, done)
+
+	def close(self):
+		for column in [self.tableids, self.indexes, self.workids, self.offsets, self.text]:
+			column.release()
+		self.mm.close()
+
+
+def buildlinestore(filename: str, tables=None) -> LineStore:
+	"""
+
+	grab every line from every table (or just from the tables on the list) and write the line store
+
+	only the columns are kept in memory: the text goes straight to a scratch file and is then appended to the store
+
+	:param filename:
+	:param tables:
+	:return:
+	"""
+
+	print('grabbing every line from every table...')
+
+	dbconnection = setconnection()
+	dbcursor = dbconnection.cursor()
+
+	if tables:
+		authors = sorted(tables)
+	else:
+		q = 'SELECT universalid FROM authors ORDER BY universalid'
+		dbcursor.execute(q)
+		authors = [a[0] for a in resultiterator(dbcursor)]
+
+	qtemplate = 'SELECT index, wkuniversalid, accented_line FROM {t} ORDER BY index'
+
+	tableids = array('i')
+	indexes = array('i')
+	workids = array('i')
+	offsets = array('q', [0])
+	tablestarts = list()
+	works = list()
+	worknumbers = dict()
+
+	Path(filename).parent.mkdir(parents=True, exist_ok=True)
+	scratchfile = filename + '.text'
+
+	total = len(authors)
+	steps = max(int(total / 10), 1)
+	position = 0
+	with open(scratchfile, 'wb') as text:
+		for tableid, a in enumerate(authors):
+			tablestarts.append(len(indexes))
+			dbcursor.execute(qtemplate.format(t=a))
+			for index, wkuniversalid, accentedline in resultiterator(dbcursor):
+				try:
+					w = worknumbers[wkuniversalid]
+				except KeyError:
+					w = len(works)
+					worknumbers[wkuniversalid] = w
+					works.append(wkuniversalid)
+				encoded = (accentedline or str()).encode('utf-8')
+				text.write(encoded)
+				position += len(encoded)
+				tableids.append(tableid)
+				indexes.append(index)
+				workids.append(w)
+				offsets.append(position)
+			if (tableid + 1) % steps == 0:
+				print('\t{n}% of authors loaded'.format(n=int(((tableid + 1) / total) * 100)))
+
+	tablestarts.append(len(indexes))
+	dbconnection.connectioncleanup()
+
+	header = {'byteorder': sys.byteorder,
+	          'lines': len(indexes),
+	          'tables': authors,
+	          'tablestarts': tablestarts,
+	          'works': works,
+	          'columns': list()}
+
+	columns = [('tableids', 'i', tableids.tobytes()),
+	           ('indexes', 'i', indexes.tobytes()),
+	           ('workids', 'i', workids.tobytes()),
+	           ('offsets', 'q', offsets.tobytes())]
+
+	# the header has to know where the columns are; and where the columns are depends on the length of the header
+	headerlength = 0
+	while True:
+		position = aligned(linestoreprefix.size + headerlength)
+		header['columns'] = list()
+		for name, typecode, data in columns:
+			header['columns'].append((name, typecode, position, len(data)))
+			position = aligned(position + len(data))
+		header['columns'].append(('text', None, position, os.path.getsize(scratchfile)))
+		encodedheader = json.dumps(header).encode('utf-8')
+		if len(encodedheader) <= headerlength:
+			break
+		headerlength = len(encodedheader) + 64
+
+	with open(filename, 'wb') as f:
+		f.write(linestoreprefix.pack(linestoremagic, headerlength))
+		f.write(encodedheader.ljust(headerlength))
+		for (name, typecode, data), (_, _, position, _) in zip(columns, header['columns']):
+			f.write(bytes(position - f.tell()))
+			f.write(data)
+		f.write(bytes(header['columns'][-1][2] - f.tell()))
+		with open(scratchfile, 'rb') as text:
+			shutil.copyfileobj(text, f)
+
+	os.remove(scratchfile)
+
+	print('\t{n} lines stored in {f}'.format(n=len(indexes), f=filename))
+
+	return LineStore(filename)
+
+
+def aligned(position: int) -> int:
+	return (position + 7) // 8 * 8
+
+
+def openlinestore() -> LineStore:
+	"""
+
+	the line store for this run: built the first time it is asked for
+
+	a store left over from an earlier run is not reused: the tables might have changed since then
+
+	:return:
+	"""
+
+	global currentlinestore
+
+	if currentlinestore is None:
+		currentlinestore = buildlinestore(linestorefile)
+
+	return currentlinestore
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+	HipparchiaBuilder: compile a database of Greek and Latin texts
+	Copyright: E Gunderson 2016-23
+	License: GNU GENERAL PUBLIC LICENSE 3
+		(see LICENSE in the top level directory of the distribution)
+"""
+
+import time
+from multiprocessing import Queue
+
+
+class LoadQueue(object):
+	"""
+
+	the bounded queue between the parsers and the loaders: see corpusbuilder.pipelinedload()
+
+	every process keeps its own tally of how long it sat waiting on the queue and how deep the queue was whenever it
+	touched it; finish() hands that tally back to the parent so that report() can say which side is the bottleneck:
+
+		parsers waiting for room in the queue       the loaders (i.e., the database) cannot keep up
+		loaders waiting for something to load       the parsers cannot keep up
+
+	"""
+
+	def __init__(self, depth: int, manager):
+		self.depth = depth
+		self.queue = Queue(maxsize=depth)
+		self.tallies = manager.list()
+		self.waited = 0.0
+		self.handled = 0
+		self.depthsum = 0
+		self.deepest = 0
+
+	def put(self, item):
+		start = time.time()
+		self.queue.put(item)
+		self.waited += time.time() - start
+		self.tally()
+
+	def get(self):
+		start = time.time()
+		item = self.queue.get()
+		self.waited += time.time() - start
+		if item is not None:
+			self.tally()
+		return item
+
+	def tally(self):
+		self.handled += 1
+		try:
+			depth = self.queue.qsize()
+		except NotImplementedError:
+			# macOS
+			return
+		self.depthsum += depth
+		self.deepest = max(depth, self.deepest)
+
+	def finish(self, role: str):
+		self.tallies.append((role, self.waited, self.handled, self.depthsum, self.deepest))
+
+	def close(self, loadercount: int):
+		# one 'stop' for every loader
+		for _ in range(loadercount):
+			self.queue.put(None)
+
+	def report(self):
+		tallies = list(self.tallies)
+
+		for role, waitingfor in [('parser', 'room in the queue'), ('loader', 'something to load')]:
+			mine = [t for t in tallies if t[0] == role]
+			if not mine:
+				continue
+			waited = sum(t[1] for t in mine)
+			handled = sum(t[2] for t in mine)
+			depthsum = sum(t[3] for t in mine)
+			deepest = max(t[4] for t in mine)
+			print('\t{n} {r}s handled {h} items and waited {w}s for {x}'.format(n=len(mine), r=role, h=handled, w=round(waited, 2), x=waitingfor))
+			if handled:
+				print('\t\tqueue depth as the {r}s saw it: mean {m}; max {d} of {q}'.format(r=role, m=round(depthsum / handled, 2), d=deepest, q=self.depth))
+
+		return
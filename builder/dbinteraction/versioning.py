@@ -160,3 +160,105 @@ def readgitdata() -> str:
 	commit = gitdata[1]
 
 	return commit
+
+
+def authorrecordtablemaker(dbconnection):
+	"""
+
+	SQL prep only
+
+	builderauthorrecords remembers what went into the build of each author so that an incremental build can
+	tell which authors need to be built again
+
+	:param dbconnection:
+	:return:
+	"""
+
+	dbcursor = dbconnection.cursor()
+
+	query = """
+		CREATE TABLE IF NOT EXISTS public.builderauthorrecords
+			( universalid character varying(10) PRIMARY KEY,
+			sourcechecksum character varying(64),
+			authorbuilddate character varying(64) )
+			WITH ( OIDS=FALSE );
+		"""
+
+	dbcursor.execute(query)
+
+	query = 'GRANT SELECT ON TABLE public.builderauthorrecords TO hippa_rd;'
+	dbcursor.execute(query)
+
+	dbconnection.commit()
+
+	return
+
+
+def recordauthorbuild(universalid: str, checksum: str, dbconnection):
+	"""
+
+	store the sourcechecksum() of an author that was just loaded
+
+	:param universalid:
+	:param checksum:
+	:param dbconnection:
+	:return:
+	"""
+
+	dbcursor = dbconnection.cursor()
+
+	q = """
+		INSERT INTO builderauthorrecords ( universalid, sourcechecksum, authorbuilddate ) VALUES (%s, %s, %s)
+			ON CONFLICT (universalid) DO UPDATE SET sourcechecksum = EXCLUDED.sourcechecksum, authorbuilddate = EXCLUDED.authorbuilddate
+		"""
+	d = (universalid, checksum, datetime.now().strftime("%Y-%m-%d %H:%M"))
+	dbcursor.execute(q, d)
+
+	dbconnection.commit()
+
+	return
+
+
+def fetchauthorbuildrecords(prefix: str) -> dict:
+	"""
+
+	{universalid: sourcechecksum, ...} for every recorded author whose universalid starts with the prefix
+
+	:param prefix:
+	:return:
+	"""
+
+	dbconnection = setconnection()
+	authorrecordtablemaker(dbconnection)
+	dbcursor = dbconnection.cursor()
+
+	q = 'SELECT universalid, sourcechecksum FROM builderauthorrecords WHERE universalid LIKE %s'
+	d = (prefix + '%',)
+	dbcursor.execute(q, d)
+	records = {r[0]: r[1] for r in dbcursor.fetchall()}
+
+	dbconnection.connectioncleanup()
+
+	return records
+
+
+def forgetauthorbuildrecords(prefix: str, dbconnection):
+	"""
+
+	a full rebuild of a corpus makes the old records meaningless
+
+	:param prefix:
+	:param dbconnection:
+	:return:
+	"""
+
+	authorrecordtablemaker(dbconnection)
+	dbcursor = dbconnection.cursor()
+
+	q = 'DELETE FROM builderauthorrecords WHERE universalid LIKE %s'
+	d = (prefix + '%',)
+	dbcursor.execute(q, d)
+
+	dbconnection.commit()
+
+	return
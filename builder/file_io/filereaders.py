@@ -7,6 +7,8 @@
 """
 
 import re
+import time
+from pathlib import Path
 
 from builder.parsers.swappers import hextohighunicode
 
@@ -33,9 +35,62 @@ def findauthors(pathtoauthtab):
 	return availableauthors
 
 
+def buildhighunicodetable() -> list:
+	"""
+	precompute the substitute for every possible byte value
+
+	ascii stays ascii; the high values and the control values turn into their hex representations:
+		0xef --> '█ⓔⓕ '
+		0x0 --> '█⓪ '
+
+	:return: a list of 256 strings indexed by byte value
+	"""
+
+	table = list()
+	for b in range(256):
+		if (b >= 128) or (b <= 31):
+			x = hex(b)
+			# cumbersome and painful, but it prevents any possibility of confusing the ascii and the control sequences
+			table.append('█' + hextohighunicode(x[2:4]) + ' ')  # FULL BLOCK Unicode: U+2588
+		else:
+			table.append(chr(b))
+
+	return table
+
+
+highunicodetable = buildhighunicodetable()
+
+
 def highunicodefileload(filepath):
 	"""
 	open a CD file and get it ready for parsing
+
+	the lookup table means that we no longer walk the file one byte at a time calling hex() on everything
+	that is not ascii: see bytewisehighunicodefileload() and checkhighunicodefileload()
+
+	note that the final byte of the file is (and always has been) dropped
+
+	:return: a collection of characters with the unprintable chars swapped out for their hex representation
+	"""
+
+	f = open(filepath, 'rb')
+	o = f.read()
+	f.close()
+
+	# swap out the high values for hex representations of those values:
+	#   █ⓔⓕ █⑧⓪ █ⓑ⓪ █ⓑ⓪ █ⓑ① █ⓑ⓪ █ⓕⓕ
+
+	txt = ''.join(map(highunicodetable.__getitem__, o[:-1]))
+
+	return txt
+
+
+def bytewisehighunicodefileload(filepath):
+	"""
+	the old version of highunicodefileload(): one byte at a time
+
+	kept so that checkhighunicodefileload() has something to compare highunicodefileload() with
+
 	:return: a collection of characters with the unprintable chars swapped out for their hex representation
 	"""
 
@@ -63,6 +118,111 @@ def highunicodefileload(filepath):
 	return txt
 
 
+def checkhighunicodefileload(datapaths: list) -> bool:
+	"""
+
+	do highunicodefileload() and bytewisehighunicodefileload() agree? and how much faster is the first one?
+
+	every .TXT file in the datapaths gets loaded both ways
+
+	'makecorpora.py --checkfileload' runs this
+
+	:param datapaths:
+	:return:
+	"""
+
+	timings = {highunicodefileload.__name__: 0.0, bytewisehighunicodefileload.__name__: 0.0}
+
+	allagree = True
+	filecount = 0
+	bytecount = 0
+	for d in datapaths:
+		if not Path(d).is_dir():
+			continue
+		for filepath in sorted(Path(d).glob('*.TXT')):
+			loaded = list()
+			for loader in [bytewisehighunicodefileload, highunicodefileload]:
+				start = time.perf_counter()
+				loaded.append(loader(str(filepath)))
+				timings[loader.__name__] += time.perf_counter() - start
+			if loaded[0] != loaded[1]:
+				allagree = False
+				print('	the loaders disagree about {f}'.format(f=filepath))
+			filecount += 1
+			bytecount += filepath.stat().st_size
+
+	print('	{n} files; {mb}MB'.format(n=filecount, mb=round(bytecount / (1024 * 1024), 1)))
+	for t in timings:
+		print('	{t}: {s}s'.format(t=t, s=round(timings[t], 2)))
+
+	if filecount:
+		print('	speedup: {x}x'.format(x=round(timings['bytewisehighunicodefileload'] / max(timings['highunicodefileload'], 1e-9), 1)))
+
+	return allagree
+
+
+def buildcompacttable() -> list:
+	"""
+	the compact version of buildhighunicodetable()
+
+	each control byte becomes a single private use character: 0xef --> '\ue0ef'
+
+	:return: a list of 256 strings indexed by byte value
+	"""
+
+	table = list()
+	for b in range(256):
+		if (b >= 128) or (b <= 31):
+			table.append(chr(0xe000 + b))
+		else:
+			table.append(chr(b))
+
+	return table
+
+
+compacttable = buildcompacttable()
+compactrun = re.compile('([\ue000-\ue0ff]+)')
+
+
+def compacthighunicodefileload(filepath):
+	"""
+	open a CD file and get it ready for parsing without spelling out every control byte
+
+	highunicodefileload() turns '0xef 0x81 0xb0 0xb0 0xb1 0xff' into:
+		█ⓔⓕ █⑧① █ⓑ⓪ █ⓑ⓪ █ⓑ① █ⓕⓕ
+
+	here the same run becomes one marker of 8 characters:
+		█ + [one private use character per byte] + ' '
+
+	the '█' and the trailing space mean that the line probers, etc. see the same boundaries as before;
+	decodecontrolruns() will read the bytes back out of the private use characters
+
+	:return: a collection of characters with the control runs compacted
+	"""
+
+	f = open(filepath, 'rb')
+	o = f.read()
+	f.close()
+
+	txt = compacthighunicode(o[:-1])
+
+	return txt
+
+
+def compacthighunicode(rawbytes: bytes) -> str:
+	"""
+	the guts of compacthighunicodefileload(); also used on pieces of a file by chunkparser()
+
+	:param rawbytes:
+	:return:
+	"""
+
+	txt = ''.join(map(compacttable.__getitem__, rawbytes))
+	txt = re.sub(compactrun, r'█\1 ', txt)
+
+	return txt
+
+
 def streamout(txt, outfile):
 	f = open(outfile, 'w')
 	f.write(txt)
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+	HipparchiaBuilder: compile a database of Greek and Latin texts
+	Copyright: E Gunderson 2016-23
+	License: GNU GENERAL PUBLIC LICENSE 3
+		(see LICENSE in the top level directory of the distribution)
+"""
+
+import configparser
+import gzip
+import hashlib
+import os
+import pickle
+import time
+from pathlib import Path
+
+config = configparser.ConfigParser()
+config.read('config.ini', encoding='utf8')
+
+try:
+	pc = config['buildoptions']['parsecache']
+except KeyError:
+	pc = 'n'
+
+if pc == 'y':
+	parsecacheactive = True
+else:
+	parsecacheactive = False
+
+try:
+	cachedir = config['io']['parsecachedir']
+except KeyError:
+	cachedir = config['io']['outputdir'] + 'parsecache/'
+
+try:
+	cachemaxmb = float(config['buildoptions']['parsecachemaxmb'])
+except (KeyError, ValueError):
+	cachemaxmb = 2048
+
+try:
+	cachemaxdays = float(config['buildoptions']['parsecachemaxdays'])
+except (KeyError, ValueError):
+	cachemaxdays = 90
+
+# these decide how and when things get built, but not what the build looks like
+irrelevantoptions = {'buildlongestfirst', 'splitauthorsabove', 'parsecache', 'parsecachemaxmb', 'parsecachemaxdays', 'warnings', 'timestamp', 'binarycopy', 'bulkload', 'backgroundindexing', 'indexmemory', 'wordindex', 'storewordlists'}
+
+# every file that can change what dbprepper() hands to insertworksintoauthortable()
+parsersourcefiles = ['builder/corpusbuilder.py',
+                     'builder/file_io/filereaders.py',
+                     'builder/dbinteraction/dbprepsubstitutions.py']
+parsersourcedirectories = ['builder/parsers/']
+
+sourcehash = str()
+
+
+def hashparsersource() -> str:
+	"""
+
+	hash the code that does the parsing: a parser fix has to invalidate everything in the cache
+
+	the result is remembered since the source will not change in the middle of a build
+
+	:return:
+	"""
+
+	global sourcehash
+
+	if sourcehash:
+		return sourcehash
+
+	here = Path(__file__).resolve().parent.parent.parent
+	sources = [here / f for f in parsersourcefiles]
+	for d in parsersourcedirectories:
+		sources += sorted((here / d).glob('*.py'))
+
+	h = hashlib.sha256()
+	for s in sources:
+		h.update(s.name.encode('utf-8'))
+		h.update(s.read_bytes())
+
+	sourcehash = h.hexdigest()
+
+	return sourcehash
+
+
+def hashbuildoptions() -> str:
+	"""
+
+	the [buildoptions] and [misc] values that can alter the parsed text
+
+	:return:
+	"""
+
+	options = list()
+	for section in ['buildoptions', 'misc']:
+		try:
+			options += ['{s}.{k}={v}'.format(s=section, k=k, v=v) for k, v in config[section].items() if k not in irrelevantoptions]
+		except KeyError:
+			pass
+
+	return hashlib.sha256('\n'.join(sorted(options)).encode('utf-8')).hexdigest()
+
+
+def parsecachekey(authorobject, language: str, datapath: str) -> str:
+	"""
+
+	the key is the hash of everything that goes into the parse: see sourcechecksum()
+
+	:param authorobject:
+	:param language:
+	:param datapath:
+	:return:
+	"""
+
+	return sourcechecksum(authorobject.dataprefix + authorobject.number, language, datapath)
+
+
+def sourcechecksum(authorid: str, language: str, datapath: str) -> str:
+	"""
+
+	hash everything that goes into the parse of an author:
+		the .TXT and .IDT bytes
+		the language we are parsing as
+		the relevant config values
+		the parser source
+
+	:param authorid: 'TLG0006', etc.
+	:param language:
+	:param datapath:
+	:return:
+	"""
+
+	h = hashlib.sha256()
+	for suffix in ['.TXT', '.IDT']:
+		try:
+			with open(datapath + authorid + suffix, 'rb') as f:
+				h.update(f.read())
+		except FileNotFoundError:
+			h.update(suffix.encode('utf-8'))
+
+	h.update('{a}/{l}'.format(a=authorid, l=language).encode('utf-8'))
+	h.update(hashbuildoptions().encode('utf-8'))
+	h.update(hashparsersource().encode('utf-8'))
+
+	return h.hexdigest()
+
+
+def cachefilename(key: str) -> str:
+	return '{d}{k}.pickle.gz'.format(d=cachedir, k=key)
+
+
+def loadfromparsecache(key: str):
+	"""
+
+	the dbreadyversion that was stored under this key; or None
+
+	:param key:
+	:return:
+	"""
+
+	filename = cachefilename(key)
+
+	try:
+		with gzip.open(filename, 'rb') as f:
+			dbreadyversion = pickle.load(f)
+	except FileNotFoundError:
+		return None
+	except (OSError, EOFError, pickle.UnpicklingError):
+		# a damaged entry is just a miss
+		return None
+
+	# the age of an entry is the time since it was last used
+	try:
+		os.utime(filename)
+	except OSError:
+		pass
+
+	return dbreadyversion
+
+
+def savetoparsecache(key: str, dbreadyversion: list):
+	"""
+
+	store a dbreadyversion
+
+	several workers write at once: write to a temporary file and then swap it into place
+
+	:param key:
+	:param dbreadyversion:
+	:return:
+	"""
+
+	Path(cachedir).mkdir(parents=True, exist_ok=True)
+
+	filename = cachefilename(key)
+	tmpname = '{f}.{p}.tmp'.format(f=filename, p=os.getpid())
+
+	with gzip.open(tmpname, 'wb', compresslevel=3) as f:
+		pickle.dump(dbreadyversion, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+	os.replace(tmpname, filename)
+
+	return
+
+
+def evictfromparsecache():
+	"""
+
+	drop whatever is older than 'parsecachemaxdays'; then drop the least recently used items until the cache
+	is smaller than 'parsecachemaxmb'
+
+	:return:
+	"""
+
+	if not Path(cachedir).is_dir():
+		return
+
+	entries = list()
+	for e in Path(cachedir).glob('*.pickle.gz*'):
+		try:
+			s = e.stat()
+		except FileNotFoundError:
+			continue
+		entries.append((s.st_mtime, s.st_size, e))
+
+	entries.sort()
+
+	now = time.time()
+	tooold = [e for e in entries if now - e[0] > cachemaxdays * 86400]
+	keep = [e for e in entries if now - e[0] <= cachemaxdays * 86400]
+
+	evict = tooold
+	totalsize = sum(e[1] for e in keep)
+	while keep and totalsize > cachemaxmb * 1024 * 1024:
+		oldest = keep.pop(0)
+		totalsize -= oldest[1]
+		evict.append(oldest)
+
+	for e in evict:
+		try:
+			e[2].unlink()
+		except FileNotFoundError:
+			pass
+
+	if evict:
+		print('evicted {n} items from the parse cache'.format(n=len(evict)))
+
+	return
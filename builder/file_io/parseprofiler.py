@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+	HipparchiaBuilder: compile a database of Greek and Latin texts
+	Copyright: E Gunderson 2016-23
+	License: GNU GENERAL PUBLIC LICENSE 3
+		(see LICENSE in the top level directory of the distribution)
+"""
+
+import configparser
+import csv
+import json
+import os
+import time
+from collections import deque
+from types import GeneratorType
+from pathlib import Path
+
+config = configparser.ConfigParser()
+config.read('config.ini', encoding='utf8')
+
+try:
+	profiledir = config['io']['profiledir']
+except KeyError:
+	profiledir = config['io']['outputdir'] + 'buildprofiles/'
+
+"""
+	'--profile' records the wall time, cpu time, and the size of the input and output of every stage of the parse
+	of every author
+
+	the stages run in a lot of different processes (managedworker(), chunkparser(), ...); each process appends
+	its records to its own file inside a scratch directory and finishprofile() collects them when the corpus is done
+
+	the scratch directory travels via the environment so that every worker knows about it however it was started
+"""
+
+profileenvironmentvariable = 'HIPPARCHIAPROFILEDIR'
+
+# the whole of thecollectedworksof(): every other stage runs inside it, so it is a per author total and not a stage
+authortotalstage = 'thecollectedworksof'
+
+
+def startprofile(label: str):
+	"""
+
+	begin collecting stage timings for a corpus (or an author)
+
+	:param label: 'latin', 'TLG0085', ...
+	:return:
+	"""
+
+	scratch = '{d}{l}_{t}_{p}/'.format(d=profiledir, l=label, t=time.strftime('%Y%m%d_%H%M%S'), p=os.getpid())
+	Path(scratch).mkdir(parents=True, exist_ok=True)
+	os.environ[profileenvironmentvariable] = scratch
+
+	return
+
+
+def profilingactive() -> bool:
+	return profileenvironmentvariable in os.environ
+
+
+def measuresize(item) -> int:
+	"""
+
+	characters in a str; characters in a list of str; otherwise the number of items
+
+	a generator is 0: counting it would use it up; but profiledcall() never hands one over: see there
+
+	:param item:
+	:return:
+	"""
+
+	if isinstance(item, str):
+		return len(item)
+
+	if not isinstance(item, (list, tuple, deque)):
+		return 0
+
+	try:
+		return sum(len(i) if isinstance(i, str) else 1 for i in item)
+	except TypeError:
+		return 0
+
+
+def profiledcall(authorid: str, stagename: str, function, *arguments):
+	"""
+
+	function(*arguments); but if we are profiling, record how long it took and how much went in and came out
+
+	the size of the input is the size of the first argument
+
+	the line by line stages (insertnewlines(), fixhmuoragnizationlinebyline(), totallemmatization(), dbprepper())
+	hand back generators: they only do their work once something downstream pulls on them. So when profiling
+	the generator gets run to the end inside the timed call; otherwise the stage would look free and its cost
+	would land in the stage that consumes it (usually 'databaseloading'). The list then goes on downstream in its
+	place: more memory, but only while profiling
+
+	:param authorid:
+	:param stagename:
+	:param function:
+	:param arguments:
+	:return:
+	"""
+
+	if not profilingactive():
+		return function(*arguments)
+
+	insize = measuresize(arguments[0]) if arguments else 0
+	wallstart = time.perf_counter()
+	cpustart = time.process_time()
+
+	result = function(*arguments)
+	if isinstance(result, GeneratorType):
+		result = list(result)
+
+	record = {
+		'author': authorid,
+		'stage': stagename,
+		'wall': time.perf_counter() - wallstart,
+		'cpu': time.process_time() - cpustart,
+		'insize': insize,
+		'outsize': measuresize(result),
+	}
+
+	recordstage(record)
+
+	return result
+
+
+def recordstage(record: dict):
+	"""
+
+	append a record to the file that belongs to this process
+
+	:param record:
+	:return:
+	"""
+
+	filename = '{d}{p}.jsonl'.format(d=os.environ[profileenvironmentvariable], p=os.getpid())
+	with open(filename, 'a', encoding='utf-8') as f:
+		f.write(json.dumps(record) + '\n')
+
+	return
+
+
+def finishprofile(label: str):
+	"""
+
+	gather the records of every process, total them by stage, and write:
+
+		LABEL_stages.csv    one row per stage
+		LABEL_authors.csv   one row per author + stage; and one per author for the authortotalstage
+		LABEL.json          both of the above
+
+	then report the heaviest stages and how this build compares to the previous one with the same label
+
+	:param label:
+	:return:
+	"""
+
+	if not profilingactive():
+		return
+
+	scratch = Path(os.environ.pop(profileenvironmentvariable))
+
+	records = list()
+	for f in sorted(scratch.glob('*.jsonl')):
+		with open(f, encoding='utf-8') as r:
+			records += [json.loads(line) for line in r if line.strip()]
+		f.unlink()
+
+	try:
+		scratch.rmdir()
+	except OSError:
+		pass
+
+	if not records:
+		return
+
+	stages = dict()
+	authors = dict()
+	for r in records:
+		tallies = [(authors, (r['author'], r['stage']))]
+		if r['stage'] != authortotalstage:
+			tallies.append((stages, r['stage']))
+		for table, key in tallies:
+			if key not in table:
+				table[key] = {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'insize': 0, 'outsize': 0}
+			table[key]['calls'] += 1
+			for v in ['wall', 'cpu', 'insize', 'outsize']:
+				table[key][v] += r[v]
+
+	stagerows = [dict(stage=s, **stages[s]) for s in sorted(stages, key=lambda s: stages[s]['cpu'], reverse=True)]
+	authorrows = [dict(author=a, stage=s, **authors[(a, s)]) for (a, s) in sorted(authors)]
+
+	stamp = time.strftime('%Y%m%d_%H%M%S')
+	basename = '{d}{l}_{t}'.format(d=profiledir, l=label, t=stamp)
+	earlier = loadlastprofile(label)
+
+	profile = {'label': label, 'built': stamp, 'stages': stagerows, 'authors': authorrows}
+	with open(basename + '.json', 'w', encoding='utf-8') as f:
+		json.dump(profile, f, indent=1)
+
+	for suffix, rows in [('_stages.csv', stagerows), ('_authors.csv', authorrows)]:
+		with open(basename + suffix, 'w', encoding='utf-8', newline='') as f:
+			writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+			writer.writeheader()
+			writer.writerows(rows)
+
+	reportprofile(label, stagerows, earlier)
+	print('\tprofile written to {b}.json'.format(b=basename))
+
+	return
+
+
+def loadlastprofile(label: str) -> dict:
+	"""
+
+	the stages of the most recent profile with this label: {stagename: {'calls': ..., 'cpu': ...}, ...}
+
+	:param label:
+	:return:
+	"""
+
+	previous = sorted(Path(profiledir).glob('{l}_????????_??????.json'.format(l=label)))
+
+	if not previous:
+		return dict()
+
+	try:
+		with open(previous[-1], encoding='utf-8') as f:
+			earlier = {s['stage']: s for s in json.load(f)['stages']}
+	except (OSError, ValueError, KeyError):
+		earlier = dict()
+
+	return earlier
+
+
+def reportprofile(label: str, stagerows: list, earlier: dict):
+	"""
+
+	print the ten heaviest stages; and the change since the last profile if there is one
+
+	:param label:
+	:param stagerows:
+	:param earlier:
+	:return:
+	"""
+
+	print('\nstage profile for {l} [cpu seconds; wall seconds; calls]'.format(l=label))
+	for s in stagerows[:10]:
+		change = str()
+		if s['stage'] in earlier and earlier[s['stage']]['cpu']:
+			change = ' [{c:+.0%} cpu vs previous build]'.format(c=s['cpu'] / earlier[s['stage']]['cpu'] - 1)
+		print('\t{c:9.2f}\t{w:9.2f}\t{n:7d}\t{s}{x}'.format(c=s['cpu'], w=s['wall'], n=s['calls'], s=s['stage'], x=change))
+
+	return
@@ -7,8 +7,7 @@
 """
 
 import re
-from builder.parsers.betacodeletterscapitals import capitalletters
-from builder.parsers.betacodeletterslowercase import lowercaseletters
+from builder.parsers.betacodetransducer import betacodetounicode
 
 def replacegreekbetacode(texttoclean):
 	"""
@@ -17,8 +16,7 @@ def replacegreekbetacode(texttoclean):
 	:return:
 	"""
 
-	texttoclean = capitalletters(texttoclean)
-	texttoclean = lowercaseletters(texttoclean)
+	texttoclean = betacodetounicode(texttoclean)
 	# combining dot
 	texttoclean = re.sub(r'\?', u'\u0323', texttoclean)
 
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+	HipparchiaBuilder: compile a database of Greek and Latin texts
+	Copyright: E Gunderson 2016-23
+	License: GNU GENERAL PUBLIC LICENSE 3
+		(see LICENSE in the top level directory of the distribution)
+"""
+
+import configparser
+import re
+
+from builder.parsers.betacodeletterscapitals import capitalacute, capitaladscript, capitalcircumflex, capitalgrave, \
+	capitalletters, capitalrough, capitalroughacute, capitalroughacuteadscript, capitalroughcircumflex, \
+	capitalroughcircumflexadscript, capitalroughgrave, capitalroughgraveadscript, capitals, capitalsigmassubsitutes, \
+	capitalsmooth, capitalsmoothacute, capitalsmoothacuteadscript, capitalsmoothcircumflex, \
+	capitalsmoothcircumflexadscript, capitalsmoothgrave, capitalsmoothgraveadscript
+from builder.parsers.betacodeletterslowercase import lowercascircumflex, lowercaseacute, lowercaseacutediaresis, \
+	lowercaseacutedsub, lowercasediaresis, lowercasegrave, lowercasegravediaresis, lowercasegravesub, lowercaseletters, \
+	lowercaserough, lowercaseroughacute, lowercaseroughacutesubscript, lowercaseroughcircumflex, \
+	lowercaseroughcircumflexsubscript, lowercaseroughgrave, lowercaseroughgravesubscript, lowercaseroughsub, lowercases, \
+	lowercasesigmassubsitutes, lowercasesircumflexdiaresis, lowercasesircumflexsub, lowercasesmooth, \
+	lowercasesmoothacute, lowercasesmoothacutesubscript, lowercasesmoothcircumflex, \
+	lowercasesmoothcircumflexsubscript, lowercasesmoothgrave, lowercasesmoothgravesubscript, lowercasesmoothsub, \
+	lowercasesubscript
+
+config = configparser.ConfigParser()
+config.read('config.ini', encoding='utf8')
+
+"""
+	capitalletters() + lowercaseletters() make 60+ passes over a text: one for each combination of
+	letter + breathing + accent + subscript, and in order of decreasing length so that '*)/A|' is gone before '*A' is sought
+
+	but every one of those patterns is a single letter surrounded by a fixed set of marks, so the whole thing is
+	really a table of 'clusters': '*)/A|' --> 'ᾌ', 'W(=|' --> 'ᾧ', 'A' --> 'α', ...
+
+	build that table once (from the very same substitution functions) and then swap clusters in one left-to-right pass,
+	always taking the longest cluster available
+
+	the one thing the table cannot mimic: a few clusters that cannot really exist ('*)U', '*)=E', ...) are swapped
+	for nothing and so can glue their neighbors into a new cluster for a later pass; if you see one of those, just
+	do it the old way
+"""
+
+# (prefix, letters, suffix, substitution): in the order that capitalletters() and lowercaseletters() do them
+
+capitalclusters = [
+	('*)\\', 'AHW', '|', capitalsmoothgraveadscript),
+	('*(\\', 'AHW', '|', capitalroughgraveadscript),
+	('*)/', 'AHW', '|', capitalsmoothacuteadscript),
+	('*(/', 'AHW', '|', capitalroughacuteadscript),
+	# sic: capitalletters() looks for '*(=A|' twice and never for '*)=A|'
+	('*(=', 'AHW', '|', capitalsmoothcircumflexadscript),
+	('*(=', 'AHW', '|', capitalroughcircumflexadscript),
+	('*)\\', 'AEIOUHW', '', capitalsmoothgrave),
+	('*(\\', 'AEIOUHW', '', capitalroughgrave),
+	('*)/', 'AEIOUHW', '', capitalsmoothacute),
+	('*(/', 'AEIOUHW', '', capitalroughacute),
+	('*)=', 'AEIOUHW', '', capitalsmoothcircumflex),
+	('*(=', 'AEIOUHW', '', capitalroughcircumflex),
+	('*)', 'AEIOUHWR', '', capitalsmooth),
+	('*(', 'AEIOUHWR', '', capitalrough),
+	('*', 'AEIOUHW', '\\', capitalgrave),
+	('*', 'AEIOUHW', '/', capitalacute),
+	('*', 'AEIOUHW', '=', capitalcircumflex),
+	('*', 'AHW', '|', capitaladscript),
+]
+
+lowercaseclusters = [
+	('', 'AHW', ')\\|', lowercasesmoothgravesubscript),
+	('', 'AHW', '(\\|', lowercaseroughgravesubscript),
+	('', 'AHW', ')/|', lowercasesmoothacutesubscript),
+	('', 'AHW', '(/|', lowercaseroughacutesubscript),
+	('', 'AHW', ')=|', lowercasesmoothcircumflexsubscript),
+	('', 'AHW', '(=|', lowercaseroughcircumflexsubscript),
+	('', 'AEIOUHW', ')\\', lowercasesmoothgrave),
+	('', 'AEIOUHW', '(\\', lowercaseroughgrave),
+	('', 'AEIOUHW', ')/', lowercasesmoothacute),
+	('', 'AEIOUHW', '(/', lowercaseroughacute),
+	('', 'AEIOUHW', ')=', lowercasesmoothcircumflex),
+	('', 'AEIOUHW', '(=', lowercaseroughcircumflex),
+	('', 'AHW', '\\|', lowercasegravesub),
+	('', 'AHW', '/|', lowercaseacutedsub),
+	('', 'AHW', '=|', lowercasesircumflexsub),
+	('', 'AHW', ')|', lowercasesmoothsub),
+	('', 'AHW', '(|', lowercaseroughsub),
+	('', 'IU', '\\+', lowercasegravediaresis),
+	('', 'IU', '/+', lowercaseacutediaresis),
+	('', 'U', '=+', lowercasesircumflexdiaresis),
+	('', 'AEIOUHWR', ')', lowercasesmooth),
+	# the only cluster that cares about its neighbor: see lowercaseletters() on 'IG II(2) 891'
+	('', 'AEIOUHWR', '(', lowercaserough),
+	('', 'AEIOUHW', '\\', lowercasegrave),
+	('', 'AEIOUHW', '/', lowercaseacute),
+	('', 'AEIOUHW', '=', lowercascircumflex),
+	('', 'IU', '+', lowercasediaresis),
+	('', 'AHW', '|', lowercasesubscript),
+]
+
+uppercaseletters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def buildclustertable() -> dict:
+	"""
+
+	{cluster: unicode, ...} in the order that the old passes would have made the swaps
+
+	:return:
+	"""
+
+	lunate = config['buildoptions']['lunate'] != 'n'
+
+	clusters = list()
+	for prefix, letters, suffix, substitution in capitalclusters:
+		clusters += [(prefix + l + suffix, re.escape(prefix) + '([' + l + '])' + re.escape(suffix), substitution) for l in letters]
+
+	for s in ['*S', '*S1', '*S2', '*S3']:
+		if lunate:
+			clusters.append((s, r'[*]S[1-3]{0,1}', lambda m: u'\u03f9'))
+		else:
+			clusters.append((s, r'[*]S([1-3]){0,1}', capitalsigmassubsitutes))
+
+	clusters += [('*' + l, r'[*]([A-Z])', capitals) for l in uppercaseletters]
+
+	for prefix, letters, suffix, substitution in lowercaseclusters:
+		clusters += [(prefix + l + suffix, re.escape(prefix) + '([' + l + '])' + re.escape(suffix), substitution) for l in letters]
+
+	for s in ['S', 'S1', 'S2', 'S3']:
+		if lunate:
+			clusters.append((s, r'S[1-3]{0,1}', lambda m: u'\u03f2'))
+		else:
+			clusters.append((s, r'S([1-3]){0,1}', lowercasesigmassubsitutes))
+
+	clusters += [(l, r'([A-Z])', lowercases) for l in uppercaseletters]
+
+	table = dict()
+	for cluster, pattern, substitution in clusters:
+		if cluster not in table:
+			try:
+				table[cluster] = substitution(re.fullmatch(pattern, cluster))
+			except KeyError:
+				# the old pass would have died on this one too
+				pass
+
+	return table
+
+
+def buildclusterfinder(table: dict):
+	"""
+
+	one alternation with the longest clusters first
+
+	:param table:
+	:return:
+	"""
+
+	alternatives = list()
+	for cluster in sorted(table.keys(), key=lambda c: (-len(c), c)):
+		if len(cluster) == 2 and cluster[1] == '(' and cluster[0] in 'AEIOUHWR':
+			alternatives.append(re.escape(cluster) + r'(?!\d)')
+		else:
+			alternatives.append(re.escape(cluster))
+
+	return re.compile('|'.join(alternatives))
+
+
+clustertable = buildclustertable()
+clusterfinder = buildclusterfinder(clustertable)
+vanishingclusters = [c for c in clustertable if not clustertable[c]]
+if vanishingclusters:
+	vanishingclusters = re.compile('|'.join(re.escape(c) for c in vanishingclusters))
+
+if config['buildoptions']['lunate'] == 'n':
+	# see lowercaseletters()
+	straypunct = r'\<\>\{\}\[\]\(\)⟨⟩₍₎\.\?\!⌉⎜͙✳※¶§͜﹖→𐄂𝕔;:ˈ＇,‚‛‘“”„·‧∣'
+	combininglowerdot = u'\u0323'
+	boundaries = r'([' + combininglowerdot + straypunct + '\s]|$)'
+	terminalsigma = re.compile(r'σ' + boundaries)
+else:
+	terminalsigma = None
+
+
+def betacodetounicode(betacode: str) -> str:
+	"""
+
+	capitalletters() and then lowercaseletters() in a single pass
+
+	:param betacode:
+	:return:
+	"""
+
+	if vanishingclusters and re.search(vanishingclusters, betacode):
+		unicode = capitalletters(betacode)
+		return lowercaseletters(unicode)
+
+	unicode = re.sub(clusterfinder, lambda c: clustertable[c.group(0)], betacode)
+
+	if terminalsigma:
+		unicode = re.sub(terminalsigma, r'ς\1', unicode)
+
+	return unicode
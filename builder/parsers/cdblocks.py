@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+	HipparchiaBuilder: compile a database of Greek and Latin texts
+	Copyright: E Gunderson 2016-23
+	License: GNU GENERAL PUBLIC LICENSE 3
+		(see LICENSE in the top level directory of the distribution)
+"""
+
+import re
+
+from builder.parsers.betacodeandunicodeinterconversion import restoreromanwithingreek
+from builder.parsers.betacodefontshifts import latinauthorlinemarkupprober
+from builder.parsers.copticsubstitutions import replacecoptic
+from builder.parsers.regexsubstitutions import capitalvforcapitalu, earlybirdsubstitutions, replacequotationmarks
+
+
+def cdblockchunks(rawbytes: bytes, authornumber: str, chunkcount: int) -> list:
+	"""
+
+	cut the raw bytes of a file into (roughly) chunkcount pieces
+
+	the only places we will cut are the ends of CD blocks: 0xfe + a run of 0x0 *and* the next block has to open
+	by asserting the author number. That is:
+
+		[...text...] 0xfe 0x0 0x0 0x0 | 0xef 0x80 0xb0 0xb0 0xb0 0xb6 0xff [...]
+
+	decodecontrolruns() will turn the two sides of the cut into '<hmu_end_of_cd_block_re-initialize_key_variables />'
+	and '<hmu_cd_assert_author_number value="0006"/>', exactly as it would have done if the bytes had not been cut
+
+	:param rawbytes:
+	:param authornumber:
+	:param chunkcount:
+	:return: a list of bytes
+	"""
+
+	if not all(c in '0123456789abcdef' for c in authornumber):
+		return [rawbytes]
+
+	authormarker = bytes([0xef, 0x80] + [0xb0 + int(c, 16) for c in authornumber] + [0xff])
+	blockends = re.compile(rb'\xfe\x00+(?=' + re.escape(authormarker) + rb')')
+
+	targetsize = len(rawbytes) / max(chunkcount, 1)
+
+	chunks = list()
+	start = 0
+	for b in re.finditer(blockends, rawbytes):
+		if b.end() - start >= targetsize:
+			chunks.append(rawbytes[start:b.end()])
+			start = b.end()
+	chunks.append(rawbytes[start:])
+
+	return chunks
+
+
+#
+# the parsing is full of regex that can reach from one line into the next: '\"(.*?)\"', etc.
+# for each function that has such a regex, here is a test that is True if the end of a chunk
+# might leave that regex with an open match: the chunk would then fail to be self-contained
+#
+# the tests only need to look at the tail of a chunk: every chunk that precedes it passed the same test
+#
+
+def unclosedcapu(texttoclean: str) -> bool:
+	# capitalvforcapitalu(): '\$(.*?)&'
+	return texttoclean.rfind('$') > texttoclean.rfind('&')
+
+
+def unclosedearlybird(texttoclean: str) -> bool:
+	# earlybirdsubstitutions(): '&c\s\?(.*?)\$', '\[\sc\s\?(.*?)\$', and '&\?(.*?)\](.*?)\$'
+	lastdollar = texttoclean.rfind('$')
+	tail = texttoclean[lastdollar + 1:]
+	if re.search(r'&c\s\?', tail) or re.search(r'\[\sc\s\?', tail):
+		return True
+
+	if lastdollar == -1:
+		return '&?' in texttoclean
+
+	# an opener that comes before the last ']' that comes before the last '$' has already been closed
+	lastbracket = texttoclean.rfind(']', 0, lastdollar)
+
+	return '&?' in texttoclean[lastbracket + 1:]
+
+
+def unclosedquotes(texttoclean: str) -> bool:
+	# replacequotationmarks(): '\"(.*?)\"' and 'QUOTE(\d)(.*?)QUOTE(\d)'
+	quotecodes = re.findall(r'"(\d{1,2})', texttoclean)
+	if (texttoclean.count('"') - len(quotecodes)) % 2:
+		return True
+
+	# see quotesubstitutesa() for the codes that turn into 'QUOTEN'
+	pairedquotes = [q for q in quotecodes if int(q) in [2, 3, 6, 7, 8]]
+
+	return (len(pairedquotes) + len(re.findall(r'QUOTE\d', texttoclean))) % 2 == 1
+
+
+def unclosedcoptic(texttoclean: str) -> bool:
+	# replacecoptic(): '(<hmu_fontshift_greek_coptic>)(.*?)(&|</hmu_fontshift_greek_coptic>)'
+	closer = max(texttoclean.rfind('&'), texttoclean.rfind('</hmu_fontshift_greek_coptic>'))
+	return texttoclean.rfind('<hmu_fontshift_greek_coptic>') > closer
+
+
+def unclosedlatinshift(texttoclean: str) -> bool:
+	# restoreromanwithingreek(): '(<hmu_fontshift_latin_.*?>)(.*?)(</hmu_fontshift_latin_.*?>)'
+	return texttoclean.rfind('<hmu_fontshift_latin_') > texttoclean.rfind('</hmu_fontshift_latin_')
+
+
+def unclosedgreekshift(texttoclean: str) -> bool:
+	# latinauthorlinemarkupprober(): '<hmu_fontshift_greek_.*?>(.*?)</hmu_fontshift_greek_.*?>'
+	return texttoclean.rfind('<hmu_fontshift_greek_') > texttoclean.rfind('</hmu_fontshift_greek_')
+
+
+# each test is run on both the text that goes into the function and the text that comes out of it
+unclosedattail = {
+	capitalvforcapitalu: unclosedcapu,
+	earlybirdsubstitutions: unclosedearlybird,
+	replacequotationmarks: unclosedquotes,
+	replacecoptic: unclosedcoptic,
+	restoreromanwithingreek: unclosedlatinshift,
+	latinauthorlinemarkupprober: unclosedgreekshift,
+}
+
+
+class ChunkedAuthors(object):
+	"""
+
+	the chunks of the large authors are work items like any other author: see corpusbuilder.dispatchcorpustexts()
+
+	this is where the parsed chunks wait until the last chunk of their author is done; the worker that parses that
+	last chunk gets all of them back (in order) and finishes the author
+
+	"""
+
+	def __init__(self, manager):
+		self.parsed = manager.dict()
+		self.chunkcounts = manager.dict()
+		self.remaining = manager.dict()
+		self.lock = manager.Lock()
+
+	def expect(self, authorid: str, chunkcount: int):
+		self.chunkcounts[authorid] = chunkcount
+		self.remaining[authorid] = chunkcount
+
+	def store(self, authorid: str, chunknumber: int, parsedchunk: str, selfcontained: bool):
+		"""
+
+		file a parsed chunk
+
+		:param authorid:
+		:param chunknumber:
+		:param parsedchunk:
+		:param selfcontained:
+		:return: [(parsedchunk, selfcontained), ...] if that was the last chunk of the author; otherwise None
+		"""
+
+		with self.lock:
+			self.parsed[(authorid, chunknumber)] = (parsedchunk, selfcontained)
+			remaining = self.remaining[authorid] - 1
+			self.remaining[authorid] = remaining
+
+		if remaining:
+			return None
+
+		chunks = [self.parsed.pop((authorid, n)) for n in range(self.chunkcounts[authorid])]
+
+		return chunks
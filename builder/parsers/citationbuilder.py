@@ -52,6 +52,21 @@ def citationbuilder(hexsequence: regexmatch) -> str:
 	hexsequence = re.split(r'█', hexsequence)
 	hexsequence.reverse()
 	hexsequence.pop()
+
+	return hexvaluestocitation(hexsequence)
+
+
+def hexvaluestocitation(hexsequence: list) -> str:
+	"""
+
+	the actual work of citationbuilder(): it does not care where the hex values came from
+
+	decodecontrolruns() arrives here straight from the bytes and so skips the '█ⓔⓕ ' round trip
+
+	:param hexsequence: a list of hex strings in *reverse* order since we will be popping from it
+	:return: fullcitation
+	"""
+
 	fullcitation = str()
 
 	actionmapper = {
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+	HipparchiaBuilder: compile a database of Greek and Latin texts
+	Copyright: E Gunderson 2016-23
+	License: GNU GENERAL PUBLIC LICENSE 3
+		(see LICENSE in the top level directory of the distribution)
+"""
+
+
+class CitationState(object):
+	"""
+
+	the six citation levels + the work number as totallemmatization() walks through a text
+
+	the citation of a line is a tuple of six strings: ('961', '1', '1', '1', '1', '1')
+
+	the tuple is only rebuilt after a level changes: every line until the next change gets the very same object, so
+	200k lines of an author only need a few thousand citations and not 200k lists of 6 tuples
+
+	"""
+
+	__slots__ = ('levels', 'work', 'workstring', 'citation')
+
+	levelcount = 6
+
+	def __init__(self):
+		# '<hmu_set_level_(\d)_to_' can name levels 6-9 too: they are not cited, but they can still reset the others
+		self.levels = ['1'] * 10
+		self.work = 1
+		self.workstring = '1'
+		self.citation = None
+
+	def assertwork(self, worknumber: int):
+		self.work = worknumber
+		self.workstring = str(worknumber)
+		self.resetbelow(self.levelcount)
+
+	def setlevel(self, level: int, setting: str):
+		# Euripides (0006) has <hmu_set_level_0_to_post 961 /> after πῶς οὖν ἔτ’ ἂν θνήισκοιμ’ ἂν ἐνδίκως, πόσι,
+		# 'post 961' becomes a problem: you need to add one to 961, but you will fail 'str(int(setting)'
+		# slicing at the whitespace will fix this (sort of)
+		# but then you get a new problem: UPZ (DDP0155) and its new documents '<hmu_set_level_5_to_2 rp />'
+		# the not so pretty solution of the hour is to build a quasi-condition that is seldom met
+		# it is almost never true that the split will yield anything other than the original item
+		# it also is not clear how many other similar cases are out there: 'after 1001', etc.
+		self.levels[level] = setting.split('post ')[-1]
+		self.resetbelow(level)
+
+	def incrementlevel(self, level: int):
+		current = self.levels[level]
+		try:
+			# are we adding integers?
+			self.levels[level] = str(int(current) + 1)
+		except ValueError:
+			# ok, we are incrementing a letter; hope it's not z+1
+			# can handle multicharacter strings, but how often is it not "a --> b"?
+			self.levels[level] = current[:-1] + chr(ord(current[-1]) + 1)
+		# if you increment lvl 1, you need to reset lvl 0
+		# this is a bit scary because sometimes you get an 0x81 and sometimes you don't
+		self.resetbelow(level)
+
+	def resetbelow(self, level: int):
+		for l in range(0, level):
+			self.levels[l] = '1'
+		self.citation = None
+
+	def currentcitation(self) -> tuple:
+		if self.citation is None:
+			self.citation = tuple(self.levels[:self.levelcount])
+		return self.citation
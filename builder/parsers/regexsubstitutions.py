@@ -6,14 +6,15 @@
 		(see LICENSE in the top level directory of the distribution)
 """
 from string import punctuation
-from typing import List
+from typing import Iterable, Iterator
 
 import configparser
 import re
 
 from builder.parsers.betacodeescapedcharacters import percentsubstitutes, quotesubstitutesa, quotesubstitutesb
 from builder.parsers.betacodefontshifts import latinauthorandshiftparser
-from builder.parsers.citationbuilder import citationbuilder
+from builder.parsers.citationbuilder import citationbuilder, hexvaluestocitation
+from builder.parsers.citationstate import CitationState
 from builder.parsers.swappers import bitswapchars, hextohighunicode, highunicodetohex, hutohxgrouper
 
 config = configparser.ConfigParser()
@@ -395,13 +396,15 @@ def bracketspacer(matchgroup):
 # fix problems with the original data
 #
 
-def fixhmuoragnizationlinebyline(txt: List[str]) -> List[str]:
+def fixhmuoragnizationlinebyline(txt: Iterable[str]) -> Iterable[str]:
 	"""
 
 	the original data has improper nesting of some tags; try to fix that
 
 	this is meaningless if you have set htmlifydatabase to 'y' since the 'spanning' will hide the phenomenon
 
+	the lines are fixed one at a time as they are pulled through: see insertnewlines()
+
 	:param txt:
 	:return:
 	"""
@@ -419,7 +422,7 @@ def fixhmuoragnizationlinebyline(txt: List[str]) -> List[str]:
 	if htmlify == 'y' or rationalizetags == 'n':
 		pass
 	else:
-		txt = [fixhmuirrationaloragnization(x) for x in txt]
+		txt = (fixhmuirrationaloragnization(x) for x in txt)
 
 	return txt
 
@@ -551,83 +554,43 @@ def fixhmuirrationaloragnization(worlkine: str):
 #
 
 
-def totallemmatization(parsedtextfile: List[str]) -> List[str]:
+def totallemmatization(parsedtextfile: Iterable[str]) -> Iterator[list]:
 	"""
 	will use decoded hex commands to build a citation value for every line in the text file
 	can produce a formatted line+citation, but really priming us for the move to the db
 
 	note the potential gotcha: some authors have a first work that is not 001 but instead 002+
 
+	the levels are tracked by a CitationState: lines that share a citation share the same tuple
+
 	:param parsedtextfile:
-	:return: tuples that levelmap+the line
+	:return: [work, citation, line] for each line: ['6', ('1100', '1', '1', '1', '1', '1'), '...']
 	"""
 
-	levelmapper = {
-		# be careful about re returning '1' and not 1
-		0: 1,
-		1: 1,
-		2: 1,
-		3: 1,
-		4: 1,
-		5: 1
-	}
-
-	dbready = list()
-
-	work = 1
+	state = CitationState()
 
 	setter = re.compile(r'<hmu_set_level_(\d)_to_(.*?)\s/>')
 	adder = re.compile(r'<hmu_increment_level_(\d)_by_1\s')
 	wnv = re.compile(r'<hmu_cd_assert_work_number betacodeval="(\d{1,3})')
 
 	for line in parsedtextfile:
-		gotwork = re.search(wnv, line)
-		if gotwork:
-			work = int(gotwork.group(1))
-			for l in range(0, 6):
-				levelmapper[l] = 1
-		gotsetting = re.search(setter, line)
-		if gotsetting:
-			level = int(gotsetting.group(1))
-			setting = gotsetting.group(2)
-			# Euripides (0006) has <hmu_set_level_0_to_post 961 /> after πῶς οὖν ἔτ’ ἂν θνήισκοιμ’ ἂν ἐνδίκως, πόσι,
-			# 'post 961' becomes a problem: you need to add one to 961, but you will fail 'str(int(setting)'
-			# slicing at the whitespace will fix this (sort of)
-			# but then you get a new problem: UPZ (DDP0155) and its new documents '<hmu_set_level_5_to_2 rp />'
-			# the not so pretty solution of the hour is to build a quasi-condition that is seldom met
-			# it is almost never true that the split will yield anything other than the original item
-			# it also is not clear how many other similar cases are out there: 'after 1001', etc.
-			levelmapper[level] = setting.split('post ')[-1]
-			if level > 0:
-				for l in range(0, level):
-					levelmapper[l] = 1
-
-		gotincrement = re.search(adder, line)
+		if '<hmu_cd_assert_work_number' in line:
+			gotwork = re.search(wnv, line)
+			if gotwork:
+				state.assertwork(int(gotwork.group(1)))
+
+		if '<hmu_set_level_' in line:
+			gotsetting = re.search(setter, line)
+			if gotsetting:
+				state.setlevel(int(gotsetting.group(1)), gotsetting.group(2))
+
 		# if you don't reset the lower counters, then you will get something like 'line 10' when you first initialize a new section
+		if '<hmu_increment_level_' in line:
+			gotincrement = re.search(adder, line)
+			if gotincrement:
+				state.incrementlevel(int(gotincrement.group(1)))
 
-		if gotincrement:
-			level = int(gotincrement.group(1))
-			setting = 1
-			try:
-				# are we adding integers?
-				levelmapper[level] = str(int(setting) + int(levelmapper[level]))
-			except ValueError:
-				# ok, we are incrementing a letter; hope it's not z+1
-				# can handle multicharacter strings, but how often is it not "a --> b"?
-				lastchar = levelmapper[level][-1]
-				newlastchar = chr(ord(lastchar) + setting)
-				levelmapper[level] = levelmapper[level][:-1] + newlastchar
-			# if you increment lvl 1, you need to reset lvl 0
-			# this is a bit scary because sometimes you get an 0x81 and sometimes you don't
-			if level > 0:
-				for l in range(0, level):
-					levelmapper[l] = 1
-
-		# db version: list of tuples + the line
-		tups = [('0', str(levelmapper[0])), ('1', str(levelmapper[1])), ('2', str(levelmapper[2])), ('3', str(levelmapper[3])), ('4', str(levelmapper[4])), ('5', str(levelmapper[5]))]
-		dbready.append([str(work), tups, line])
-
-	return dbready
+		yield [state.workstring, state.currentcitation(), line]
 
 
 def addcdlabels(texttoclean, authornumber):
@@ -714,6 +677,101 @@ def hexrunner(texttoclean):
 	return texttoclean
 
 
+def decodecontrolruns(texttoclean, authornumber):
+	"""
+
+	the counterpart of compacthighunicodefileload(): do the work of addcdlabels() + hexrunner() in one pass
+
+	every '█' + [private use characters] + ' ' marker is a run of control bytes; read the bytes straight
+	back out of it and decode the run without ever building the '█ⓔⓕ █⑧⓪ ' version of it
+
+	identical runs are very common ('0x81' over and over again), so each distinct run is only decoded once
+
+	:param texttoclean:
+	:param authornumber:
+	:return:
+	"""
+
+	controlrun = re.compile(r'█([\ue000-\ue0ff]+)\s?')
+	decoded = dict()
+
+	def rundecoder(match):
+		run = match.group(1)
+		try:
+			return decoded[run]
+		except KeyError:
+			decoded[run] = controlrundecoder(bytes(ord(c) - 0xe000 for c in run), authornumber)
+		return decoded[run]
+
+	texttoclean = re.sub(controlrun, rundecoder, texttoclean)
+
+	return texttoclean
+
+
+def controlrundecoder(run: bytes, authornumber: str) -> str:
+	"""
+
+	apply the addcdlabels() searches to a single run of control bytes and then send what is left to the citationbuilder
+
+	the order is the addcdlabels() order; once a search has claimed some bytes no later search can see across them
+
+	:param run:
+	:param authornumber:
+	:return:
+	"""
+
+	segments = [run]
+
+	eob = re.compile(rb'\xfe\x00+')
+	segments = splitcontrolrun(segments, eob, lambda m: '\n<hmu_end_of_cd_block_re-initialize_key_variables />')
+
+	if all(c in '0123456789abcdef' for c in authornumber):
+		author = re.compile(re.escape(bytes([0xef, 0x80] + [0xb0 + int(c, 16) for c in authornumber] + [0xff])))
+		segments = splitcontrolrun(segments, author, lambda m: '<hmu_cd_assert_author_number value="{v}"/>'.format(v=authornumber))
+
+	worknumber = re.compile(rb'\xef\x81([\xb0-\xbf]{3})\xff')
+	segments = splitcontrolrun(segments, worknumber, lambda m: '\n<hmu_cd_assert_work_number betacodeval="{v}"/>'.format(v=''.join('{:x}'.format(b & 0x0f) for b in m.group(1))))
+
+	workabbreviation = re.compile(rb'\xef\x82([\x10-\xff]+?)\xff')
+	segments = splitcontrolrun(segments, workabbreviation, lambda m: '<hmu_cd_assert_work_abbreviation betacodeval="{v}"/>'.format(v=''.join(chr(b & 0x7f) for b in m.group(1))))
+
+	authorabbreviation = re.compile(rb'\xef\x83([\x10-\xff]+?)\xff')
+	segments = splitcontrolrun(segments, authorabbreviation, lambda m: '<hmu_cd_assert_author_abbrev betacodeval="{v}"/>'.format(v=''.join(chr(b & 0x7f) for b in m.group(1))))
+
+	# whatever is left is a hexrun
+	decoded = [s if isinstance(s, str) else hexvaluestocitation(['{:x}'.format(b) for b in reversed(s)]) for s in segments]
+
+	return ''.join(decoded)
+
+
+def splitcontrolrun(segments: list, search, substitute) -> list:
+	"""
+
+	run a search over the undecoded (i.e., bytes) segments of a control run; swap the matches for strings
+
+	:param segments:
+	:param search:
+	:param substitute:
+	:return:
+	"""
+
+	newsegments = list()
+	for s in segments:
+		if isinstance(s, str):
+			newsegments.append(s)
+			continue
+		position = 0
+		for m in re.finditer(search, s):
+			if m.start() > position:
+				newsegments.append(s[position:m.start()])
+			newsegments.append(substitute(m))
+			position = m.end()
+		if position < len(s):
+			newsegments.append(s[position:])
+
+	return newsegments
+
+
 #
 # misc little tools
 #
@@ -776,18 +834,27 @@ def colonshift(txt):
 	return re.sub(r':', '·', txt)
 
 
-def insertnewlines(txt):
+def insertnewlines(txt: str) -> Iterator[str]:
 	"""
 
 	break up the file into something you can walk through line-by-line
 
+	this is where the text stops being one big string: from here to the COPY in insertworksintoauthortable()
+	each line is pulled through every step on its own instead of each step building a new list of every line
+
 	:param txt:
 	:return:
 	"""
 	txt = re.sub(r'(<hmu_set_level)', r'\n\1', txt)
-	txt = txt.split('\n')
 
-	return txt
+	start = 0
+	end = txt.find('\n')
+	while end != -1:
+		yield txt[start:end]
+		start = end + 1
+		end = txt.find('\n', start)
+
+	yield txt[start:]
 
 
 def tidyupterm(word: str, punct=None) -> str:
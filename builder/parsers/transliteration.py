@@ -7,7 +7,7 @@
 """
 
 import re
-from collections import deque
+from typing import Iterable, Iterator
 
 try:
 	regexmatch = re.Match
@@ -16,25 +16,41 @@ except AttributeError:
 	regexmatch = object()
 
 
-def transliteratecolums(deprepdeque: deque):
+def transliteratecolums(deprepdeque: Iterable[list]) -> Iterator[list]:
 	"""
 
-	call transliteratethedeque() for the columns you want to modify
+	call transliterateline() for every line
+
+	:param deprepdeque:
+	:return:
+	"""
+
+	return (transliterateline(line) for line in deprepdeque)
+
+
+def transliterateline(line: list, columns=(2, 3, 4)) -> list:
+	"""
+
+	transliteratethedeque() for a single line: the columns you want to modify
 
 	2 and/or 3, I guess
 
-	:param deprepdeque:
+	:param line:
+	:param columns:
 	:return:
 	"""
 
-	columns = [2, 3, 4]
+	line = list(line)
 	for c in columns:
-		deprepdeque = transliteratethedeque(deprepdeque, c)
+		modified = runsswapsuite(line[c])
+		if c == 4:
+			modified = modified.lower()
+		line[c] = modified
 
-	return deprepdeque
+	return line
 
 
-def transliteratethedeque(deprepdeque: deque, workingcolumn=4) -> deque:
+def transliteratethedeque(deprepdeque: Iterable[list], workingcolumn=4) -> Iterator[list]:
 	"""
 
 	3: modify the stripped column
@@ -44,8 +60,6 @@ def transliteratethedeque(deprepdeque: deque, workingcolumn=4) -> deque:
 	:return:
 	"""
 
-	dbreadyversion = deque()
-
 	for line in deprepdeque:
 		tomodify = line[workingcolumn]
 		modified = runsswapsuite(tomodify)
@@ -58,9 +72,7 @@ def transliteratethedeque(deprepdeque: deque, workingcolumn=4) -> deque:
 					newline.append(modified.lower())
 				else:
 					newline.append(modified)
-		dbreadyversion.append(newline)
-
-	return dbreadyversion
+		yield newline
 
 
 def runsswapsuite(texttoswap: str) -> str:
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+	HipparchiaBuilder: compile a database of Greek and Latin texts
+	Copyright: E Gunderson 2016-23
+	License: GNU GENERAL PUBLIC LICENSE 3
+		(see LICENSE in the top level directory of the distribution)
+"""
+
+import re
+import time
+from string import punctuation
+
+from builder.parsers.regexsubstitutions import tidyupterm
+
+"""
+	the words of a line for the wordcounts: dbWorkLine.indexablewordlist() and mpbuildindexdictionary()
+
+	regexindexablewords() is how this used to be done: for every word of every line up to four regex searches to
+	decide between Greek and Latin, two more regex passes inside tidyupterm(), and then another regex for 'v'
+
+	indexablewords() gets the same words with tables that are built once:
+		[a] a word is Greek if it shares a letter with 'greekletters': a set lookup instead of a regex search
+		[b] every Greek word gets cleaned at once: join them, one str.translate() deletes the digits + punctuation and
+			swaps j/v for i/u, split them again; the same for every Latin word
+		[c] one lower() and one more str.translate() for the graves (and 'v') of the whole line
+
+	a deleted character never takes a space with it, so the words come back out of the join in the same order and
+	an emptied word is still there as ''; lower() treats a final 'Σ' the same way whether or not the next word is
+	right after it: a space is not a letter
+
+	checktokenizer() compares the two and times them
+"""
+
+grave = 'ὰὲὶὸὺὴὼῒῢᾲῂῲἃἓἳὃὓἣὣἂἒἲὂὒἢὢ'
+acute = 'άέίόύήώΐΰᾴῄῴἅἕἵὅὕἥὥἄἔἴὄὔἤὤ'
+
+# dbWorkLine.minimumgreek is '[α-ω' + these + ']'
+accentedgreek = 'ἀἁἂἃἄἅἆἇᾀᾁᾂᾃᾄᾅᾆᾇᾲᾳᾴᾶᾷᾰᾱὰάἐἑἒἓἔἕὲέἰἱἲἳἴἵἶἷὶίῐῑῒΐῖῗὀὁὂὃὄὅόὸὐὑὒὓὔὕὖὗϋῠῡῢΰῦῧύὺᾐᾑᾒᾓᾔᾕᾖᾗῂῃῄῆῇἤἢἥἣὴήἠἡἦἧὠὡὢὣὤὥὦὧᾠᾡᾢᾣᾤᾥᾦᾧῲῳῴῶῷώὼ'
+greekletters = frozenset([chr(c) for c in range(ord('α'), ord('ω') + 1)] + list(accentedgreek))
+
+# note the tricky combining marks like " ͡ " which can be hard to spot since they float over another special character
+elidedextrapunct = '\′‵‘·“”„—†⌈⌋⌊∣⎜͙ˈͻ✳※¶§⸨⸩｟｠⟫⟪❵❴⟧⟦→◦⊚𐄂𝕔☩(«»›‹⸐„⸏⸎⸑–⏑–⏒⏓⏔⏕⏖⌐∙×⁚̄⁝͜‖͡⸓͝'
+extrapunct = elidedextrapunct + '’'
+
+# tidyupterm(): drop [0-9], drop the punctuation, then 'jv' ==> 'iu'
+greekcleanup = str.maketrans('jv', 'iu', '0123456789' + punctuation + elidedextrapunct)
+latincleanup = str.maketrans('jv', 'iu', '0123456789' + punctuation + extrapunct)
+
+gravefold = str.maketrans(grave, acute)
+gravefoldandvtou = str.maketrans(grave + 'v', acute + 'u')
+
+nbsp = str.maketrans('\xa0', ' ')
+
+# regexindexablewords() only
+minimumgreek = re.compile('[α-ω{g}]'.format(g=accentedgreek))
+greekpunct = re.compile('[{s}]'.format(s=re.escape(punctuation + elidedextrapunct)))
+latinpunct = re.compile('[{s}]'.format(s=re.escape(punctuation + extrapunct)))
+
+
+def indexablewords(polytonicline: str, markedupwords=None, vtou=True) -> list:
+	"""
+
+	the words of a line as regexindexablewords() finds them
+
+	markedupwords: the words of the marked_up_line; a Greek word that is followed there by '’' counts as elided
+	(dbWorkLine.wordlist('marked_up_line') has only ever returned an empty list: so nothing has ever counted as elided)
+
+	vtou: mpbuildindexdictionary() never turned a lowercased 'V' into 'u'
+
+	:param polytonicline:
+	:param markedupwords:
+	:param vtou:
+	:return:
+	"""
+
+	words = polytonicline.translate(nbsp).split(' ')
+	greekwords = [w for w in words if w and not greekletters.isdisjoint(w)]
+	latinwords = [w for w in words if w and greekletters.isdisjoint(w)]
+
+	cleaned = list()
+	if greekwords:
+		cleaned.append(' '.join(greekwords).translate(greekcleanup))
+	if latinwords:
+		cleaned.append(' '.join(latinwords).translate(latincleanup))
+
+	if not cleaned:
+		return list()
+
+	if vtou:
+		fold = gravefoldandvtou
+	else:
+		fold = gravefold
+
+	if not markedupwords:
+		return ' '.join(cleaned).lower().translate(fold).split(' ')
+
+	words = ' '.join(cleaned).lower().split(' ')
+	elided = [w + '’' in markedupwords and not greekletters.isdisjoint(w) for w in words]
+	words = [w for w, e in zip(words, elided) if not e] + [w + "'" for w, e in zip(words, elided) if e]
+
+	return ' '.join(words).translate(fold).split(' ')
+
+
+def regexindexablewords(polytonicline: str, markedupwords=None, vtou=True) -> list:
+	"""
+
+	what dbWorkLine.indexablewordlist() used to do: kept so that checktokenizer() has something to check against
+
+	:param polytonicline:
+	:param markedupwords:
+	:param vtou:
+	:return:
+	"""
+
+	if not markedupwords:
+		markedupwords = set()
+
+	line = re.sub(r'\xa0', ' ', polytonicline)
+	polytonicwords = [w for w in line.split(' ') if w]
+	polytonicgreekwords = [tidyupterm(w, greekpunct).lower() for w in polytonicwords if re.search(minimumgreek, w)]
+	polytoniclatinwords = [tidyupterm(w, latinpunct).lower() for w in polytonicwords if not re.search(minimumgreek, w)]
+	polytonicwords = polytonicgreekwords + polytoniclatinwords
+	listofwords = [w for w in polytonicwords if w + '’' not in markedupwords or not re.search(minimumgreek, w)]
+	elisions = [w + "'" for w in polytonicwords if w + '’' in markedupwords and re.search(minimumgreek, w)]
+	listofwords.extend(elisions)
+	listofwords = [w.translate(gravefold) for w in listofwords]
+	if vtou:
+		listofwords = [re.sub('v', 'u', w) for w in listofwords]
+
+	return listofwords
+
+
+# lines that have tripped up tokenizers: checktokenizer() always tries these along with the sample
+awkwardlines = [
+	str(),
+	' ',
+	'\xa0',
+	'μῆνιν ἄειδε θεὰ Πηληϊάδεω Ἀχιλῆοϲ',
+	'ΟΔΟΣ ΣΟΦΟΣ Σ ΑΣ· ΜΕΝΟΣ. ΛΟΓΟΣ’ ΚΑΙ',
+	'τ’ ἄρ’ δ’ ἀλλ’ κατ’ ἐπ’ ὑφ’',
+	'Arma virumque cano, Troiae qui primus ab oris',
+	'VENI VIDI VICI Iulius Jupiter JVLIVS',
+	'2 3. 14 — † ‘’ “” ⟦⟧ ⸨⸩ 𐄂 𝕔',
+	'ἔννεπε\xa0Μοῦσα  πολύτροπον',
+	'δὲ  τὸν\xa0\xa0ἄνδρα καὶ ὁ θεὸϲ ὰ ὲ ὶ ὸ ὺ ὴ ὼ ῒ ῢ ᾲ ῂ ῲ',
+	'ἐν ἀρχῇ ἦν ὁ λόγοϲ· ILLE lOGOS καὶ v V',
+	'a͡b α͡β ă ά ā ᾱ̆',
+	'İstanbul ΐ ΰ ǅ Ϲ',
+	'\t tab\tinside ωμέγα\n',
+]
+
+
+def checktokenizer(samplelines: list, repeats=3) -> bool:
+	"""
+
+	do indexablewords() and regexindexablewords() agree? and how much faster is the first one?
+
+	every line is tried with and without the 'v' ==> 'u' step; and also with a set of marked-up words that
+	contains every Greek word of the line + '’' so that the elision branch gets used
+
+	'makecorpora.py --checktokenizer' runs this with lines taken from the author tables
+
+	:param samplelines:
+	:param repeats:
+	:return:
+	"""
+
+	lines = awkwardlines + list(samplelines)
+
+	allagree = True
+	differences = 0
+	for line in lines:
+		markedup = {w + '’' for w in regexindexablewords(line, vtou=False)}
+		for markedupwords in [None, markedup]:
+			for vtou in [True, False]:
+				expected = regexindexablewords(line, markedupwords, vtou)
+				found = indexablewords(line, markedupwords, vtou)
+				if found != expected:
+					allagree = False
+					differences += 1
+					if differences <= 10:
+						print('\ttokenizers disagree about {l!r}:\n\t\tregex: {e}\n\t\ttables: {f}'.format(l=line, e=expected, f=found))
+
+	print('\t{n} lines; {d} disagreements'.format(n=len(lines), d=differences))
+
+	timings = dict()
+	for tokenizer in [regexindexablewords, indexablewords]:
+		best = None
+		for _ in range(repeats):
+			start = time.perf_counter()
+			for line in lines:
+				tokenizer(line)
+			elapsed = time.perf_counter() - start
+			if best is None or elapsed < best:
+				best = elapsed
+		timings[tokenizer.__name__] = best
+		print('\t{t}: {s}s for {n} lines ({r} lines per second)'.format(t=tokenizer.__name__, s=round(best, 3), n=len(lines), r=int(len(lines) / max(best, 1e-9))))
+
+	print('\tspeedup: {x}x'.format(x=round(timings['regexindexablewords'] / max(timings['indexablewords'], 1e-9), 1)))
+
+	return allagree
@@ -6,13 +6,50 @@
 		(see LICENSE in the top level directory of the distribution)
 """
 
-import io
+import configparser
+import time
 from multiprocessing import Manager
+from os import cpu_count
 
 from builder.builderclasses import MPCounter
 from builder.dbinteraction.connection import setconnection
+from builder.dbinteraction.copystreams import columntypesfor, copyrowsintotable
 from builder.dbinteraction.dbhelperfunctions import resultiterator
 from builder.dbinteraction.genericworkerobject import GenericInserterObject
+from builder.workers import setworkercount
+
+config = configparser.ConfigParser()
+config.read('config.ini', encoding='utf8')
+
+try:
+	# in MB: shared by all of the workers that are building indices at the same time
+	indexmemory = int(config['buildoptions']['indexmemory'])
+except (KeyError, ValueError):
+	indexmemory = 2048
+
+# the columns of the works table (see generate_hipparchia_dbs.sql) as copyrowsintotable() needs to know them
+workscolumntypes = {
+	'universalid': 't',
+	'title': 't',
+	'language': 't',
+	'publication_info': 't',
+	'levellabels_00': 't',
+	'levellabels_01': 't',
+	'levellabels_02': 't',
+	'levellabels_03': 't',
+	'levellabels_04': 't',
+	'levellabels_05': 't',
+	'workgenre': 't',
+	'transmission': 't',
+	'worktype': 't',
+	'provenance': 't',
+	'recorded_date': 't',
+	'converted_date': 'i',
+	'wordcount': 'i',
+	'firstline': 'i',
+	'lastline': 'i',
+	'authentic': '?'
+}
 
 """
 	SPEED NOTES
@@ -26,23 +63,29 @@ from builder.dbinteraction.genericworkerobject import GenericInserterObject
 """
 
 
-def insertfirstsandlasts(workcategoryprefix):
+def insertfirstsandlasts(workcategoryprefix, authoruids=None):
 	"""
 
 	public.works needs to know
 	firstline integer,
 	lastline integer,
 
+	if authoruids is set, only the works of those authors are examined
+
 	:param workcategoryprefix:
-	:param cursor:
+	:param authoruids:
 	:return:
 	"""
 	dbconnection = setconnection()
 	cursor = dbconnection.cursor()
 
 	print('inserting work db metatata: first/last lines')
-	query = 'SELECT universalid FROM works WHERE universalid LIKE %s ORDER BY universalid DESC'
-	data = (workcategoryprefix+'%',)
+	if not authoruids:
+		query = 'SELECT universalid FROM works WHERE universalid LIKE %s ORDER BY universalid DESC'
+		data = (workcategoryprefix+'%',)
+	else:
+		query = 'SELECT universalid FROM works WHERE universalid LIKE ANY(%s) ORDER BY universalid DESC'
+		data = ([a + 'w%' for a in authoruids],)
 	cursor.execute(query, data)
 	results = resultiterator(cursor)
 
@@ -125,13 +168,10 @@ def insertboundaries(boundariestuplelist):
 	q = 'CREATE TEMP TABLE tmp_works AS SELECT * FROM works LIMIT 0'
 	dbcursor.execute(q)
 
-	pgcopydata = ['{a}\t{b}\t{c}'.format(a=t[0], b=t[1], c=t[2]) for t in boundariestuplelist]
+	pgcopydata = (tuple(t[0:3]) for t in boundariestuplelist)
 
-	rawio = io.StringIO()
-	rawio.write('\n'.join(pgcopydata))
-	rawio.seek(0)
-
-	dbcursor.copy_from(rawio, 'tmp_works', columns=loadingcolumns)
+	columntypes = columntypesfor(loadingcolumns, workscolumntypes)
+	copyrowsintotable(dbcursor, 'tmp_works', loadingcolumns, pgcopydata, columntypes=columntypes)
 
 	dbconnection.commit()
 	q = """
@@ -255,13 +295,10 @@ def insertcounts(countdict):
 	q = 'CREATE TEMP TABLE tmp_works AS SELECT * FROM works LIMIT 0'
 	dbcursor.execute(q)
 
-	pgcopydata = ['{a}\t{b}'.format(a=idnum, b=countdict[idnum]) for idnum in countdict.keys()]
-
-	rawio = io.StringIO()
-	rawio.write('\n'.join(pgcopydata))
-	rawio.seek(0)
+	pgcopydata = ((idnum, countdict[idnum]) for idnum in countdict.keys())
 
-	dbcursor.copy_from(rawio, 'tmp_works', columns=loadingcolumns)
+	columntypes = columntypesfor(loadingcolumns, workscolumntypes)
+	copyrowsintotable(dbcursor, 'tmp_works', loadingcolumns, pgcopydata, columntypes=columntypes)
 
 	dbconnection.commit()
 	q = 'UPDATE works SET wordcount = tmp_works.wordcount FROM tmp_works WHERE works.universalid = tmp_works.universalid'
@@ -277,38 +314,90 @@ def insertcounts(countdict):
 	return
 
 
-def buildtrigramindices(workcategoryprefix):
+def buildtrigramindices(workcategoryprefix, authoruids=None, workercount=None):
 	"""
 	build indices for the works based on trigrams keyed to the stripped line
-	
-	:param cursor:
-	:param dbconnection:
+
+	if authoruids is set, only those authors are indexed
+
+	the largest tables go first: otherwise one worker can be left building the index for a giant while
+	everyone else is done
+
+	:param workcategoryprefix:
+	:param authoruids:
+	:param workercount:
 	:return:
 	"""
 	
 	print('building indices for author dbs')
-	dbconnection = setconnection()
-	cursor = dbconnection.cursor()
+	if not authoruids:
+		dbconnection = setconnection()
+		cursor = dbconnection.cursor()
+
+		query = 'SELECT universalid FROM authors WHERE universalid LIKE %s ORDER BY universalid ASC'
+		data = (workcategoryprefix+'%',)
+		cursor.execute(query, data)
+		results = resultiterator(cursor)
+		authoruids = [r[0] for r in results]
+
+		dbconnection.connectioncleanup()
+
+	if not workercount:
+		workercount = setworkercount()
 
-	query = 'SELECT universalid FROM authors WHERE universalid LIKE %s ORDER BY universalid ASC'
-	data = (workcategoryprefix+'%',)
-	cursor.execute(query, data)
-	results = resultiterator(cursor)
-	
 	manager = Manager()
-	uids = manager.list([r[0] for r in results])
+	uids = manager.list(smallestfirst(authoruids))
 	commitcount = MPCounter()
 
-	dbconnection.connectioncleanup()
 	print('\t', len(uids), 'items to index')
 
-	workerobject = GenericInserterObject(mpindexbuilder, argumentlist=[uids, commitcount])
+	workerobject = GenericInserterObject(mpindexbuilder, argumentlist=[uids, commitcount, workercount], workercount=workercount)
 	workerobject.dothework()
 
 	return
 
 
-def mpindexbuilder(universalids, commitcount, dbconnection):
+def smallestfirst(universalids: list) -> list:
+	"""
+	sort tables by their size on disk: the workers pop() from the end and so get the largest ones first
+
+	:param universalids:
+	:return:
+	"""
+
+	dbconnection = setconnection()
+	cursor = dbconnection.cursor()
+
+	query = 'SELECT relname, pg_relation_size(oid) FROM pg_class WHERE relkind = %s AND relname = ANY(%s)'
+	data = ('r', list(universalids))
+	cursor.execute(query, data)
+	sizes = dict(resultiterator(cursor))
+
+	dbconnection.connectioncleanup()
+
+	return sorted(universalids, key=lambda u: (sizes.get(u, 0), u))
+
+
+def setindexingsession(dbcursor, workercount: int):
+	"""
+	CREATE INDEX can use 'maintenance_work_mem' per session: split 'indexmemory' between the workers
+	and give each of them a share of the cores for a parallel build (where postgres can do one)
+
+	:param dbcursor:
+	:param workercount:
+	:return:
+	"""
+
+	memory = max(64, indexmemory // workercount)
+	parallelworkers = max(0, (cpu_count() or 1) // workercount - 1)
+
+	dbcursor.execute("SET maintenance_work_mem = '{m}MB'".format(m=memory))
+	dbcursor.execute('SET max_parallel_maintenance_workers = {p}'.format(p=parallelworkers))
+
+	return
+
+
+def mpindexbuilder(universalids, commitcount, workercount, dbconnection):
 	"""
 	mp aware indexing pool: helps you crank through 'em
 
@@ -320,6 +409,7 @@ def mpindexbuilder(universalids, commitcount, dbconnection):
 		dbconnection = setconnection()
 
 	dbcursor = dbconnection.cursor()
+	setindexingsession(dbcursor, workercount)
 
 	while universalids:
 		try:
@@ -352,6 +442,93 @@ def mpindexbuilder(universalids, commitcount, dbconnection):
 	return
 
 
+def finishbulkload(workcategoryprefix, workercount=None):
+	"""
+	authortablemaker() made UNLOGGED author tables without their UNIQUE index if 'bulkload' was set
+
+	add the index and turn the WAL back on for every such table: the tables are found by asking postgres which
+	ones are still unlogged, so nothing else needs to know whether a corpus was bulk loaded
+
+	:param workcategoryprefix:
+	:param workercount:
+	:return:
+	"""
+
+	if not workercount:
+		workercount = setworkercount()
+
+	dbconnection = setconnection()
+	cursor = dbconnection.cursor()
+
+	query = """
+		SELECT relname FROM pg_class 
+			WHERE relkind = 'r' AND relpersistence = 'u' AND relname LIKE %s AND length(relname) = 6 
+			ORDER BY relname ASC
+	"""
+	data = (workcategoryprefix + '%',)
+	cursor.execute(query, data)
+	results = resultiterator(cursor)
+	tables = [r[0] for r in results]
+
+	dbconnection.connectioncleanup()
+
+	if not tables:
+		return
+
+	print('\tindexing and logging {n} bulk loaded tables'.format(n=len(tables)))
+
+	start = time.time()
+
+	manager = Manager()
+	uids = manager.list(smallestfirst(tables))
+	commitcount = MPCounter()
+
+	workerobject = GenericInserterObject(mpbulkloadfinisher, argumentlist=[uids, commitcount, workercount], workercount=workercount)
+	workerobject.dothework()
+
+	print('\tbulk loaded tables indexed and logged in {t} minutes'.format(t=round((time.time() - start) / 60, 2)))
+
+	return
+
+
+def mpbulkloadfinisher(universalids, commitcount, workercount, dbconnection):
+	"""
+	mp aware: ADD UNIQUE + SET LOGGED for each table; see finishbulkload()
+
+	:param universalids:
+	:param commitcount:
+	:param workercount:
+	:param dbconnection:
+	:return:
+	"""
+
+	if not dbconnection:
+		dbconnection = setconnection()
+
+	dbcursor = dbconnection.cursor()
+	setindexingsession(dbcursor, workercount)
+
+	while universalids:
+		try:
+			universalid = universalids.pop()
+		except IndexError:
+			universalid = None
+
+		if universalid:
+			# the same index that 'index integer NOT NULL UNIQUE' would have made
+			query = 'ALTER TABLE {t} ADD UNIQUE (index)'.format(t=universalid)
+			dbcursor.execute(query)
+			query = 'ALTER TABLE {t} SET LOGGED'.format(t=universalid)
+			dbcursor.execute(query)
+			dbconnection.commit()
+
+			commitcount.increment()
+			if commitcount.value % 250 == 0:
+				print('\t', commitcount.value, 'tables logged')
+
+	return
+
+
 def noblankauthorcolumns():
 	print('\tno empty locations or genres in the author tables')
 	dbconnection = setconnection()
@@ -413,13 +590,10 @@ def noblankworkdata():
 		q = 'CREATE TEMP TABLE tmp_works AS SELECT * FROM works LIMIT 0'
 		cursor.execute(q)
 
-		pgcopydata = ['{a}\t{b}'.format(a=w, b=defaultvals[d]) for w in works]
-
-		rawio = io.StringIO()
-		rawio.write('\n'.join(pgcopydata))
-		rawio.seek(0)
+		pgcopydata = ((w, defaultvals[d]) for w in works)
 
-		cursor.copy_from(rawio, 'tmp_works', columns=loadingcolumns)
+		columntypes = columntypesfor(loadingcolumns, workscolumntypes)
+		copyrowsintotable(cursor, 'tmp_works', loadingcolumns, pgcopydata, columntypes=columntypes)
 		dbconnection.commit()
 		q = 'UPDATE works SET {d} = tmp_works.{d} FROM tmp_works WHERE works.universalid = tmp_works.universalid'.format(d=d)
 		cursor.execute(q)
@@ -7,7 +7,6 @@
 """
 
 import configparser
-import io
 import re
 from multiprocessing import Manager
 from typing import List
@@ -17,12 +16,14 @@ import psycopg2
 from builder.builderclasses import MPCounter, dbAuthor, dbOpus
 from builder.dbinteraction.connection import setconnection
 from builder.dbinteraction.dbdataintoobjects import dbauthorandworkloader
-from builder.dbinteraction.dbhelperfunctions import authortablemaker
-from builder.dbinteraction.dbloading import generatecopystream
+from builder.dbinteraction.dbhelperfunctions import authortablemaker, storewordlists
+from builder.dbinteraction.dbloading import authortablecolumntypes, collectwordlists, insertwordlists
+from builder.dbinteraction.copystreams import columntypesfor, copyrowsintotable
 from builder.dbinteraction.genericworkerobject import GenericInserterObject
 from builder.parsers.betacodefontshifts import hmuintospans
 from builder.parsers.swappers import forceregexsafevariants
 from builder.postbuild.postbuilddating import convertdate
+from builder.postbuild.postbuildmetadata import workscolumntypes
 from builder.wordcounting.wordcounthelperfunctions import rebasedcounter
 
 """
@@ -260,14 +261,7 @@ def registernewworks(workinfodict: dict, thetable: str):
 
 	https://www.citusdata.com/blog/2017/11/08/faster-bulk-loading-in-postgresql-with-copy/
 
-	conn = psycopg2.connect(DSN)
-	curs = conn.cursor()
-
-	data = StringIO.StringIO()
-	data.write('\n'.join(['1', '2','3']))
-	data.seek(0)
-
-	curs.copy_from(data, 'my_table')
+	so the rows go in via copyrowsintotable()
 
 	:param workinfodict:
 	:param thetable:
@@ -346,13 +340,10 @@ def registernewworks(workinfodict: dict, thetable: str):
 		for k in workinfodict[w].keys():
 			if k != 'annotationsatindexvalue' and k not in nonstrings:
 				vals[tablestructure[k]] = workinfodict[w][k]
-		pgcopydata.append('\t'.join(vals))
+		pgcopydata.append(tuple(vals))
 
-	rawio = io.StringIO()
-	rawio.write('\n'.join(pgcopydata))
-	rawio.seek(0)
-
-	dbcursor.copy_from(rawio, thetable, columns=loadingcolumns)
+	columntypes = columntypesfor(loadingcolumns, workscolumntypes)
+	copyrowsintotable(dbcursor, thetable, loadingcolumns, pgcopydata, columntypes=columntypes)
 
 	dbconnection.commit()
 	dbconnection.connectioncleanup()
@@ -819,10 +810,6 @@ def insertnewworksintonewauthor(newwkuid, results, dbcursor):
 
 	newdata = generatemodifiedtuples(results, newwkuid)
 
-	separator = '\t'
-
-	newstream = generatecopystream(newdata, separator=separator)
-
 	columns = ('index',
 				'wkuniversalid',
 				'level_05_value',
@@ -837,7 +824,16 @@ def insertnewworksintonewauthor(newwkuid, results, dbcursor):
 				'hyphenated_words',
 				'annotations')
 
-	dbcursor.copy_from(newstream, db, sep=separator, columns=columns)
+	columntypes = columntypesfor(columns, authortablecolumntypes)
+
+	wordlists = list()
+	if storewordlists:
+		newdata = collectwordlists(newdata, wordlists)
+
+	copyrowsintotable(dbcursor, db, columns, newdata, columntypes=columntypes)
+
+	if storewordlists:
+		insertwordlists(dbcursor, db, wordlists)
 
 	return
 
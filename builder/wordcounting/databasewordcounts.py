@@ -7,19 +7,25 @@
 """
 
 import re
-from collections import deque
+import shutil
+from array import array
+from collections import Counter, deque
 from multiprocessing.pool import Pool
+from pathlib import Path
 from string import punctuation
 
-from builder.dbinteraction.connection import setconnection
-from builder.dbinteraction.dbdataintoobjects import generatecomprehensivesetoflineobjects, \
-	grabminimallineobjectsfromlist, loadallauthorsasobjects, loadallworksasobjects, loadallworksintoallauthors
-from builder.dbinteraction.dbloading import generatecopystream
+from builder.dbinteraction.connection import registeredconnection, setconnection
+from builder.dbinteraction.dbdataintoobjects import grabminimallineobjectsfromlist, loadallauthorsasobjects, \
+	loadallworksasobjects, loadallworksintoallauthors, makeminimallineobject
+from builder.dbinteraction.dbhelperfunctions import storewordlists, wordlisttablename
+from builder.dbinteraction.linestore import buildlinestore, linestorefile, openlinestore
 from builder.parsers.betacodeandunicodeinterconversion import buildhipparchiatranstable, cleanaccentsandvj
-from builder.parsers.regexsubstitutions import tidyupterm
+from builder.parsers.wordtokenizer import checktokenizer, indexablewords
 from builder.redisdbfunctions import buildrediswordlists, establishredisconnection, buildrediskeylists, deleterediswordlists, deleterediskeylists
-from builder.wordcounting.wordcountdbfunctions import createwordcounttable
-from builder.wordcounting.wordcounthelperfunctions import acuteforgrave, concordancemerger, grouper, unpackchainedranges
+from builder.wordcounting.wordcountdbfunctions import loadwordcounttables
+from builder.wordcounting.wordcounthelperfunctions import concordancemerger, grouper, mergeranges, monoindexerwords, \
+	unpackchainedranges
+from builder.wordcounting.wordindex import buildwordindex, openwordindex, usewordindex, wordindexconcordances
 from builder.workers import setworkercount
 
 try:
@@ -27,7 +33,6 @@ try:
 except ImportError:
 	redis = None
 
-
 def monowordcounter(restriction=None, authordict=None, workdict=None):
 	"""
 	count all of the words in all of the lines so you can find out the following re προϲώπου:
@@ -57,17 +62,16 @@ def monowordcounter(restriction=None, authordict=None, workdict=None):
 
 	dbdictwithranges = generatedbdictwithranges(idlist, workdict)
 
-	# [c] turn this into a list of lines we will need
-	# bug in convertrangedicttolineset() evident at firstpass
+	# [c] turn this into a list of the rows of the line store that we will need
 	# len(alllineobjects) 11902961
 	# len(linesweneed) 2103514
 
-	linesweneed = list(convertrangedicttolineset(dbdictwithranges))
+	linestore = openlinestore()
+	linesweneed = array('i', linestore.rowsinranges(dbdictwithranges))
 
 	# keep it simple send the work off for linear processing
-	alllineobjects = generatecomprehensivesetoflineobjects()
-	lineobjects = [alllineobjects[l] for l in linesweneed]
-	masterconcorcdance = monothreadedindexer(lineobjects, 'indexing')
+	lineobjects = (linestore.lineobject(r) for r in linesweneed)
+	masterconcorcdance = monothreadedindexer(lineobjects, 'indexing', linecount=len(linesweneed))
 
 	# [e] calculate totals
 
@@ -79,39 +83,37 @@ def monowordcounter(restriction=None, authordict=None, workdict=None):
 	return masterconcorcdance
 
 
-def monothreadedindexer(lineobjects, workername=''):
+def monothreadedindexer(lineobjects, workername='', linecount=None):
 	"""
 
 	back from the dead...
 
-
+	lineobjects can be a generator if you say how many lines it will yield
 
 	:param lineobjects:
 	:param workername:
+	:param linecount:
 	:return:
 	"""
 
+	if linecount is None:
+		linecount = len(lineobjects)
+
 	# lineobjects = [alllineobjects[l] for l in linesweneed]
 
-	graves = re.compile(r'[ὰὲὶὸὺὴὼἂἒἲὂὒἢὢᾃᾓᾣᾂᾒᾢ]')
 	# pull this out of cleanwords() so you don't waste cycles recompiling it millions of times: massive speedup
 	punct = re.compile(
 		'[%s]' % re.escape(punctuation + '\′‵’‘·“”„—†⌈⌋⌊∣⎜͙ˈͻ✳※¶§⸨⸩｟｠⟫⟪❵❴⟧⟦→◦⊚𐄂𝕔☩(«»›‹⸐„⸏⸎⸑–⏑–⏒⏓⏔⏕⏖⌐∙×⁚⁝‖⸓'))
 
-	print('indexing {n} lines'.format(n=len(lineobjects)))
+	print('indexing {n} lines'.format(n=linecount))
 
-	progresschunks = int(len(lineobjects) / 5)
+	progresschunks = max(int(linecount / 5), 1)
 
 	indexdictionary = dict()
 
 	index = 0
 	for line in lineobjects:
-		words = line.wordlist('polytonic')
-		words = [re.sub(graves, acuteforgrave, w) for w in words]
-		# most of this cleanup is already part of 'polytonic'
-		# words = [tidyupterm(w, punct) for w in words]
-		# words[:] = [x.lower() for x in words]
-		words = [re.sub('v', 'u', w) for w in words]
+		words = monoindexerwords(line)
 
 		prefix = line.universalid[0:2]
 		for w in words:
@@ -134,17 +136,406 @@ def monothreadedindexer(lineobjects, workername=''):
 		index += 1
 
 		if index % progresschunks == 0:
-			percent = round((index / len(lineobjects)) * 100, 1)
-			print('\t{w} progress: {n}% ({a}/{b})'.format(w=workername, n=percent, a=index, b=len(lineobjects)))
+			percent = round((index / linecount) * 100, 1)
+			print('\t{w} progress: {n}% ({a}/{b})'.format(w=workername, n=percent, a=index, b=linecount))
 
 	return indexdictionary
 
 
+def mapreducewordcounter(restriction=None, authordict=None, workdict=None, workercount=None):
+	"""
+
+	count all of the words in all of the lines just as monowordcounter() does; but in parallel
+
+	mpwordcounter() could not do this: it dealt out individual lines and concordancemerger() then kept only the
+	first corpus it found in each partial result; the counts changed with the number of workers
+
+	here:
+		[a] whole tables are dealt out to the workers: see shardtables()
+		[b] each worker streams its tables out of the db and counts (word, prefix) pairs: see countwordsintables()
+		[c] the partial counts are added up in the order of the shards and only then turned into a concordance
+
+	see checkwordcounters() to confirm that this matches monowordcounter()
+
+	if 'wordindex' is set, the counts are sums over the posting lists of the word index instead: see wordindex.py
+
+	:param restriction:
+	:param authordict:
+	:param workdict:
+	:param workercount:
+	:return:
+	"""
+
+	wordcounttable = 'wordcounts'
+
+	if not authordict:
+		print('loading information about authors and works')
+		authordict = loadallauthorsasobjects()
+		workdict = loadallworksasobjects()
+		authordict = loadallworksintoallauthors(authordict, workdict)
+
+	# [a] figure out which works we are looking for
+	idlist = generatesearchidlist(restriction, authordict, workdict)
+
+	if usewordindex and not restriction:
+		# [b+c] the index already has the totals for every table
+		masterconcorcdance = openwordindex().concordance()
+	else:
+		# [b] figure out what table index values we will need to assemble them: {tableid1: range1, tableid2: range2, ...}
+		dbdictwithranges = generatedbdictwithranges(idlist, workdict)
+		# [c] count
+		if usewordindex:
+			masterconcorcdance = wordindexconcordances({'restriction': dbdictwithranges}, workercount)['restriction']
+		else:
+			masterconcorcdance = mapreduceconcordance(dbdictwithranges, workercount)
+
+	# [d] totals are needed both initially and in the subsearches
+	masterconcorcdance = calculatetotals(masterconcorcdance)
+
+	# [e] build the tables if needed
+	if not restriction:
+		generatewordcounttablesonfirstpass(wordcounttable, masterconcorcdance)
+
+	return masterconcorcdance
+
+
+def mapreduceconcordance(dbdictwithranges: dict, workercount=None) -> dict:
+	"""
+
+	{tableid1: [range1.1, range1.2], ...} ==> {'WORD': {'gr': 1, 'lt': 2}, ...}
+
+	:param dbdictwithranges:
+	:param workercount:
+	:return:
+	"""
+
+	if not workercount:
+		workercount = setworkercount()
+
+	shards = shardtables(dbdictwithranges, workercount)
+
+	print('counting the words in {t} tables with {w} workers'.format(t=len(dbdictwithranges), w=len(shards)))
+
+	with Pool(processes=workercount) as pool:
+		# map() hands back the results in the order of the shards however the workers happen to finish
+		partialcounts = pool.map(countwordsintables, shards)
+
+	print('\tmerging the partial results')
+	wordcounts = Counter()
+	for p in partialcounts:
+		wordcounts.update(p)
+
+	masterconcorcdance = dict()
+	for (word, prefix) in sorted(wordcounts):
+		try:
+			masterconcorcdance[word][prefix] = wordcounts[(word, prefix)]
+		except KeyError:
+			masterconcorcdance[word] = {prefix: wordcounts[(word, prefix)]}
+
+	return masterconcorcdance
+
+
+def shardtables(dbdictwithranges: dict, shardcount: int) -> list:
+	"""
+
+	deal out the tables (and the line ranges we want from them) so that every shard has about the same number of lines
+
+	biggest table first, always to the shard with the fewest lines so far; ties go to the lower shard number
+
+	[[('gr2062', [(1, 178092)]), ...], [('gr0057', [(1, 112034)]), ('lt0474', [(1, 44370)]), ...], ...]
+
+	:param dbdictwithranges:
+	:param shardcount:
+	:return:
+	"""
+
+	tables = [(t, mergeranges(dbdictwithranges[t])) for t in sorted(dbdictwithranges)]
+	sizes = {t: sum(last - first + 1 for first, last in r) for t, r in tables}
+	tables.sort(key=lambda t: sizes[t[0]], reverse=True)
+
+	shards = [list() for _ in range(max(shardcount, 1))]
+	loads = [0 for _ in shards]
+	for t in tables:
+		lightest = loads.index(min(loads))
+		shards[lightest].append(t)
+		loads[lightest] += sizes[t[0]]
+
+	return [s for s in shards if s]
+
+
+def facetedwordcounter(facets: dict, authordict=None, workdict=None, workercount=None) -> dict:
+	"""
+
+	one scan of the tables; one concordance for each facet
+
+	facets are restrictions of the sort that mapreducewordcounter() takes:
+
+		{'early': {'time': (-850, -300)}, 'middle': {'time': (-299, 300)}, 'Acta': {'genre': 'Acta'}, ...}
+
+	the result is the same as running mapreducewordcounter() once per facet:
+
+		{'early': {'WORD': {'gr': 1, 'lt': 2, 'in': 3, 'dp': 4, 'ch': 5, 'total': 15}, ...}, 'middle': {...}, ...}
+
+	but every line is fetched and split into words only once: each word is then counted once for every facet whose
+	restriction would have included its line
+
+	if 'wordindex' is set, no line is fetched at all: every facet is a sum over the posting lists
+
+	:param facets:
+	:param authordict:
+	:param workdict:
+	:param workercount:
+	:return:
+	"""
+
+	if not authordict:
+		print('loading information about authors and works')
+		authordict = loadallauthorsasobjects()
+		workdict = loadallworksasobjects()
+		authordict = loadallworksintoallauthors(authordict, workdict)
+
+	if not workercount:
+		workercount = setworkercount()
+
+	facetids = {f: generatesearchidlist(facets[f], authordict, workdict) for f in facets}
+
+	if usewordindex:
+		facetranges = {f: generatedbdictwithranges(facetids[f], workdict) for f in facets}
+		concordances = wordindexconcordances(facetranges, workercount)
+		for f in concordances:
+			concordances[f] = calculatetotals(concordances[f])
+		return concordances
+
+	# {'gr0001': ['early'], 'gr0001w002': ['middle', 'Epic.'], ...}
+	linefacets = dict()
+	for f in facets:
+		for universalid in facetids[f]:
+			try:
+				linefacets[universalid].append(f)
+			except KeyError:
+				linefacets[universalid] = [f]
+
+	tables = sorted({universalid[0:6] for universalid in linefacets})
+	dbdictwithranges = generatedbdictwithranges(tables, workdict)
+	shards = shardtables(dbdictwithranges, workercount)
+
+	print('counting the words of {f} facets in {t} tables with {w} workers'.format(f=len(facets), t=len(tables), w=len(shards)))
+
+	with Pool(processes=workercount) as pool:
+		partialcounts = pool.starmap(countwordsintables, [(s, linefacets) for s in shards])
+
+	print('\tmerging the partial results')
+	wordcounts = Counter()
+	for p in partialcounts:
+		wordcounts.update(p)
+
+	concordances = {f: dict() for f in facets}
+	for (facet, word, prefix) in sorted(wordcounts):
+		try:
+			concordances[facet][word][prefix] = wordcounts[(facet, word, prefix)]
+		except KeyError:
+			concordances[facet][word] = {prefix: wordcounts[(facet, word, prefix)]}
+
+	for f in concordances:
+		concordances[f] = calculatetotals(concordances[f])
+
+	return concordances
+
+
+def countwordsintables(shard: list, linefacets=None) -> Counter:
+	"""
+
+	count the (word, prefix) pairs in a shard of tables
+
+	or, if there are linefacets, the (facet, word, prefix) triples: a line belongs to every facet listed for its work
+	and for its author; see facetedwordcounter()
+
+	the lines come through a server-side cursor: a worker never has more than 'itersize' of them in memory
+
+	if the tables have word lists (see wordlisttablemaker()) the words are read from those instead of being found
+	all over again; and without linefacets postgres can do all of the counting itself
+
+	:param shard:
+	:param linefacets:
+	:return:
+	"""
+
+	dbconnection = registeredconnection()
+	# a named cursor needs a transaction
+	dbconnection.setdefaultisolation()
+
+	q = 'SELECT index, wkuniversalid, accented_line FROM {t} WHERE index BETWEEN %s AND %s'
+	wlq = 'SELECT index, wkuniversalid, words FROM {t} WHERE index BETWEEN %s AND %s'
+	sumq = """
+		SELECT w, count(*) FROM {t}, unnest(string_to_array(words, ' ')) AS w
+			WHERE index BETWEEN %s AND %s GROUP BY w
+	"""
+
+	wordcounts = Counter()
+	facetsofwork = dict()
+	for table, ranges in shard:
+		haswordlists = storewordlists and haswordlisttable(table, dbconnection)
+		for first, last in ranges:
+			if haswordlists and linefacets is None:
+				dbcursor = dbconnection.cursor()
+				dbcursor.execute(sumq.format(t=wordlisttablename(table)), (first, last))
+				prefix = table[0:2]
+				wordcounts.update({(w, prefix): c for w, c in dbcursor.fetchall()})
+				continue
+			dbcursor = dbconnection.dbconnection.cursor(name='wordcounter')
+			dbcursor.itersize = 5000
+			if haswordlists:
+				dbcursor.execute(wlq.format(t=wordlisttablename(table)), (first, last))
+			else:
+				dbcursor.execute(q.format(t=table), (first, last))
+			for index, wkuniversalid, text in dbcursor:
+				prefix = wkuniversalid[0:2]
+				if linefacets is not None:
+					wk = wkuniversalid[0:10]
+					try:
+						facets = facetsofwork[wk]
+					except KeyError:
+						facets = set(linefacets.get(wk, list()))
+						facets.update(linefacets.get(wk[0:6], list()))
+						facets = sorted(facets)
+						facetsofwork[wk] = facets
+					if not facets:
+						continue
+				if haswordlists:
+					words = text.split(' ')
+				else:
+					words = monoindexerwords(makeminimallineobject(index, wkuniversalid, text or str()))
+				if linefacets is None:
+					wordcounts.update((w, prefix) for w in words)
+				else:
+					wordcounts.update((f, w, prefix) for f in facets for w in words)
+			dbcursor.close()
+
+	dbconnection.connectioncleanup()
+
+	return wordcounts
+
+
+def haswordlisttable(table: str, dbconnection) -> bool:
+	dbcursor = dbconnection.cursor()
+	q = 'SELECT to_regclass(%s)'
+	d = ('public.' + wordlisttablename(table),)
+	dbcursor.execute(q, d)
+	return dbcursor.fetchone()[0] is not None
+
+
+def checkwordcounters(sampletables=25, workercounts=(1, 2, 3, 5, 8)) -> bool:
+	"""
+
+	do mapreducewordcounter(), the word index, and monowordcounter() agree?
+
+	count a sample of the author tables both ways: once just as monowordcounter() does it and then with
+	mapreducewordcounter()'s machinery and each of the workercounts; then build a word index of the sample and sum
+	its posting lists for the whole sample and for every other work of the sample
+
+	'makecorpora.py --checkwordcounts' runs this
+
+	:param sampletables:
+	:param workercounts:
+	:return:
+	"""
+
+	authors = sorted(loadallauthorsasobjects().keys())
+	step = max(int(len(authors) / sampletables), 1)
+	sample = authors[::step][:sampletables]
+
+	print('comparing the wordcounters on {n} tables: {t}'.format(n=len(sample), t=', '.join(sample)))
+
+	dbdictwithranges = generatedbdictwithranges(sample, dict())
+
+	samplestorefile = linestorefile + '.sample'
+	linestore = buildlinestore(samplestorefile, tables=sample)
+	linesweneed = array('i', linestore.rowsinranges(dbdictwithranges))
+	lineobjects = (linestore.lineobject(r) for r in linesweneed)
+	expected = calculatetotals(monothreadedindexer(lineobjects, 'monowordcounter', linecount=len(linesweneed)))
+
+	# every other work of the sample: the word index has to pull single lines out of partially covered tables
+	sampleworks = sorted({linestore.works[w] for w in linestore.workids})[::2]
+	workranges = dict()
+	for r in linestore.rowsinranges(dbdictwithranges):
+		if linestore.works[linestore.workids[r]] in sampleworks:
+			table = linestore.tables[linestore.tableids[r]]
+			try:
+				workranges[table].append(range(linestore.indexes[r], linestore.indexes[r] + 1))
+			except KeyError:
+				workranges[table] = [range(linestore.indexes[r], linestore.indexes[r] + 1)]
+	workrows = array('i', linestore.rowsinranges(workranges))
+	lineobjects = (linestore.lineobject(r) for r in workrows)
+	expectedworks = calculatetotals(monothreadedindexer(lineobjects, 'monowordcounter', linecount=len(workrows)))
+
+	sampleindexdir = linestorefile + '.sampleindex/'
+	sampleindex = buildwordindex(sampleindexdir, linestore=linestore)
+	linestore.close()
+	Path(samplestorefile).unlink()
+
+	counters = [('{w} workers'.format(w=w), expected, lambda w=w: mapreduceconcordance(dbdictwithranges, w)) for w in workercounts]
+	counters.append(('the word index', expected, sampleindex.concordance))
+	counters.append(('the word index (every other work)', expectedworks,
+	                 lambda: wordindexconcordances({'works': workranges}, wordindex=sampleindex)['works']))
+
+	allagree = True
+	for label, mono, counter in counters:
+		found = calculatetotals(counter())
+		if found == mono:
+			print('\t{l}: {n} words; identical counts'.format(l=label, n=len(found)))
+			continue
+		allagree = False
+		differences = sorted(x for x in set(found).union(mono) if found.get(x) != mono.get(x))
+		print('\t{l}: {d} of {n} words differ; e.g.:'.format(l=label, d=len(differences), n=len(mono)))
+		for x in differences[:10]:
+			print('\t\t{x}\tmono: {e}\tfound: {f}'.format(x=x, e=mono.get(x), f=found.get(x)))
+
+	sampleindex.close()
+	shutil.rmtree(sampleindexdir)
+
+	return allagree
+
+
+def checktokenizers(sampletables=25, linespertable=5000) -> bool:
+	"""
+
+	do indexablewords() and regexindexablewords() agree about the lines of a sample of the author tables? how long
+	does each of them take?
+
+	'makecorpora.py --checktokenizer' runs this
+
+	:param sampletables:
+	:param linespertable:
+	:return:
+	"""
+
+	authors = sorted(loadallauthorsasobjects().keys())
+	step = max(int(len(authors) / sampletables), 1)
+	sample = authors[::step][:sampletables]
+
+	print('comparing the tokenizers on up to {n} lines from each of {t} tables'.format(n=linespertable, t=len(sample)))
+
+	dbconnection = setconnection()
+	dbcursor = dbconnection.cursor()
+
+	q = 'SELECT accented_line FROM {t} ORDER BY index LIMIT %s'
+	samplelines = list()
+	for table in sample:
+		dbcursor.execute(q.format(t=table), (linespertable,))
+		samplelines.extend([l[0] or str() for l in dbcursor.fetchall()])
+
+	dbconnection.connectioncleanup()
+
+	return checktokenizer(samplelines)
+
+
 def mpwordcounter(restriction=None, authordict=None, workdict=None):
 	"""
 
 	BROKEN: the counts will vary for common words depending on how many workers you have
 
+	use mapreducewordcounter() instead
+
 	count of δέ in Ⓖ varies as a function of the number of workers:
 
 		2	878,994
@@ -271,20 +662,6 @@ def mpbuildindexdictionary(pilenumber, workpile):
 
 	index = 0
 
-	# shadow of HipparchiaServer code
-
-	grave = 'ὰὲὶὸὺὴὼῒῢᾲῂῲἃἓἳὃὓἣὣἂἒἲὂὒἢὢ'
-	acute = 'άέίόύήώΐΰᾴῄῴἅἕἵὅὕἥὥἄἔἴὄὔἤὤ'
-	gravetoacute = str.maketrans(grave, acute)
-
-	elidedextrapunct = '\′‵‘·“”„—†⌈⌋⌊∣⎜͙ˈͻ✳※¶§⸨⸩｟｠⟫⟪❵❴⟧⟦→◦⊚𐄂𝕔☩(«»›‹⸐„⸏⸎⸑–⏑–⏒⏓⏔⏕⏖⌐∙×⁚̄⁝͜‖͡⸓͝'
-	extrapunct = elidedextrapunct + '’'
-	greekpunct = re.compile('[{s}]'.format(s=re.escape(punctuation + elidedextrapunct)))
-	latinpunct = re.compile('[{s}]'.format(s=re.escape(punctuation + extrapunct)))
-
-	minimumgreek = re.compile(
-		'[α-ωἀἁἂἃἄἅἆἇᾀᾁᾂᾃᾄᾅᾆᾇᾲᾳᾴᾶᾷᾰᾱὰάἐἑἒἓἔἕὲέἰἱἲἳἴἵἶἷὶίῐῑῒΐῖῗὀὁὂὃὄὅόὸὐὑὒὓὔὕὖὗϋῠῡῢΰῦῧύὺᾐᾑᾒᾓᾔᾕᾖᾗῂῃῄῆῇἤἢἥἣὴήἠἡἦἧὠὡὢὣὤὥὦὧᾠᾡᾢᾣᾤᾥᾦᾧῲῳῴῶῷώὼ]')
-
 	# version 1.0.0 code:
 	# graves = re.compile(r'[ὰὲὶὸὺὴὼἂἒἲὂὒἢὢᾃᾓᾣᾂᾒᾢ]')
 
@@ -297,18 +674,10 @@ def mpbuildindexdictionary(pilenumber, workpile):
 		# words = [re.sub('v', 'u', w) for w in words]
 		# prefix = line.universalid[0:2]
 
-		# shadow of HipparchiaServer code
-		polytonicwords = line.wordlist('polytonic')
-		polytonicgreekwords = [tidyupterm(w, greekpunct).lower() for w in polytonicwords if re.search(minimumgreek, w)]
-		polytoniclatinwords = [tidyupterm(w, latinpunct).lower() for w in polytonicwords if not re.search(minimumgreek, w)]
-		polytonicwords = polytonicgreekwords + polytoniclatinwords
+		# shadow of HipparchiaServer code: see wordtokenizer.py
 		# need to figure out how to grab τ’ and δ’ and the rest
 		# but you can't say that 'me' is elided in a line like 'inquam, ‘teque laudo. sed quando?’ ‘nihil ad me’ inquit ‘de'
-		unformattedwords = set(line.wordlist('marked_up_line'))
-		words = [w for w in polytonicwords if w+'’' not in unformattedwords or not re.search(minimumgreek, w)]
-		elisions = [w+"'" for w in polytonicwords if w+'’' in unformattedwords and re.search(minimumgreek, w)]
-		words.extend(elisions)
-		words = [w.translate(gravetoacute) for w in words]
+		words = indexablewords(line.polytonic, vtou=False)
 		prefix = line.universalid[0:2]
 
 		for w in words:
@@ -394,7 +763,7 @@ def generatedbdictwithranges(idlist, workdict):
 	:return:
 	"""
 
-	dbcconnection = setconnection(autocommit=True)
+	dbcconnection = registeredconnection(autocommit=True)
 	dbcursor = dbcconnection.cursor()
 
 	minq = 'SELECT index FROM {t} ORDER BY index ASC LIMIT 1'
@@ -463,31 +832,13 @@ def generatewordcounttablesonfirstpass(wordcounttable, masterconcorcdance):
 
 	print('generating fresh word count tables')
 
-	dbcconnection = setconnection()
-	dbcursor = dbcconnection.cursor()
-
 	letters = '0abcdefghijklmnopqrstuvwxyzαβψδεφγηιξκλμνοπρϲτυωχθζ'
-	for letter in letters:
-		createwordcounttable('{w}_{l}'.format(w=wordcounttable, l=letter))
-
-	columns = ('entry_name',
-				'total_count',
-				'gr_count',
-				'lt_count',
-				'dp_count',
-				'in_count',
-				'ch_count')
-
-	separator = '\t'
-
-	for letter in letters:
-		# print('\tgenerating {l}'.format(l=letter))
-		queryvalues = generatemasterconcorcdancevaluetuples(masterconcorcdance, letter)
-		stream = generatecopystream(queryvalues, separator=separator)
-		table = '{w}_{l}'.format(w=wordcounttable, l=letter)
-		dbcursor.copy_from(stream, table, sep=separator, columns=columns)
 
-	dbcconnection.connectioncleanup()
+	# one pass through the concordance instead of one per letter: see partitionmasterconcorcdance()
+	partitions = partitionmasterconcorcdance(masterconcorcdance, letters)
+	partitions = {'{w}_{l}'.format(w=wordcounttable, l=letter): partitions[letter] for letter in letters}
+
+	loadwordcounttables(partitions)
 
 	return
 
@@ -513,6 +864,52 @@ def calculatetotals(masterconcorcdance: dict) -> dict:
 	return masterconcorcdance
 
 
+def partitionmasterconcorcdance(masterconcorcdance: dict, letters: str) -> dict:
+	"""
+
+	{letter1: [valuetuple1, valuetuple2, ...], letter2: [...], ...} for every one of the wordcounts_ tables
+
+	generatemasterconcorcdancevaluetuples() does this one letter at a time: that is 52 passes through a concordance
+	of millions of words and a cleanaccentsandvj() for every one of them every time; here each word is looked at once
+	and each initial gets cleaned only the first time it is seen
+
+	the tables come out just as generatemasterconcorcdancevaluetuples() would fill them:
+		a word goes to the table of its initial once its accents are gone ('ἀγαθόϲ' ==> 'α')
+		a word whose initial is not one of the plain letters also goes to '0' ('ἀγαθόϲ' is in '0' too)
+
+	:param masterconcorcdance:
+	:param letters:
+	:return:
+	"""
+
+	transtable = buildhipparchiatranstable()
+	partitions = {letter: deque() for letter in letters}
+
+	# initial ==> the deques it goes into
+	initials = dict()
+
+	for key in masterconcorcdance:
+		# oddly it seems you cen get null keys...
+		if not key:
+			continue
+		try:
+			targets = initials[key[0]]
+		except KeyError:
+			targets = list()
+			cleaned = cleanaccentsandvj(key[0], transtable=transtable)
+			if cleaned != '0' and cleaned in partitions:
+				targets.append(partitions[cleaned])
+			if key[0] not in letters or key[0] == '0':
+				targets.append(partitions['0'])
+			initials[key[0]] = targets
+		counts = masterconcorcdance[key]
+		row = (key, counts['total'], counts['gr'], counts['lt'], counts['dp'], counts['in'], counts['ch'])
+		for t in targets:
+			t.append(row)
+
+	return partitions
+
+
 def generatemasterconcorcdancevaluetuples(masterconcorcdance: dict, letter: str):
 	"""
 
@@ -590,11 +987,11 @@ def rediswordcounter(restriction=None, authordict=None, workdict=None):
 	# len(alllineobjects) 11902961
 	# len(linesweneed) 2103514
 
-	linesweneed = list(convertrangedicttolineset(dbdictwithranges))
-	alllineobjects = generatecomprehensivesetoflineobjects()
+	linestore = openlinestore()
+	linesweneed = array('i', linestore.rowsinranges(dbdictwithranges))
 
-	print('building {n} lineobjects'.format(n=len(alllineobjects)))
-	lineobjects = [alllineobjects[l] for l in linesweneed]
+	print('building {n} lineobjects'.format(n=len(linesweneed)))
+	lineobjects = [linestore.lineobject(r) for r in linesweneed]
 	# wordlistasstring() is a tab-delim list of words as a single string
 	linedict = {l.universalid: l.wordlistasstring() for l in lineobjects}
 	buildrediswordlists(linedict)
@@ -7,12 +7,31 @@
 		(see LICENSE in the top level directory of the distribution)
 """
 
+import configparser
 import re
+from multiprocessing.pool import Pool
 
-from builder.dbinteraction.connection import setconnection
+from builder.dbinteraction.connection import forgetinheritedpools, registeredconnection, setconnection
+from builder.dbinteraction.copystreams import copyrowsintotable
+from builder.dbinteraction.dbhelperfunctions import wordlisttablename
+from builder.workers import setworkercount
 
+config = configparser.ConfigParser()
+config.read('config.ini', encoding='utf8')
 
-def createwordcounttable(tablename, extracolumns=False):
+try:
+	wordcountloaders = int(config['wordcounts']['wordcountloaders'])
+except (KeyError, ValueError):
+	wordcountloaders = 4
+
+wordcountcolumns = ('entry_name', 'total_count', 'gr_count', 'lt_count', 'dp_count', 'in_count', 'ch_count')
+wordcountcolumntypes = 'tiiiiii'
+
+# the rows of every wordcounts_ table: see startwordcountloader()
+wordcountpartitions = dict()
+
+
+def createwordcounttable(tablename, extracolumns=False, dbcursor=None, index=True):
 	"""
 	the SQL to generate the wordcount table
 
@@ -47,12 +66,21 @@ def createwordcounttable(tablename, extracolumns=False):
 			...
 			)
 
+	dbcursor: create the table inside a transaction that is already open (and that will do the commit)
+
+	index: 'False' leaves the unique index to indexwordcounttable(): better after the table has been loaded
+
 	:param tablename:
+	:param extracolumns:
+	:param dbcursor:
+	:param index:
 	:return:
 	"""
 
-	dbconnection = setconnection()
-	dbcursor = dbconnection.cursor()
+	dbconnection = None
+	if not dbcursor:
+		dbconnection = registeredconnection()
+		dbcursor = dbconnection.cursor()
 
 	query = 'DROP TABLE IF EXISTS public.{t}'.format(t=tablename)
 	dbcursor.execute(query)
@@ -93,6 +121,25 @@ def createwordcounttable(tablename, extracolumns=False):
 	query = 'GRANT SELECT ON TABLE {tn} TO hippa_rd'.format(tn=tablename)
 	dbcursor.execute(query)
 
+	if index:
+		indexwordcounttable(tablename, dbcursor)
+
+	if dbconnection:
+		dbconnection.connectioncleanup()
+
+	return
+
+
+def indexwordcounttable(tablename, dbcursor):
+	"""
+
+	the unique index on entry_name
+
+	:param tablename:
+	:param dbcursor:
+	:return:
+	"""
+
 	tableletter = tablename[-2:]
 
 	query = 'DROP INDEX IF EXISTS public.wcindex{tl}'.format(tl=tableletter, tn=tablename)
@@ -101,11 +148,83 @@ def createwordcounttable(tablename, extracolumns=False):
 	query = 'CREATE UNIQUE INDEX wcindex{tl} ON {tn} (entry_name)'.format(tl=tableletter, tn=tablename)
 	dbcursor.execute(query)
 
-	dbconnection.connectioncleanup()
+	return
+
+
+def loadwordcounttables(partitions: dict, loadercount=None):
+	"""
+
+	{'wordcounts_a': [row1, row2, ...], 'wordcounts_b': [...], ...} ==> the tables
+
+	a small pool of loaders, each with a connection of its own; the biggest tables go first so that one of them is
+	not left to load by itself at the end
+
+	every table gets created, COPY FREEZE loaded, and then indexed inside one explicit transaction (the loader turns
+	off the autocommit that setconnection() leaves on; FREEZE is only legal in the transaction that created the
+	table): building the index once after the load is cheaper than updating it row by row during the load
+
+	:param partitions:
+	:param loadercount:
+	:return:
+	"""
+
+	if not loadercount:
+		loadercount = min(wordcountloaders, setworkercount())
+
+	loadercount = max(min(loadercount, len(partitions)), 1)
+
+	tables = sorted(partitions, key=lambda t: len(partitions[t]), reverse=True)
+
+	with Pool(processes=loadercount, initializer=startwordcountloader, initargs=(partitions,)) as pool:
+		for table in pool.imap_unordered(loadwordcounttable, tables):
+			pass
+
+	return
+
+
+def startwordcountloader(partitions: dict):
+	"""
+
+	the Pool initializer for loadwordcounttables(): forked workers share the partitions instead of getting each of
+	them pickled along with every task
+
+	:param partitions:
+	:return:
+	"""
+
+	global wordcountpartitions
+
+	forgetinheritedpools()
+	wordcountpartitions = partitions
 
 	return
 
 
+def loadwordcounttable(table: str) -> str:
+	"""
+
+	create, fill, and index one of the wordcounts_ tables
+
+	:param table:
+	:return:
+	"""
+
+	dbconnection = setconnection()
+	dbcursor = dbconnection.cursor()
+
+	# setconnection() hands back an autocommit connection: the CREATE and the COPY FREEZE have to share a transaction
+	dbconnection.setdefaultisolation()
+
+	createwordcounttable(table, dbcursor=dbcursor, index=False)
+	copyrowsintotable(dbcursor, table, wordcountcolumns, wordcountpartitions[table], columntypes=wordcountcolumntypes, freeze=True)
+	indexwordcounttable(table, dbcursor)
+	dbconnection.commit()
+
+	dbconnection.connectioncleanup()
+
+	return table
+
+
 def deletetemporarydbs(temprefix):
 	"""
 
@@ -132,6 +251,8 @@ def deletetemporarydbs(temprefix):
 	for a in authors:
 		q = 'DROP TABLE public.{a}'.format(a=a)
 		dbcursor.execute(q)
+		q = 'DROP TABLE IF EXISTS public.{wl}'.format(wl=wordlisttablename(a))
+		dbcursor.execute(q)
 
 	q = 'DELETE FROM authors WHERE universalid LIKE %s'
 	d = (temprefix + '%',)
@@ -158,7 +279,7 @@ def insertchronologicalmetadata(metadatadict, thetable):
 	:return:
 	"""
 
-	dbconnection = setconnection()
+	dbconnection = registeredconnection()
 	dbcursor = dbconnection.cursor()
 
 	q = 'CREATE TEMP TABLE tmp_metadata AS SELECT * FROM {tb} LIMIT 0'.format(tb=thetable)
@@ -220,7 +341,7 @@ def insertgenremetadata(metadatadict, genrename, thetable):
 	# a clash between the stored genre names 'Alchem.' and names that are used for columns (which can't include period or whitespace)
 	thecolumn = re.sub(r'[\.\s]', '', genrename).lower()
 
-	dbconnection = setconnection()
+	dbconnection = registeredconnection()
 	dbcursor = dbconnection.cursor()
 
 	q = 'CREATE TEMP TABLE tmp_metadata AS SELECT * FROM {tb} LIMIT 0'.format(tb=thetable)
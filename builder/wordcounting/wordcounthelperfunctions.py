@@ -9,6 +9,8 @@
 import re
 from itertools import zip_longest
 
+monoindexergraves = re.compile(r'[ὰὲὶὸὺὴὼἂἒἲὂὒἢὢᾃᾓᾣᾂᾒᾢ]')
+
 
 def dictmerger(masterdict, targetdict, label):
 	"""
@@ -78,6 +80,38 @@ def acuteforgrave(matchgroup):
 	return substitute
 
 
+def monoindexerwords(line) -> list:
+	"""
+
+	the words of a line as monothreadedindexer() counts them
+
+	:param line:
+	:return:
+	"""
+
+	return countablewords(line.polytonic)
+
+
+def countablewords(polytonicline: str) -> list:
+	"""
+
+	monoindexerwords() for a bare accented_line: the loader has the line but no dbWorkLine
+
+	:param polytonicline:
+	:return:
+	"""
+
+	# dbWorkLine.wordlist('polytonic')
+	words = [w for w in re.sub(r'\xa0', ' ', polytonicline).split(' ') if w]
+	words = [re.sub(monoindexergraves, acuteforgrave, w) for w in words]
+	# most of this cleanup is already part of 'polytonic'
+	# words = [tidyupterm(w, punct) for w in words]
+	# words[:] = [x.lower() for x in words]
+	words = [re.sub('v', 'u', w) for w in words]
+
+	return words
+
+
 def cleanwords(word, punct):
 	"""
 	remove gunk that should not be in a concordance
@@ -192,6 +226,27 @@ def unpackchainedranges(chainedranges):
 	return linelist
 
 
+def mergeranges(ranges) -> list:
+	"""
+
+	[range(1, 10), range(5, 20), range(30, 31)] --> [(1, 19), (30, 30)]
+
+	i.e., the first and last line of every run of lines that the ranges cover; no line is covered twice
+
+	:param ranges:
+	:return:
+	"""
+
+	merged = list()
+	for r in sorted([r for r in ranges if r], key=lambda r: r.start):
+		if merged and r.start <= merged[-1][1] + 1:
+			merged[-1] = (merged[-1][0], max(merged[-1][1], r.stop - 1))
+		else:
+			merged.append((r.start, r.stop - 1))
+
+	return merged
+
+
 def concordancemerger(listofconcordancedicts):
 	"""
 
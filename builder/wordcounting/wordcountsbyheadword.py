@@ -7,19 +7,22 @@
 """
 
 import re
-from collections import deque
 from statistics import mean, median
 
-from builder.builderclasses import dbWordCountObject
 from builder.dbinteraction.connection import setconnection
 from builder.dbinteraction.dbdataintoobjects import graballcountsasobjects, grablemmataasobjects, \
 	loadallauthorsasobjects, loadallworksasobjects, loadallworksintoallauthors
-from builder.dbinteraction.dbloading import generatecopystream
-from builder.wordcounting.databasewordcounts import mpwordcounter
+from builder.dbinteraction.copystreams import copyrowsintotable
+from builder.wordcounting.databasewordcounts import facetedwordcounter
 from builder.wordcounting.wordcountdbfunctions import createwordcounttable, insertchronologicalmetadata, \
-	insertgenremetadata
+	insertgenremetadata, wordcountcolumns, wordcountcolumntypes
 from builder.wordcounting.wordcounthelperfunctions import prettyprintcohortdata
 
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
 """
 	75 items return from:
 		select * from works where workgenre IS NULL and universalid like 'gr%'
@@ -28,6 +31,10 @@ from builder.wordcounting.wordcounthelperfunctions import prettyprintcohortdata
 	will also add Agric. as a genre for LAT
 """
 
+eras = {'early': (-850, -300), 'middle': (-299, 300), 'late': (301, 1500)}
+
+facetcolumns = ('total', 'gr', 'lt', 'dp', 'in', 'ch')
+
 knownworkgenres = [
 	'Acta',
 	'Agric.',
@@ -134,10 +141,13 @@ def headwordcounts():
 	countobjectlist = list()
 	for l in letters:
 		countobjectlist.extend(graballcountsasobjects('wordcounts_' + l, dbcursor))
-	countdict = {word.entryname: word for word in countobjectlist}
+	observed = {word.entryname: (word.t, word.g, word.l, word.d, word.i, word.c) for word in countobjectlist}
 	del countobjectlist
 
-	dictionarycounts = buildcountsfromlemmalist(lemmataobjectslist, countdict)
+	# the forms of every lemma get looked up once; every pass below reuses the result
+	formindex = LemmaFormIndex(lemmataobjectslist)
+	dictionarycounts = formindex.headwordcounts(observed)
+	del observed
 
 	cleanedknownworkgenres = [g.lower() for g in knownworkgenres]
 	cleanedknownworkgenres = [re.sub(r'[\.\s]', '', g) for g in cleanedknownworkgenres]
@@ -147,23 +157,10 @@ def headwordcounts():
 
 	# note that entries are stored under their 'analysis name' ('ἀμφί-λαμβάνω', etc.) and not their LSJ name
 
-	columns = ('entry_name',
-				'total_count',
-				'gr_count',
-				'lt_count',
-				'dp_count',
-				'in_count',
-				'ch_count')
-
-	separator = '\t'
-
-	queryvalues = deque()
-	for word in dictionarycounts.keys():
-		t = tuple([word, dictionarycounts[word]['total'], dictionarycounts[word]['gr'], dictionarycounts[word]['lt'], dictionarycounts[word]['dp'], dictionarycounts[word]['in'], dictionarycounts[word]['ch']])
-		queryvalues.append(t)
+	queryvalues = (tuple([word, dictionarycounts[word]['total'], dictionarycounts[word]['gr'], dictionarycounts[word]['lt'], dictionarycounts[word]['dp'], dictionarycounts[word]['in'], dictionarycounts[word]['ch']])
+	               for word in dictionarycounts.keys())
 
-	stream = generatecopystream(queryvalues, separator=separator)
-	dbcursor.copy_from(stream, thetable, sep=separator, columns=columns)
+	copyrowsintotable(dbcursor, thetable, wordcountcolumns, queryvalues, columntypes=wordcountcolumntypes)
 
 	dbconnection.commit()
 
@@ -172,12 +169,14 @@ def headwordcounts():
 	# then it will call derivechronologicalmetadata() to supplement those numbers
 	# then you can call derivegenremetadata() to add still more information
 
+	# all of the era and genre counts come out of a single pass through the texts: see facetedwordcounter()
+
 	thetable = 'dictionary_headword_wordcounts'
 	metadata = derivedictionaryentrymetadata(thetable, dbcursor)
-	lemmataobjectslist = grablemmataasobjects('greek_lemmata', dbcursor) + grablemmataasobjects('latin_lemmata', dbcursor)
-	metadata = derivechronologicalmetadata(metadata, lemmataobjectslist)
+	facetconcordances = countallfacets(knownworkgenres)
+	metadata = derivechronologicalmetadata(metadata, lemmataobjectslist, facetconcordances, formindex)
 	metadata = insertchronologicalmetadata(metadata, thetable)
-	metadata = derivegenremetadata(metadata, lemmataobjectslist, thetable, knownworkgenres)
+	metadata = derivegenremetadata(metadata, lemmataobjectslist, thetable, knownworkgenres, facetconcordances, formindex)
 
 	# print('ἅρπαξ',metadata['ἅρπαξ'])
 	# ἅρπαξ {'frequency_classification': 'core vocabulary (more than 50)', 'early': 42, 'middle': 113, 'late': 468}
@@ -188,7 +187,159 @@ def headwordcounts():
 	return metadata
 
 
-def buildcountsfromlemmalist(lemmataobjectslist, wordcountdict):
+def countallfacets(genres: list) -> dict:
+	"""
+
+	the concordance of every era and of every genre: {'early': {...}, 'middle': {...}, 'late': {...}, 'Acta': {...}, ...}
+
+	these used to be 3 + 70-odd separate passes through every line of every text
+
+	:param genres:
+	:return:
+	"""
+
+	facets = {era: {'time': eras[era]} for era in eras}
+	facets.update({genre: {'genre': genre} for genre in genres})
+
+	authordict = loadallauthorsasobjects()
+	workdict = loadallworksasobjects()
+	authordict = loadallworksintoallauthors(authordict, workdict)
+
+	return facetedwordcounter(facets, authordict=authordict, workdict=workdict)
+
+
+class LemmaFormIndex(object):
+	"""
+
+	every form of every lemma compiled once into numbers:
+
+		formnumbers     {form: n}: the row of that form in the counts
+		entries         the dictionary entries in the order that buildcountsfromlemmalist() always returned them
+		forms           the form numbers of every entry, one entry after another
+		bounds          the forms of entry n are forms[bounds[n]:bounds[n+1]]
+
+	that is a (lemma x form) sparse matrix of 1s; the headword counts are that matrix times a (form x facet) matrix
+	of observed counts
+
+	a form that is on the list twice gets counted twice; an entry that appears twice gets the forms of its last
+	lemma: both as buildcountsfromlemmalist() always did
+
+	no numpy: the same sums get done in python
+
+	"""
+
+	def __init__(self, lemmataobjectslist):
+		self.formnumbers = dict()
+		entryforms = dict()
+		for lem in lemmataobjectslist:
+			numbers = list()
+			for form in lem.formlist:
+				try:
+					numbers.append(self.formnumbers[form])
+				except KeyError:
+					self.formnumbers[form] = len(self.formnumbers)
+					numbers.append(self.formnumbers[form])
+			entryforms[lem.dictionaryentry] = numbers
+
+		self.entries = list(entryforms.keys())
+		self.formlists = list(entryforms.values())
+
+		bounds = [0]
+		for numbers in self.formlists:
+			bounds.append(bounds[-1] + len(numbers))
+
+		if numpy:
+			self.forms = numpy.fromiter((n for numbers in self.formlists for n in numbers), dtype=numpy.int64, count=bounds[-1])
+			self.bounds = numpy.array(bounds, dtype=numpy.int64)
+			self.formlists = None
+
+	def observedcounts(self, observed: dict, columns=1):
+		"""
+
+		{form: (count1, count2, ...)} ==> a (form x column) table of counts; 0 for a form nobody used
+
+		words that are not the form of any lemma are ignored
+
+		:param observed:
+		:param columns:
+		:return:
+		"""
+
+		rows = list()
+		values = list()
+		for word in observed:
+			try:
+				rows.append(self.formnumbers[word])
+			except KeyError:
+				continue
+			values.append(observed[word])
+
+		if numpy:
+			counts = numpy.zeros((len(self.formnumbers), columns), dtype=numpy.int64)
+			if rows:
+				counts[numpy.array(rows, dtype=numpy.int64)] = numpy.array(values, dtype=numpy.int64).reshape(len(rows), columns)
+		else:
+			counts = [(0,) * columns] * len(self.formnumbers)
+			for r, v in zip(rows, values):
+				counts[r] = tuple(v)
+
+		return counts
+
+	def headwordtotals(self, counts, columns=1) -> list:
+		"""
+
+		the (lemma x form) matrix times the (form x column) counts: one row of totals per entry
+
+		numpy: gather the rows of every entry's forms, take running sums down the columns, and then every entry is the
+		running sum at its end minus the running sum at its start (empty form lists included)
+
+		:param counts:
+		:param columns:
+		:return:
+		"""
+
+		if numpy:
+			gathered = counts[self.forms]
+			runningsums = numpy.zeros((len(self.forms) + 1, columns), dtype=numpy.int64)
+			numpy.cumsum(gathered, axis=0, out=runningsums[1:])
+			totals = runningsums[self.bounds[1:]] - runningsums[self.bounds[:-1]]
+			return totals.tolist()
+
+		totals = list()
+		for numbers in self.formlists:
+			totals.append([sum(counts[n][c] for n in numbers) for c in range(columns)])
+
+		return totals
+
+	def headwordcounts(self, observed: dict, columns=facetcolumns) -> dict:
+		"""
+
+		{form: (total, gr, lt, dp, in, ch)} ==> {entry: {'total': n, 'gr': n, ...}}
+
+		:param observed:
+		:param columns:
+		:return:
+		"""
+
+		totals = self.headwordtotals(self.observedcounts(observed, len(columns)), len(columns))
+
+		return {entry: dict(zip(columns, row)) for entry, row in zip(self.entries, totals)}
+
+	def concordancetotals(self, concordance: dict) -> dict:
+		"""
+
+		a concordance as calculatetotals() returns it ==> {entry: total}
+
+		:param concordance:
+		:return:
+		"""
+
+		totals = self.headwordtotals(self.observedcounts({w: (concordance[w]['total'],) for w in concordance}))
+
+		return {entry: row[0] for entry, row in zip(self.entries, totals)}
+
+
+def buildcountsfromlemmalist(lemmataobjectslist, wordcountdict, formindex=None):
 	"""
 
 	given a list of lemmata objects, build a dictionary of statistics
@@ -203,10 +354,18 @@ def buildcountsfromlemmalist(lemmataobjectslist, wordcountdict):
 	countdict['euulgato'].t
 	1
 
+	headwordcounts() compiles a LemmaFormIndex once and reuses it: see LemmaFormIndex.headwordcounts()
+
 	:param lemmataobjectslist:
+	:param wordcountdict:
+	:param formindex:
 	:return:
 	"""
 
+	if formindex:
+		observed = {w: tuple(wordcountdict[w].getelement(item) for item in facetcolumns) for w in wordcountdict}
+		return formindex.headwordcounts(observed)
+
 	lexiconentrycounts = dict()
 
 	for lem in lemmataobjectslist:
@@ -295,7 +454,7 @@ def derivedictionaryentrymetadata(headwordtable, cursor):
 	return metadata
 
 
-def derivechronologicalmetadata(metadata, lemmataobjectlist, authordict=None):
+def derivechronologicalmetadata(metadata, lemmataobjectlist, facetconcordances=None, formindex=None):
 	"""
 
 	find frequencies by eras:
@@ -313,38 +472,32 @@ def derivechronologicalmetadata(metadata, lemmataobjectlist, authordict=None):
 			           392 |               3069 |             1061
 
 	:param metadata:
+	:param lemmataobjectlist:
+	:param facetconcordances:
+	:param formindex:
 	:return:
 	"""
 
-	eras = {'early': (-850, -300), 'middle': (-299, 300), 'late': (301, 1500)}
+	if not facetconcordances:
+		facetconcordances = countallfacets(list())
 
-	if not authordict:
-		authordict = loadallauthorsasobjects()
-		workdict = loadallworksasobjects()
-		authordict = loadallworksintoallauthors(authordict, workdict)
+	if not formindex:
+		formindex = LemmaFormIndex(lemmataobjectlist)
 
 	for era in eras:
 		print('calculating use by era:', era)
-		eraconcordance = mpwordcounter(restriction={'time': eras[era]}, authordict=authordict, workdict=workdict)
-		# close, but we need to match the template above:
-		# countdict = {word.entryname: word for word in countobjectlist}
-		countobjectlist = [
-			dbWordCountObject(w, eraconcordance[w]['total'], eraconcordance[w]['gr'], eraconcordance[w]['lt'],
-			                  eraconcordance[w]['dp'], eraconcordance[w]['in'], eraconcordance[w]['ch']) for w in
-			eraconcordance]
-		countdict = {word.entryname: word for word in countobjectlist}
-		lexiconentrycounts = buildcountsfromlemmalist(lemmataobjectlist, countdict)
+		lexiconentrycounts = formindex.concordancetotals(facetconcordances[era])
 		for entry in lexiconentrycounts:
 			try:
 				metadata[entry]
 			except KeyError:
 				metadata[entry] = dict()
-			metadata[entry][era] = lexiconentrycounts[entry]['total']
+			metadata[entry][era] = lexiconentrycounts[entry]
 
 	return metadata
 
 
-def derivegenremetadata(metadata, lemmataobjectlist, thetable, knownworkgenres):
+def derivegenremetadata(metadata, lemmataobjectlist, thetable, knownworkgenres, facetconcordances=None, formindex=None):
 	"""
 
 	can/should do 'Inscr.' separately? It's just the sum of 'in' + 'ch'
@@ -365,28 +518,29 @@ def derivegenremetadata(metadata, lemmataobjectlist, thetable, knownworkgenres):
 		(1 row)
 
 	:param metadata:
-	:param cursor:
+	:param lemmataobjectlist:
+	:param thetable:
+	:param knownworkgenres:
+	:param facetconcordances:
+	:param formindex:
 	:return:
 	"""
 
-	authordict = loadallauthorsasobjects()
-	workdict = loadallworksasobjects()
+	if not facetconcordances:
+		facetconcordances = countallfacets(knownworkgenres)
+
+	if not formindex:
+		formindex = LemmaFormIndex(lemmataobjectlist)
 
 	for genre in knownworkgenres:
 		print('compiling metadata for', genre)
-		genrecordance = mpwordcounter(restriction={'genre': genre}, authordict=authordict, workdict=workdict)
-		countobjectlist = [
-			dbWordCountObject(w, genrecordance[w]['total'], genrecordance[w]['gr'], genrecordance[w]['lt'],
-			                  genrecordance[w]['dp'], genrecordance[w]['in'], genrecordance[w]['ch']) for w in
-			genrecordance]
-		countdict = {word.entryname: word for word in countobjectlist}
-		lexiconentrycounts = buildcountsfromlemmalist(lemmataobjectlist, countdict)
+		lexiconentrycounts = formindex.concordancetotals(facetconcordances[genre])
 		for entry in lexiconentrycounts:
 			try:
 				metadata[entry]
 			except KeyError:
 				metadata[entry] = dict()
-			metadata[entry][genre] = lexiconentrycounts[entry]['total']
+			metadata[entry][genre] = lexiconentrycounts[entry]
 		print('\tinserting metadata for', genre)
 		insertgenremetadata(metadata, genre, thetable)
 
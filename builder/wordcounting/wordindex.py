@@ -0,0 +1,575 @@
+# -*- coding: utf-8 -*-
+"""
+	HipparchiaBuilder: compile a database of Greek and Latin texts
+	Copyright: E Gunderson 2016-23
+	License: GNU GENERAL PUBLIC LICENSE 3
+		(see LICENSE in the top level directory of the distribution)
+"""
+
+import configparser
+import json
+import mmap
+import os
+import shutil
+import sys
+from array import array
+from bisect import bisect_right
+from multiprocessing.pool import Pool
+from pathlib import Path
+from typing import Generator
+
+from builder.dbinteraction.connection import setconnection
+from builder.dbinteraction.linestore import LineStore, openlinestore
+from builder.dbinteraction.versioning import fetchauthorbuildrecords
+from builder.wordcounting.wordcounthelperfunctions import mergeranges, monoindexerwords
+from builder.workers import setworkercount
+
+config = configparser.ConfigParser()
+config.read('config.ini', encoding='utf8')
+
+try:
+	wordindexdir = config['io']['wordindexdir']
+except KeyError:
+	wordindexdir = config['io']['outputdir'] + 'wordindex/'
+
+try:
+	wi = config['buildoptions']['wordindex']
+except KeyError:
+	wi = 'n'
+
+if wi == 'y':
+	usewordindex = True
+else:
+	usewordindex = False
+
+"""
+	an inverted index of every word of every line: the wordcounts become sums over posting lists instead of yet
+	another pass through 11.9M lines
+
+	the words are the words that monoindexerwords() finds; one posting per occurrence
+
+	the posting list of a word is a run of blocks, one for each table the word appears in:
+
+		varint      the table id minus the table id of the previous block (the first block: the table id + 1)
+		varint      how many postings are in the block
+		varint      how many bytes the postings take up
+		varints     the line indexes: each one minus the one before it (the first one: the index itself)
+
+	the blocks make the restricted counts cheap: a table that a restriction does not touch is skipped without reading
+	its postings; a table that a restriction covers completely just adds the posting count
+
+	the files in the index directory:
+
+		header.json     the tables, their first and last line index, the prefixes, and the builderauthorrecords
+		                that were current when the index was built
+		words.txt       the words, sorted, one per line: word n is the nth line
+		offsets.bin     int64: the posting list of word n is postings.bin[offsets[n]:offsets[n+1]]
+		counts.bin      int64: counts[n * len(prefixes) + p] is how often word n appears in tables with prefix p
+		postings.bin    every posting list, one after another
+"""
+
+# the index that this run already opened: see openwordindex()
+currentwordindex = None
+
+
+def appendvarint(value: int, buffer: bytearray):
+	while value > 127:
+		buffer.append((value & 127) | 128)
+		value >>= 7
+	buffer.append(value)
+	return
+
+
+def readvarint(data: bytes, position: int) -> tuple:
+	value = 0
+	shift = 0
+	while True:
+		byte = data[position]
+		position += 1
+		value |= (byte & 127) << shift
+		if byte < 128:
+			return value, position
+		shift += 7
+
+
+def varintbytes(value: int) -> bytes:
+	buffer = bytearray()
+	appendvarint(value, buffer)
+	return bytes(buffer)
+
+
+class WordIndex(object):
+	"""
+
+	read-only access to a directory written by buildwordindex()
+
+	"""
+
+	def __init__(self, dirname: str):
+		self.dirname = dirname
+
+		with open(dirname + 'header.json', encoding='utf-8') as f:
+			header = json.load(f)
+		assert header['byteorder'] == sys.byteorder, '{d} was built on a machine with a different byte order'.format(d=dirname)
+
+		self.tables = header['tables']
+		self.tablebounds = header['tablebounds']
+		self.prefixes = header['prefixes']
+		self.buildrecords = header['buildrecords']
+		self.tablenumbers = {t: n for n, t in enumerate(self.tables)}
+		self.tableprefixes = [self.prefixes.index(t[0:2]) for t in self.tables]
+
+		with open(dirname + 'words.txt', encoding='utf-8') as f:
+			self.words = f.read().split('\n')
+		if self.words == ['']:
+			self.words = list()
+		self.wordnumbers = {w: n for n, w in enumerate(self.words)}
+
+		self.offsets = array('q')
+		self.counts = array('q')
+		for column, filename in [(self.offsets, 'offsets.bin'), (self.counts, 'counts.bin')]:
+			with open(dirname + filename, 'rb') as f:
+				column.frombytes(f.read())
+
+		if self.offsets[-1]:
+			with open(dirname + 'postings.bin', 'rb') as f:
+				self.postings = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		else:
+			# mmap() refuses an empty file
+			self.postings = bytes()
+
+	def __len__(self):
+		return len(self.words)
+
+	def __contains__(self, word):
+		return word in self.wordnumbers
+
+	def wordcount(self, word: str) -> dict:
+		"""
+
+		'δέ' ==> {'gr': 1611529, 'in': 3032, ...}
+
+		:param word:
+		:return:
+		"""
+
+		try:
+			n = self.wordnumbers[word]
+		except KeyError:
+			return dict()
+
+		return self.countsof(n)
+
+	def countsof(self, n: int) -> dict:
+		width = len(self.prefixes)
+		counts = self.counts[n * width:(n + 1) * width]
+		return {p: c for p, c in zip(self.prefixes, counts) if c}
+
+	def postinglist(self, word: str) -> Generator[tuple, None, None]:
+		"""
+
+		every (table, index) where the word appears; a line that has the word twice is there twice
+
+		:param word:
+		:return:
+		"""
+
+		try:
+			n = self.wordnumbers[word]
+		except KeyError:
+			return
+
+		data = self.postings[self.offsets[n]:self.offsets[n + 1]]
+		position = 0
+		tableid = -1
+		while position < len(data):
+			delta, position = readvarint(data, position)
+			tableid += delta
+			count, position = readvarint(data, position)
+			length, position = readvarint(data, position)
+			index = 0
+			for _ in range(count):
+				delta, position = readvarint(data, position)
+				index += delta
+				yield self.tables[tableid], index
+
+	def concordance(self) -> dict:
+		"""
+
+		every word in every table: {'WORD': {'gr': 1, 'lt': 2}, ...}
+
+		this is what mapreduceconcordance() finds when it is given every line of every table; but it is read
+		straight out of counts.bin
+
+		:return:
+		"""
+
+		return {w: self.countsof(n) for n, w in enumerate(self.words)}
+
+	def tableplan(self, facetranges: dict) -> dict:
+		"""
+
+		{facet: {tableid1: [range1.1, range1.2], ...}, ...} ==> {tablenumber: [(facetnumber, full, firsts, lasts), ...]}
+
+		'full': the ranges cover the whole table
+
+		'firsts' and 'lasts': the first and last line of every run of lines that the ranges cover
+
+		:param facetranges:
+		:return:
+		"""
+
+		plan = dict()
+		for f, facet in enumerate(facetranges):
+			for table in facetranges[facet]:
+				try:
+					t = self.tablenumbers[table]
+				except KeyError:
+					continue
+				if not self.tablebounds[t]:
+					continue
+				merged = mergeranges(facetranges[facet][table])
+				if not merged:
+					continue
+				first, last = self.tablebounds[t]
+				full = any(m[0] <= first and m[1] >= last for m in merged)
+				item = (f, full, [m[0] for m in merged], [m[1] for m in merged])
+				try:
+					plan[t].append(item)
+				except KeyError:
+					plan[t] = [item]
+
+		return plan
+
+	def aggregate(self, plan: dict, facetcount: int, firstword=0, lastword=None) -> list:
+		"""
+
+		sum the posting lists of words firstword to lastword according to a tableplan()
+
+		[{'WORD': {'gr': 1, 'lt': 2}, ...}, ...]: one concordance for each facet of the plan
+
+		:param plan:
+		:param facetcount:
+		:param firstword:
+		:param lastword:
+		:return:
+		"""
+
+		if lastword is None:
+			lastword = len(self.words)
+
+		concordances = [dict() for _ in range(facetcount)]
+
+		for n in range(firstword, lastword):
+			data = self.postings[self.offsets[n]:self.offsets[n + 1]]
+			tally = dict()
+			position = 0
+			tableid = -1
+			while position < len(data):
+				delta, position = readvarint(data, position)
+				tableid += delta
+				count, position = readvarint(data, position)
+				length, position = readvarint(data, position)
+				try:
+					facets = plan[tableid]
+				except KeyError:
+					position += length
+					continue
+				prefix = self.prefixes[self.tableprefixes[tableid]]
+				indexes = None
+				if not all(full for f, full, firsts, lasts in facets):
+					indexes = list()
+					index = 0
+					stop = position + length
+					while position < stop:
+						delta, position = readvarint(data, position)
+						index += delta
+						indexes.append(index)
+				else:
+					position += length
+				for f, full, firsts, lasts in facets:
+					if full:
+						found = count
+					else:
+						found = 0
+						for i in indexes:
+							r = bisect_right(firsts, i) - 1
+							if r >= 0 and i <= lasts[r]:
+								found += 1
+					if found:
+						try:
+							tally[(f, prefix)] += found
+						except KeyError:
+							tally[(f, prefix)] = found
+			word = self.words[n]
+			for (f, prefix) in tally:
+				try:
+					concordances[f][word][prefix] = tally[(f, prefix)]
+				except KeyError:
+					concordances[f][word] = {prefix: tally[(f, prefix)]}
+
+		return concordances
+
+	def close(self):
+		if isinstance(self.postings, mmap.mmap):
+			self.postings.close()
+
+
+def buildwordindex(dirname=wordindexdir, linestore=None, workercount=None) -> WordIndex:
+	"""
+
+	index every word of every line in the line store
+
+	the tables are dealt out to the workers in runs of consecutive tables; each run comes back as a set of partial
+	posting lists that only need their first table delta fixed before they are appended to the lists of the runs
+	before it
+
+	the index is written next to the old one and only then swapped in
+
+	:param dirname:
+	:param linestore:
+	:param workercount:
+	:return:
+	"""
+
+	if not linestore:
+		linestore = openlinestore()
+
+	if not workercount:
+		workercount = setworkercount()
+
+	prefixes = sorted({t[0:2] for t in linestore.tables})
+
+	# several runs per worker so that one run full of huge authors does not leave the others idle at the end
+	runlength = max(int(len(linestore) / (workercount * 4)), 1)
+	runs = list()
+	first = 0
+	for t in range(len(linestore.tables)):
+		if linestore.tablestarts[t + 1] - linestore.tablestarts[first] >= runlength or t == len(linestore.tables) - 1:
+			runs.append((linestore.filename, prefixes, first, t))
+			first = t + 1
+
+	print('indexing the words of {n} lines in {t} tables with {w} workers'.format(n=len(linestore), t=len(linestore.tables), w=workercount))
+
+	# {word: [lasttable, [chunk1, chunk2, ...], [count1, count2, ...]], ...}
+	merged = dict()
+	with Pool(processes=workercount) as pool:
+		# imap() hands back the runs in order; each one can be merged and dropped while the others are still working
+		for partial in pool.imap(indexlinestorerun, runs):
+			for word in partial:
+				firsttable, lasttable, data, counts = partial[word]
+				try:
+					m = merged[word]
+				except KeyError:
+					merged[word] = [lasttable, [varintbytes(firsttable + 1), data], counts]
+					continue
+				m[1].append(varintbytes(firsttable - m[0]))
+				m[1].append(data)
+				m[0] = lasttable
+				m[2] = [a + b for a, b in zip(m[2], counts)]
+
+	tablebounds = list()
+	for t in range(len(linestore.tables)):
+		rows = range(linestore.tablestarts[t], linestore.tablestarts[t + 1])
+		if rows:
+			tablebounds.append((linestore.indexes[rows.start], linestore.indexes[rows.stop - 1]))
+		else:
+			tablebounds.append(None)
+
+	header = {'byteorder': sys.byteorder,
+	          'tables': linestore.tables,
+	          'tablebounds': tablebounds,
+	          'prefixes': prefixes,
+	          'buildrecords': currentbuildrecords()}
+
+	words = sorted(merged)
+	offsets = array('q', [0])
+	counts = array('q')
+
+	scratch = dirname.rstrip('/') + '.building/'
+	shutil.rmtree(scratch, ignore_errors=True)
+	Path(scratch).mkdir(parents=True)
+
+	with open(scratch + 'postings.bin', 'wb') as f:
+		for w in words:
+			for chunk in merged[w][1]:
+				f.write(chunk)
+			offsets.append(f.tell())
+			counts.extend(merged[w][2])
+			del merged[w]
+
+	with open(scratch + 'words.txt', 'w', encoding='utf-8') as f:
+		f.write('\n'.join(words))
+
+	for column, filename in [(offsets, 'offsets.bin'), (counts, 'counts.bin')]:
+		with open(scratch + filename, 'wb') as f:
+			column.tofile(f)
+
+	with open(scratch + 'header.json', 'w', encoding='utf-8') as f:
+		json.dump(header, f)
+
+	shutil.rmtree(dirname, ignore_errors=True)
+	os.rename(scratch, dirname)
+
+	print('\t{w} words; {p}MB of postings in {d}'.format(w=len(words), p=round(offsets[-1] / 1024 / 1024, 1), d=dirname))
+
+	return WordIndex(dirname)
+
+
+def indexlinestorerun(run: tuple) -> dict:
+	"""
+
+	the partial posting lists of a run of consecutive tables of the line store
+
+	{word: (firsttable, lasttable, data, counts), ...}
+
+	'data' is the posting list minus the table delta of its first block: that depends on the runs before this one
+
+	:param run:
+	:return:
+	"""
+
+	storefile, prefixes, firsttable, lasttable = run
+
+	linestore = LineStore(storefile)
+
+	postings = dict()
+	for t in range(firsttable, lasttable + 1):
+		p = prefixes.index(linestore.tables[t][0:2])
+		intable = dict()
+		for row in range(linestore.tablestarts[t], linestore.tablestarts[t + 1]):
+			index = linestore.indexes[row]
+			for w in monoindexerwords(linestore.lineobject(row)):
+				try:
+					intable[w].append(index)
+				except KeyError:
+					intable[w] = [index]
+
+		for w in intable:
+			block = bytearray()
+			previous = 0
+			for index in intable[w]:
+				appendvarint(index - previous, block)
+				previous = index
+			try:
+				entry = postings[w]
+				appendvarint(t - entry[1], entry[2])
+				entry[1] = t
+			except KeyError:
+				entry = [t, t, bytearray(), [0 for _ in prefixes]]
+				postings[w] = entry
+			appendvarint(len(intable[w]), entry[2])
+			appendvarint(len(block), entry[2])
+			entry[2] += block
+			entry[3][p] += len(intable[w])
+
+	linestore.close()
+
+	return {w: (e[0], e[1], bytes(e[2]), e[3]) for w, e in postings.items()}
+
+
+def currentbuildrecords() -> dict:
+	"""
+
+	what the index has to match in order to still be good: the tables that exist and builderauthorrecords
+
+	:return:
+	"""
+
+	dbconnection = setconnection()
+	dbcursor = dbconnection.cursor()
+	q = 'SELECT universalid FROM authors ORDER BY universalid'
+	dbcursor.execute(q)
+	tables = [a[0] for a in dbcursor.fetchall()]
+	dbconnection.connectioncleanup()
+
+	return {'tables': tables, 'records': fetchauthorbuildrecords(str())}
+
+
+def openwordindex(dirname=wordindexdir) -> WordIndex:
+	"""
+
+	the word index for this run: the one on disk if it still matches the database; otherwise a new one
+
+	:param dirname:
+	:return:
+	"""
+
+	global currentwordindex
+
+	if currentwordindex is not None:
+		return currentwordindex
+
+	try:
+		wordindex = WordIndex(dirname)
+	except (OSError, ValueError, KeyError):
+		wordindex = None
+
+	if wordindex and wordindex.buildrecords != currentbuildrecords():
+		print('the word index in {d} is out of date'.format(d=dirname))
+		wordindex.close()
+		wordindex = None
+
+	if not wordindex:
+		wordindex = buildwordindex(dirname)
+
+	currentwordindex = wordindex
+
+	return currentwordindex
+
+
+def wordindexconcordances(facetranges: dict, workercount=None, wordindex=None) -> dict:
+	"""
+
+	{facet: {tableid1: [range1.1, range1.2], ...}, ...} ==> {facet: {'WORD': {'gr': 1, 'lt': 2}, ...}, ...}
+
+	what mapreduceconcordance() would find for each facet; but summed out of the posting lists
+
+	the words are dealt out to the workers in slices: the partial results never overlap
+
+	:param facetranges:
+	:param workercount:
+	:param wordindex:
+	:return:
+	"""
+
+	if not wordindex:
+		wordindex = openwordindex()
+
+	if not workercount:
+		workercount = setworkercount()
+
+	facets = list(facetranges)
+	plan = wordindex.tableplan(facetranges)
+
+	slicelength = max(int(len(wordindex) / (workercount * 4)), 1)
+	slices = [(s, min(s + slicelength, len(wordindex))) for s in range(0, len(wordindex), slicelength)]
+
+	print('summing the posting lists of {n} words for {f} facets with {w} workers'.format(n=len(wordindex), f=len(facets), w=workercount))
+
+	# every worker opens the index and gets the plan once; after that only the slices travel
+	with Pool(processes=workercount, initializer=startaggregator, initargs=(wordindex.dirname, plan, len(facets))) as pool:
+		partials = pool.map(aggregatewordindexslice, slices)
+
+	concordances = {f: dict() for f in facets}
+	for p in partials:
+		for f, c in zip(facets, p):
+			concordances[f].update(c)
+
+	return concordances
+
+
+# what startaggregator() hands to aggregatewordindexslice() inside a worker
+aggregator = dict()
+
+
+def startaggregator(dirname: str, plan: dict, facetcount: int):
+	aggregator['wordindex'] = WordIndex(dirname)
+	aggregator['plan'] = plan
+	aggregator['facetcount'] = facetcount
+	return
+
+
+def aggregatewordindexslice(wordslice: tuple) -> list:
+	firstword, lastword = wordslice
+	return aggregator['wordindex'].aggregate(aggregator['plan'], aggregator['facetcount'], firstword, lastword)
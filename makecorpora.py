@@ -8,6 +8,7 @@
 
 import configparser
 import multiprocessing
+import sys
 import time
 from multiprocessing import freeze_support
 from pathlib import Path
@@ -19,13 +20,18 @@ except ModuleNotFoundError:
 
 from builder import corpusbuilder
 from builder.configureatlaunch import getcommandlineargs, tobuildaccordingtoconfigfile
+from builder.dbinteraction.dbloading import checkcopystreams
+from builder.dbinteraction.dbprepsubstitutions import checkdbprepper
 from builder.dbinteraction.versioning import timestampthebuild
+from builder.file_io.filereaders import checkhighunicodefileload
+from builder.file_io.parseprofiler import finishprofile, startprofile
 from builder.lexica.buildlexica import analysisloader, formatgklexicon, formatlatlexicon, grammarloader, fixmorphologytranslations
 from builder.postbuild.postbuildmetadata import noblankauthorcolumns, noblankworkdata
 from builder.lexica.fixmorphologydefs import fixgreeklemmatacapitalization
-from builder.wordcounting.databasewordcounts import monowordcounter
+from builder.wordcounting.databasewordcounts import checktokenizers, checkwordcounters, mapreducewordcounter
 from builder.sql.loadarchivedtablesfromsql import archivedsqlloader
 from builder.wordcounting.wordcountsbyheadword import headwordcounts
+from builder.wordcounting.wordindex import buildwordindex, usewordindex
 
 mpmethod = str()
 try:
@@ -134,6 +140,24 @@ corpusvars = {
 if __name__ == '__main__':
 	freeze_support()
 
+	if commandlineargs.checkwordcounts:
+		sys.exit(0 if checkwordcounters() else 1)
+
+	if commandlineargs.checktokenizer:
+		sys.exit(0 if checktokenizers() else 1)
+
+	if commandlineargs.checkdbprepper:
+		sys.exit(0 if checkdbprepper() else 1)
+
+	if commandlineargs.checkfileload:
+		sys.exit(0 if checkhighunicodefileload([corpusvars[c]['datapath'] for c in corpusvars]) else 1)
+
+	if commandlineargs.checkchunking:
+		sys.exit(0 if corpusbuilder.checkchunking(corpusvars) else 1)
+
+	if commandlineargs.checkcopystreams:
+		sys.exit(0 if checkcopystreams() else 1)
+
 	corporatobuild = list()
 
 	if tobuild['latinauthors']:
@@ -152,14 +176,33 @@ if __name__ == '__main__':
 		corporatobuild.append('christians')
 
 	for corpusname in corporatobuild:
-		corpusbuilder.buildcorpusdbs(corpusname, corpusvars)
+		if commandlineargs.profile:
+			startprofile(corpusname)
+		if commandlineargs.incremental:
+			updated = corpusbuilder.updatecorpusdbs(corpusname, corpusvars, usecache=not commandlineargs.nocache)
+			if updated is not None:
+				finishprofile(corpusname)
+				if updated:
+					corpusbuilder.buildcorpusmetadata(corpusname, corpusvars, authoruids=updated)
+				continue
+			print('building all of', corpusname)
+		corpusbuilder.buildcorpusdbs(corpusname, corpusvars, usecache=not commandlineargs.nocache)
+		finishprofile(corpusname)
 		corpusbuilder.remaptables(corpusname, corpusvars)
 		corpusbuilder.buildcorpusmetadata(corpusname, corpusvars)
 
+	# the indices of the last corpus (at least) might still be building
+	corpusbuilder.waitforindexing()
+
 	print('regularizing author and work tables')
 	noblankauthorcolumns()
 	noblankworkdata()
 
+	if usewordindex and corporatobuild:
+		# the texts just changed: the wordcounts will want an index of what they are now
+		print('indexing the words of every line')
+		buildwordindex()
+
 	#
 	# lexica, etc
 	#
@@ -242,7 +285,8 @@ if __name__ == '__main__':
 			else:
 				# see note on rediswordcounter(): do not use...
 				# rediswordcounter()
-				monowordcounter()
+				# monowordcounter() gets the same counts with one worker: see checkwordcounters()
+				mapreducewordcounter()
 			headwordcounts()
 			# if you do genres, brace yourself: Build took 84.11 minutes
 
@@ -12,6 +12,7 @@ import configparser
 from builder.corpusbuilder import addoneauthor, buildauthorobject
 from builder.dbinteraction.connection import setconnection
 from builder.file_io.filereaders import findauthors
+from builder.file_io.parseprofiler import finishprofile, startprofile
 from builder.postbuild.postbuildmetadata import boundaryfinder, calculatewordcounts, insertboundaries, insertcounts
 from builder.postbuild.secondpassdbrewrite import builddbremappers, compilenewauthors, compilenewworks, \
 	insertnewworkdata
@@ -46,6 +47,7 @@ commandlineparser.add_argument('--au', required=False, type=str, help='set autho
 commandlineparser.add_argument('--debugoutput', action='store_true', help='generate the debug files in "{loc}"; add newlines after control sequences'.format(loc=outputdir))
 commandlineparser.add_argument('--debugoutputallowlonglines', action='store_true', help='generate the debug files and allow output files with a single (very, very long) line'.format(loc=outputdir))
 commandlineparser.add_argument('--skipdbload', action='store_true', help='skip db insertion; just generate the debug files')
+commandlineparser.add_argument('--profile', action='store_true', help='record the time spent in each stage of the parse and write a report')
 commandlineargs = commandlineparser.parse_args()
 
 useoutputfiles = False
@@ -89,8 +91,11 @@ authordict = {debugauthor: myauthorname}
 
 dbc = setconnection(config)
 cur = dbc.cursor()
+if commandlineargs.profile:
+	startprofile(debugauthor)
 result = addoneauthor(authordict, lg, uidprefix, datapath, dataprefix, dbc, debugoutput=useoutputfiles, debugnewlines=usenewlines, skipdbload=commandlineargs.skipdbload)
 print(result)
+finishprofile(debugauthor)
 dbc.commit()
 
 if remap:
@@ -152,6 +152,10 @@ for f in sorted(functions.keys()):
 	except TypeError:
 		txt = functions[f](txt, debugauthor[2:])
 
+	if not isinstance(txt, str):
+		# the line by line functions are generators
+		txt = list(txt)
+
 	fn = chr(97+f)+'_'+getattr(functions[f], '__name__')
 
 	try: